@@ -1,62 +1,46 @@
-import pandas as pd
 import numpy as np
 import os
-import joblib
-from typing import Dict, List, Any
-from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
-from sklearn.linear_model import LogisticRegression
-from sklearn.preprocessing import LabelEncoder, StandardScaler
+import heapq
+from collections import defaultdict
+from typing import Dict, List
+
+from ai.feature_store import FeatureStore
+from ai.model_registry import MODEL_PATH, model_registry
 
-MODEL_PATH = os.path.join(os.path.dirname(__file__), 'models')
 if not os.path.exists(MODEL_PATH):
     os.makedirs(MODEL_PATH)
 
+# Typical completed_steps / time_spent per attempt, used for students
+# without any progress yet
+DEFAULT_STEPS = 5
+DEFAULT_TIME_SPENT = 300
+MAX_BATCH_USERS = int(os.getenv('AI_RECOMMEND_BATCH_MAX_USERS', 500))
+
 class AdaptiveLearningEngine:
-    def __init__(self, db_connection=None):
+    def __init__(self, db_connection=None, registry=model_registry):
+        # Cheap per request: trained models come from the shared registry
         self.db = db_connection
-        self.recommender = RandomForestRegressor(n_estimators=100, random_state=42)
-        self.risk_model = LogisticRegression(random_state=42)
-        self.le_subject = LabelEncoder()
+        self.registry = registry
+        self.recommender = None
+        self.risk_model = None
+        self.le_subject = None
+        self.model_version = None
         self.is_trained = False
     
     def train_models(self):
-        """Train both recommendation and risk models from progress data"""
+        """Train both recommendation and risk models from progress data
+        (synchronously; the API runs ai.training jobs in the background)"""
         if not self.db:
             print("No DB connection for training")
             return
         
         try:
-            query = """
-                SELECT p.*, e.subject, e.difficulty_level 
-                FROM progress p 
-                JOIN experiments e ON p.experiment_id = e.id
-            """
-            df = pd.read_sql(query, self.db)
-            
-            if len(df) < 5:
-                print("Insufficient data for ML training")
-                return
-
-            # Preprocessing
-            df['subject_enc'] = self.le_subject.fit_transform(df['subject'])
-            
-            # 1. Train Recommender (Predict score based on subject + progress)
-            # Use score as target
-            X = df[['subject_enc', 'completed_steps', 'time_spent']]
-            y = df['score']
-            self.recommender.fit(X, y)
-            
-            # 2. Train Risk Model (Predict if score < 50)
-            y_risk = (df['score'] < 50).astype(int)
-            self.risk_model.fit(X, y_risk)
-            
-            # Save models
-            joblib.dump(self.recommender, os.path.join(MODEL_PATH, 'recommender.joblib'))
-            joblib.dump(self.risk_model, os.path.join(MODEL_PATH, 'risk_model.joblib'))
-            joblib.dump(self.le_subject, os.path.join(MODEL_PATH, 'le_subject.joblib'))
-            
-            self.is_trained = True
-            print("Adaptive models trained successfully")
+            # Streams progress in chunks and publishes a new registry version
+            from ai.training import train_incremental
+            metadata = train_incremental(self.db, registry=self.registry)
+            self.registry.refresh()
+            self.load_models()
+            return metadata
         except Exception as e:
             print(f"Training error: {e}")
 
@@ -79,69 +63,170 @@ class AdaptiveLearningEngine:
             if not available or not self.is_trained:
                 return []
 
-            recommendations = []
-            for exp in available:
-                # Predict score for this experiment (simplified features)
-                # subject_enc, completed_steps (avg), time_spent (avg)
-                sub_enc = self.le_subject.transform([exp['subject']])[0]
-                features = np.array([[sub_enc, 5, 300]]) # placeholders for typical steps/time
-                pred_score = self.recommender.predict(features)[0]
-                
-                recommendations.append({
-                    "experiment_id": exp['id'],
-                    "title": exp['title'],
-                    "subject": exp['subject'],
-                    "predicted_score": round(float(pred_score), 1),
-                    "reason": f"Matches your competency in {exp['subject']}"
-                })
-            
-            # Sort by predicted score (recommend things they will do well in)
-            return sorted(recommendations, key=lambda x: x['predicted_score'], reverse=True)[:3]
+            # One feature matrix and one forest traversal for all candidates,
+            # using the student's own typical steps and time on task
+            steps, time_spent = self._activity(FeatureStore(self.db).get(user_id))
+            features, known = self._candidate_features(available, steps, time_spent)
+            candidates = [exp for exp, ok in zip(available, known) if ok]
+            if not candidates:
+                return []
+            scores = self.recommender.predict(features)
+            best = heapq.nlargest(3, range(len(candidates)), key=scores.__getitem__)
+
+            # Highest predicted score first (recommend things they will do well in)
+            return [self._recommendation(candidates[i], scores[i]) for i in best]
             
         except Exception as e:
             print(f"Recommendation error: {e}")
             return []
 
+    def recommend_batch(self, user_ids: List[int], k: int = 3) -> Dict[int, List[Dict]]:
+        """Top-k recommendations for a whole class with a single predict call"""
+        if not self.is_trained:
+            self.load_models()
+        if not self.is_trained or not user_ids:
+            return {}
+
+        cursor = self.db.cursor(dictionary=True)
+        cursor.execute("SELECT id, title, subject, difficulty_level FROM experiments")
+        experiments = cursor.fetchall()
+        placeholders = ', '.join(['%s'] * len(user_ids))
+        cursor.execute(f"SELECT user_id, experiment_id FROM progress WHERE user_id IN ({placeholders})",
+                       tuple(user_ids))
+        attempted = defaultdict(set)
+        for row in cursor.fetchall():
+            attempted[row['user_id']].add(row['experiment_id'])
+        cursor.close()
+        user_features = FeatureStore(self.db).get_many(user_ids)
+
+        exp_features, known = self._candidate_features(experiments)
+        experiments = [exp for exp, ok in zip(experiments, known) if ok]
+
+        # Stack the (user, unattempted experiment) pairs into one matrix
+        rows, owners = [], []
+        for user_id in user_ids:
+            done = attempted.get(user_id, ())
+            for j, exp in enumerate(experiments):
+                if exp['id'] not in done:
+                    rows.append(j)
+                    owners.append(user_id)
+
+        results = {user_id: [] for user_id in user_ids}
+        if not rows:
+            return results
+        matrix = exp_features[rows]
+        activity = {u: self._activity(user_features.get(u, {})) for u in user_ids}
+        matrix[:, 1:] = [activity[u] for u in owners]
+        scores = self.recommender.predict(matrix)
+
+        per_user = defaultdict(list)
+        for score, j, user_id in zip(scores, rows, owners):
+            per_user[user_id].append((score, j))
+        for user_id, scored in per_user.items():
+            best = heapq.nlargest(k, scored, key=lambda pair: pair[0])
+            results[user_id] = [self._recommendation(experiments[j], score) for score, j in best]
+        return results
+
+    @staticmethod
+    def _activity(features: Dict):
+        """(completed_steps, time_spent) model inputs from a feature row"""
+        steps = features.get('steps_median')
+        time_spent = features.get('time_p50')
+        return (DEFAULT_STEPS if steps is None else steps,
+                DEFAULT_TIME_SPENT if time_spent is None else time_spent)
+
+    def _candidate_features(self, experiments: List[Dict], steps=DEFAULT_STEPS, time_spent=DEFAULT_TIME_SPENT):
+        """Feature rows [subject_enc, steps, time] for experiments whose
+        subject the encoder knows, plus the per-experiment 'known' mask"""
+        codes, known = self._encode_subjects(np.array([exp['subject'] for exp in experiments], dtype=object))
+        codes = codes[known]
+        features = np.column_stack([codes,
+                                    np.full(len(codes), steps),
+                                    np.full(len(codes), time_spent)]).astype(float)
+        return features, known
+
+    def _encode_subjects(self, subjects: np.ndarray):
+        """Vectorised LabelEncoder.transform that flags unseen subjects
+        instead of raising"""
+        classes = self.le_subject.classes_
+        if len(subjects) == 0:
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=bool)
+        codes = np.searchsorted(classes, subjects)
+        known = (codes < len(classes)) & (classes[np.minimum(codes, len(classes) - 1)] == subjects)
+        return codes, known
+
+    def _recommendation(self, exp: Dict, score) -> Dict:
+        return {
+            "experiment_id": exp['id'],
+            "title": exp['title'],
+            "subject": exp['subject'],
+            "predicted_score": round(float(score), 1),
+            "reason": f"Matches your competency in {exp['subject']}"
+        }
+
     def predict_risk(self, user_id: int) -> Dict:
         """Predict if a student is at risk (low scores predicted or actual)"""
         if not self.is_trained:
             self.load_models()
 
         try:
-            cursor = self.db.cursor(dictionary=True)
-            cursor.execute("SELECT score, subject FROM progress WHERE user_id = %s", (user_id,))
-            recent = cursor.fetchall()
-            cursor.close()
+            features = FeatureStore(self.db).get(user_id)
+            return self.assess_risk({user_id: features})[user_id]
+        except Exception as e:
+            print(f"Risk prediction error: {e}")
+            return {"is_at_risk": False, "error": str(e)}
 
-            if not recent:
-                return {"is_at_risk": False, "probability": 0.0}
+    def assess_risk(self, features_by_user: Dict[int, Dict]) -> Dict[int, Dict]:
+        """Risk for every user from their feature rows with one
+        predict_proba call.
 
-            # Use average of recent performance
-            df_recent = pd.DataFrame(recent)
-            sub_enc = self.le_subject.transform(df_recent['subject']).mean()
-            features = np.array([[sub_enc, 5, 300]])
-            
-            risk_prob = self.risk_model.predict_proba(features)[0][1]
-            actual_avg = df_recent['score'].mean()
-            
-            is_at_risk = bool(risk_prob > 0.5 or actual_avg < 50)
-            
-            return {
-                "user_id": user_id,
-                "is_at_risk": is_at_risk,
+        Each subject a student has worked on gets its own model input; the
+        student's probability is the attempt-weighted mean over subjects.
+        """
+        owners, subjects, weights, activity = [], [], [], []
+        for i, (user_id, features) in enumerate(features_by_user.items()):
+            for subject, stats in features.get('subject_stats', {}).items():
+                owners.append(i)
+                subjects.append(subject)
+                weights.append(stats['attempts'])
+                activity.append(self._activity(features))
+
+        probs = np.zeros(len(features_by_user))
+        codes, known = self._encode_subjects(np.array(subjects, dtype=object))
+        if known.any():
+            matrix = np.column_stack([codes[known], np.array(activity, dtype=float)[known]])
+            row_probs = self.risk_model.predict_proba(matrix)[:, 1]
+            owners = np.array(owners)[known]
+            weights = np.array(weights, dtype=float)[known]
+            totals = np.bincount(owners, weights=weights, minlength=len(probs))
+            weighted = np.bincount(owners, weights=weights * row_probs, minlength=len(probs))
+            probs = np.divide(weighted, totals, out=np.zeros_like(probs), where=totals > 0)
+
+        results = {}
+        for (user_id, features), risk_prob in zip(features_by_user.items(), probs):
+            # Rolling mean of the most recent attempts
+            actual_avg = features.get('score_mean_recent')
+            result = {
+                "user_id": int(user_id),
+                "is_at_risk": bool(risk_prob > 0.5 or (actual_avg is not None and actual_avg < 50)),
                 "probability": round(float(risk_prob), 2),
-                "actual_avg_score": float(actual_avg)
             }
-        except Exception as e:
-            print(f"Risk prediction error: {e}")
-            return {"is_at_risk": False, "error": str(e)}
+            if actual_avg is not None:
+                result["actual_avg_score"] = float(actual_avg)
+            results[int(user_id)] = result
+        return results
 
     def load_models(self):
-        """Load trained models from disk"""
-        try:
-            self.recommender = joblib.load(os.path.join(MODEL_PATH, 'recommender.joblib'))
-            self.risk_model = joblib.load(os.path.join(MODEL_PATH, 'risk_model.joblib'))
-            self.le_subject = joblib.load(os.path.join(MODEL_PATH, 'le_subject.joblib'))
-            self.is_trained = True
-        except:
-            self.is_trained = False
\ No newline at end of file
+        """Take the current models from the process-wide registry"""
+        bundle = self.registry.get()
+        if bundle is None:
+            self.is_trained = False
+            return
+        self._use(bundle)
+
+    def _use(self, bundle):
+        self.recommender = bundle.recommender
+        self.risk_model = bundle.risk_model
+        self.le_subject = bundle.le_subject
+        self.model_version = bundle.version
+        self.is_trained = True
\ No newline at end of file
@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import numpy as np
+from typing import List, Optional, Tuple
+
+# ---------------------------------------------------------------------------
+# Persistent concept-embedding index for LabAssistant.
+#
+# Embeddings are L2-normalised float32 rows stored in a .npy file and opened
+# with mmap, so a restart maps the file instead of re-encoding every concept.
+# The file name carries a fingerprint of concepts.json + model name, so any
+# edit to the concept base (or a model change) invalidates it automatically.
+# ---------------------------------------------------------------------------
+
+CACHE_DIR = os.getenv('AI_EMBEDDING_CACHE_DIR',
+                      os.path.join(os.path.dirname(__file__), 'cache'))
+ANN_BACKEND = os.getenv('AI_ANN_BACKEND', 'exact')  # 'exact' or 'hnsw'
+HNSW_MIN_ITEMS = int(os.getenv('AI_HNSW_MIN_ITEMS', 5000))
+ENCODE_BATCH_SIZE = 256
+
+try:
+    import hnswlib
+    HNSW_AVAILABLE = True
+except ImportError:
+    HNSW_AVAILABLE = False
+
+
+def concept_text(concept: dict) -> str:
+    return f"{concept['concept']} {concept['description']}"
+
+
+def fingerprint(concepts_path: str, model_name: str) -> str:
+    digest = hashlib.sha256(model_name.encode('utf-8'))
+    with open(concepts_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def normalize(vectors) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class EmbeddingIndex:
+    """Top-k cosine search over normalised concept embeddings."""
+
+    def __init__(self, embeddings: np.ndarray, hnsw=None):
+        self.embeddings = embeddings
+        self.hnsw = hnsw
+
+    def __len__(self):
+        return len(self.embeddings)
+
+    @classmethod
+    def load_or_build(cls, concepts_path: str, concepts: List[dict], model, model_name: str,
+                      cache_dir: str = CACHE_DIR) -> "EmbeddingIndex":
+        """Map the cached embeddings for this concepts.json, encoding them
+        (once) if the fingerprint has no file yet."""
+        os.makedirs(cache_dir, exist_ok=True)
+        key = fingerprint(concepts_path, model_name)
+        path = os.path.join(cache_dir, f"concepts-{key}.npy")
+
+        if not os.path.exists(path):
+            texts = [concept_text(c) for c in concepts]
+            vectors = model.encode(texts, batch_size=ENCODE_BATCH_SIZE)
+            _atomic_save(path, normalize(vectors))
+            with open(os.path.join(cache_dir, f"concepts-{key}.json"), 'w') as f:
+                json.dump({"model": model_name, "count": len(texts),
+                           "source": os.path.abspath(concepts_path)}, f)
+            _remove_stale(cache_dir, key)
+            print(f"Encoded {len(texts)} concept embeddings -> {path}")
+
+        embeddings = np.load(path, mmap_mode='r')
+        hnsw = None
+        if ANN_BACKEND == 'hnsw' and len(embeddings) >= HNSW_MIN_ITEMS:
+            hnsw = _load_or_build_hnsw(os.path.join(cache_dir, f"concepts-{key}.hnsw"), embeddings)
+        return cls(embeddings, hnsw)
+
+    def search(self, query_vector, k: int = 3, min_score: Optional[float] = None) -> List[Tuple[int, float]]:
+        """Return up to k (row, score) pairs, best first."""
+        n = len(self.embeddings)
+        if n == 0:
+            return []
+        k = min(k, n)
+        query_vector = normalize(query_vector).reshape(-1)
+
+        if self.hnsw is not None:
+            labels, distances = self.hnsw.knn_query(query_vector, k=k)
+            pairs = [(int(i), float(1.0 - d)) for i, d in zip(labels[0], distances[0])]
+        else:
+            scores = self.embeddings @ query_vector
+            if k < n:
+                top = np.argpartition(-scores, k - 1)[:k]
+            else:
+                top = np.arange(n)
+            top = top[np.argsort(-scores[top])]
+            pairs = [(int(i), float(scores[i])) for i in top]
+
+        if min_score is not None:
+            pairs = [(i, s) for i, s in pairs if s > min_score]
+        return pairs
+
+
+def _atomic_save(path, array):
+    tmp = f"{path}.{os.getpid()}.tmp.npy"
+    np.save(tmp, array)
+    os.replace(tmp, path)
+
+
+def _remove_stale(cache_dir, current_key):
+    for name in os.listdir(cache_dir):
+        if name.startswith('concepts-') and current_key not in name:
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError:
+                pass
+
+
+def _load_or_build_hnsw(path, embeddings):
+    if not HNSW_AVAILABLE:
+        print("AI_ANN_BACKEND=hnsw but hnswlib is not installed; using exact search")
+        return None
+    index = hnswlib.Index(space='ip', dim=embeddings.shape[1])
+    if os.path.exists(path):
+        index.load_index(path, max_elements=len(embeddings))
+    else:
+        index.init_index(max_elements=len(embeddings), ef_construction=200, M=16)
+        index.add_items(np.asarray(embeddings), np.arange(len(embeddings)))
+        index.save_index(path)
+    index.set_ef(64)
+    return index
+
+
+if __name__ == "__main__":
+    # Precompute the embedding file ahead of deployment:
+    #     python -m ai.embedding_index
+    from ai.lab_assistant import LabAssistant
+    assistant = LabAssistant()
+    assistant._initialize_model()
+    print(f"Index ready: {len(assistant.index) if assistant.index else 0} concepts")
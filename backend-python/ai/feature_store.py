@@ -0,0 +1,155 @@
+import os
+import json
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List
+
+import pandas as pd
+
+# ---------------------------------------------------------------------------
+# Per-student feature store (table student_features, migration 010).
+#
+# Each student has one aggregate row: rolling score means, the median steps
+# and time on task the adaptive models take as inputs, and per-subject
+# attempts/score/recency.
+# Triggers on progress mark the row dirty on every write (including the PHP
+# backend's); the next read recomputes just the dirty students in one query,
+# so inference reads a single row per user instead of raw progress.
+# ---------------------------------------------------------------------------
+
+RECENT_ATTEMPTS = int(os.getenv('AI_FEATURE_RECENT_ATTEMPTS', 10))
+# Safety net for databases where the migration 010 triggers are missing
+MAX_AGE_HOURS = float(os.getenv('AI_FEATURE_MAX_AGE_HOURS', 24))
+
+FEATURE_COLUMNS = ('attempts', 'score_mean', 'score_mean_recent', 'steps_median',
+                   'time_p50', 'subject_stats', 'last_activity_at')
+
+
+def empty_features() -> Dict:
+    return {"attempts": 0, "score_mean": None, "score_mean_recent": None, "steps_median": None,
+            "time_p50": None, "subject_stats": {}, "last_activity_at": None}
+
+
+def _round(value, digits=2):
+    return None if value is None or pd.isna(value) else round(float(value), digits)
+
+
+def compute_features(rows: List[Dict]) -> Dict[int, Dict]:
+    """Aggregate raw progress rows (user_id, score, completed_steps,
+    time_spent, last_accessed, subject) into feature dicts."""
+    if not rows:
+        return {}
+    df = pd.DataFrame(rows)
+    for column in ('score', 'completed_steps', 'time_spent'):
+        df[column] = pd.to_numeric(df[column], errors='coerce').astype(float)
+    df['last_accessed'] = pd.to_datetime(df['last_accessed'])
+    df = df.sort_values(['user_id', 'last_accessed'])
+
+    grouped = df.groupby('user_id')
+    recent = grouped.tail(RECENT_ATTEMPTS).groupby('user_id')['score'].mean()
+    summary = grouped.agg(attempts=('score', 'size'), score_mean=('score', 'mean'),
+                          steps_median=('completed_steps', 'median'),
+                          time_p50=('time_spent', 'median'),
+                          last_activity_at=('last_accessed', 'max'))
+    per_subject = df.groupby(['user_id', 'subject']).agg(
+        attempts=('score', 'size'), score_mean=('score', 'mean'), last_at=('last_accessed', 'max'))
+
+    features = {}
+    for user_id, row in summary.iterrows():
+        subject_stats = {}
+        for subject, stats in per_subject.loc[user_id].iterrows():
+            subject_stats[subject] = {
+                "attempts": int(stats['attempts']),
+                "score_mean": _round(stats['score_mean']),
+                "last_at": stats['last_at'].isoformat() if pd.notna(stats['last_at']) else None,
+            }
+        features[int(user_id)] = {
+            "attempts": int(row['attempts']),
+            "score_mean": _round(row['score_mean']),
+            "score_mean_recent": _round(recent.loc[user_id]),
+            "steps_median": _round(row['steps_median']),
+            "time_p50": _round(row['time_p50']),
+            "subject_stats": subject_stats,
+            "last_activity_at": (row['last_activity_at'].to_pydatetime()
+                                 if pd.notna(row['last_activity_at']) else None),
+        }
+    return features
+
+
+class FeatureStore:
+    def __init__(self, db_connection):
+        self.db = db_connection
+
+    def get(self, user_id: int) -> Dict:
+        return self.get_many([user_id])[user_id]
+
+    def get_many(self, user_ids: Iterable[int]) -> Dict[int, Dict]:
+        """One feature row per user, recomputing only missing/dirty/old rows."""
+        user_ids = list(dict.fromkeys(int(u) for u in user_ids))
+        if not user_ids:
+            return {}
+        placeholders = ', '.join(['%s'] * len(user_ids))
+        cursor = self.db.cursor(dictionary=True)
+        cursor.execute(f"SELECT * FROM student_features WHERE user_id IN ({placeholders})", tuple(user_ids))
+        stored = {row['user_id']: row for row in cursor.fetchall()}
+        cursor.close()
+
+        cutoff = datetime.now() - timedelta(hours=MAX_AGE_HOURS)
+        result, stale = {}, []
+        for user_id in user_ids:
+            row = stored.get(user_id)
+            if row is None or row['dirty'] or row['computed_at'] is None or row['computed_at'] < cutoff:
+                stale.append(user_id)
+            else:
+                result[user_id] = self._from_row(row)
+        if stale:
+            result.update(self.refresh(stale))
+        return result
+
+    def refresh(self, user_ids: List[int]) -> Dict[int, Dict]:
+        """Recompute and store features for user_ids from their progress."""
+        if not user_ids:
+            return {}
+        placeholders = ', '.join(['%s'] * len(user_ids))
+        cursor = self.db.cursor(dictionary=True)
+        cursor.execute(f"""
+            SELECT p.user_id, p.score, p.completed_steps, p.time_spent,
+                   p.last_accessed, e.subject
+            FROM progress p
+            JOIN experiments e ON p.experiment_id = e.id
+            WHERE p.user_id IN ({placeholders})
+        """, tuple(user_ids))
+        computed = compute_features(cursor.fetchall())
+        cursor.close()
+
+        features = {user_id: computed.get(user_id, empty_features()) for user_id in user_ids}
+        now = datetime.now()
+        cursor = self.db.cursor()
+        cursor.executemany("""
+            INSERT INTO student_features
+                (user_id, attempts, score_mean, score_mean_recent, steps_median, time_p50,
+                 subject_stats, last_activity_at, dirty, computed_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, 0, %s)
+            ON DUPLICATE KEY UPDATE attempts = VALUES(attempts), score_mean = VALUES(score_mean),
+                score_mean_recent = VALUES(score_mean_recent), steps_median = VALUES(steps_median),
+                time_p50 = VALUES(time_p50), subject_stats = VALUES(subject_stats),
+                last_activity_at = VALUES(last_activity_at), dirty = 0, computed_at = VALUES(computed_at)
+        """, [(user_id, f['attempts'], f['score_mean'], f['score_mean_recent'], f['steps_median'],
+               f['time_p50'], json.dumps(f['subject_stats']),
+               f['last_activity_at'], now) for user_id, f in features.items()])
+        cursor.close()
+        self.db.commit()
+        return features
+
+    @staticmethod
+    def _from_row(row) -> Dict:
+        features = {}
+        for column in FEATURE_COLUMNS:
+            value = row[column]
+            if column == 'subject_stats':
+                value = json.loads(value) if isinstance(value, (str, bytes)) else (value or {})
+            elif column == 'attempts':
+                value = int(value)
+            elif column != 'last_activity_at' and value is not None:
+                value = float(value)
+            features[column] = value
+        return features
@@ -0,0 +1,137 @@
+import os
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ai.tokens import count_message_tokens, count_tokens
+
+# ---------------------------------------------------------------------------
+# Tutor history compaction.
+#
+# Once a session's history passes HISTORY_TOKEN_BUDGET, older turns are folded
+# into one rolling summary message at the head of the history until it is
+# back under HISTORY_TARGET_TOKENS (at most KEEP_RECENT_PAIRS recent pairs are
+# kept verbatim), so the prompt stays bounded however long the conversation
+# runs and compaction does not re-trigger on the very next turn. The
+# "[Subject: ... | Level: ...]" prefix is only sent when it differs from the
+# one already in the history.
+# ---------------------------------------------------------------------------
+
+HISTORY_TOKEN_BUDGET = int(os.getenv('TUTOR_HISTORY_TOKEN_BUDGET', 1000))
+KEEP_RECENT_PAIRS = int(os.getenv('TUTOR_KEEP_RECENT_PAIRS', 3))
+SUMMARY_MAX_TOKENS = int(os.getenv('TUTOR_SUMMARY_MAX_TOKENS', 200))
+HISTORY_TARGET_TOKENS = int(os.getenv('TUTOR_HISTORY_TARGET_TOKENS', HISTORY_TOKEN_BUDGET // 2))
+
+SUMMARY_PREFIX = "Summary of the earlier conversation: "
+SUMMARY_INSTRUCTIONS = (
+    "Summarise this tutoring conversation for the tutor's own memory in under "
+    f"{SUMMARY_MAX_TOKENS // 2} words. Keep the topics covered, the subject and level, "
+    "and anything the student found difficult. Plain text, no preamble."
+)
+
+_PREFIX = re.compile(r"^\[Subject: [^\]]*\]\n")
+
+
+def context_prefix(subject: str, level: str) -> str:
+    return f"[Subject: {subject} | Level: {level}]\n"
+
+
+def split_summary(history: List[Dict]) -> Tuple[Optional[str], List[Dict]]:
+    """(rolling summary or None, the remaining user/assistant turns)"""
+    if history and history[0]['role'] == 'system' and history[0]['content'].startswith(SUMMARY_PREFIX):
+        return history[0]['content'][len(SUMMARY_PREFIX):], history[1:]
+    return None, history
+
+
+def summary_message(summary: str) -> Dict:
+    return {"role": "system", "content": SUMMARY_PREFIX + summary}
+
+
+def last_prefix(history: List[Dict]) -> Optional[str]:
+    """The most recent context prefix a user message carried."""
+    for message in reversed(history):
+        if message['role'] == 'user':
+            match = _PREFIX.match(message['content'])
+            if match:
+                return match.group(0)
+    return None
+
+
+def user_message(question: str, subject: str, level: str, history: List[Dict]) -> str:
+    """Question with its context prefix, unless the conversation already
+    established the same subject and level."""
+    prefix = context_prefix(subject, level)
+    return question if last_prefix(history) == prefix else prefix + question
+
+
+def needs_compaction(history: List[Dict], budget: int = HISTORY_TOKEN_BUDGET) -> bool:
+    _, turns = split_summary(history)
+    return len(turns) > KEEP_RECENT_PAIRS * 2 and count_message_tokens(history) > budget
+
+
+def transcript(turns: List[Dict]) -> str:
+    return '\n'.join(f"{m['role']}: {m['content']}" for m in turns)
+
+
+def extractive_summary(summary: Optional[str], turns: List[Dict]) -> str:
+    """Offline fallback: the questions asked, oldest first, clipped."""
+    questions = [_PREFIX.sub('', m['content']).strip().split('\n')[0][:80]
+                 for m in turns if m['role'] == 'user']
+    text = (summary + ' ' if summary else '') + "Student asked about: " + '; '.join(questions) + '.'
+    return clip(text)
+
+
+def clip(text: str, max_tokens: int = SUMMARY_MAX_TOKENS) -> str:
+    """Keep the newest part of an over-long summary."""
+    words = text.split()
+    while len(words) > 1 and count_tokens(' '.join(words)) > max_tokens:
+        words = words[len(words) // 10 + 1:]
+    return ' '.join(words)
+
+
+def split_for_compaction(history: List[Dict], target: int = HISTORY_TARGET_TOKENS
+                         ) -> Tuple[Optional[str], List[Dict], List[Dict]]:
+    """(previous summary, turns to fold, turns to keep verbatim). Fewer than
+    KEEP_RECENT_PAIRS pairs are kept when they would not fit under target
+    next to a full-size summary; the newest pair always stays."""
+    summary, turns = split_summary(history)
+    keep = min(KEEP_RECENT_PAIRS * 2, len(turns))
+    while keep > 2 and count_message_tokens(turns[len(turns) - keep:]) + SUMMARY_MAX_TOKENS > target:
+        keep -= 2
+    return summary, turns[:len(turns) - keep], turns[len(turns) - keep:]
+
+
+def new_summary(summary: Optional[str], old: List[Dict],
+                summarize: Callable[[Optional[str], List[Dict]], str]) -> str:
+    """summarize(previous_summary, old_turns), clipped; it may raise, in
+    which case the extractive summary is used instead."""
+    try:
+        return clip(summarize(summary, old).strip())
+    except Exception as e:
+        print(f"History summarisation failed (using extractive summary): {e}")
+        return extractive_summary(summary, old)
+
+
+def fold(history: List[Dict], summary: Optional[str], old: List[Dict], text: str) -> List[Dict]:
+    """Replace the summary and the old turns at the head of history with the
+    new summary text, keeping every turn after them (including ones appended
+    since the summary was written). history is returned unchanged when its
+    head no longer matches, i.e. another worker compacted it first."""
+    current, turns = split_summary(history)
+    if not old or current != summary or turns[:len(old)] != old:
+        return history
+    recent = turns[len(old):]
+    # The first kept question loses its prefix context otherwise
+    prefix = last_prefix(old)
+    if prefix and recent and recent[0]['role'] == 'user' and not _PREFIX.match(recent[0]['content']):
+        recent = [{**recent[0], "content": prefix + recent[0]['content']}] + recent[1:]
+    return [summary_message(text)] + recent
+
+
+def compact(history: List[Dict], summarize: Callable[[Optional[str], List[Dict]], str],
+            target: int = HISTORY_TARGET_TOKENS) -> List[Dict]:
+    """Fold older turns into the rolling summary until the history fits
+    under target (see split_for_compaction)."""
+    summary, old, _ = split_for_compaction(history, target)
+    if not old:
+        return history
+    return fold(history, summary, old, new_summary(summary, old, summarize))
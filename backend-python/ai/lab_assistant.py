@@ -1,44 +1,82 @@
 import json
 import os
-import numpy as np
+import threading
 from typing import List, Dict
 
+from ai.embedding_index import EmbeddingIndex
+from ai.query_cache import LRUCache, MicroBatcher, normalize_query
+
+MODEL_NAME = 'all-MiniLM-L6-v2'
+CONCEPTS_PATH = os.path.join(os.path.dirname(__file__), 'data/concepts.json')
+
 class LabAssistant:
     def __init__(self):
         self.concepts = []
         self.model = None
-        self.concept_embeddings = None
+        self.index = None
+        self._model_lock = threading.Lock()
+        # Set False when a background warm-up loads the model; queries then
+        # use keyword search until it is ready instead of blocking on it
+        self.lazy_load = True
+        # Keyed by normalize_query(); classmates ask the same thing seconds apart
+        self.embedding_cache = LRUCache()
+        self.answer_cache = LRUCache()
+        self.encoder = MicroBatcher(self._encode_batch)
         self._load_concepts()
 
     def _load_concepts(self):
         """Load scientific concepts from data file"""
         try:
-            path = os.path.join(os.path.dirname(__file__), 'data/concepts.json')
-            if os.path.exists(path):
-                with open(path, 'r') as f:
+            if os.path.exists(CONCEPTS_PATH):
+                with open(CONCEPTS_PATH, 'r') as f:
                     self.concepts = json.load(f)
         except Exception as e:
             print(f"Error loading concepts: {e}")
 
-    def _initialize_model(self):
-        """Lazy load sentence-transformers model"""
-        if self.model is None:
-            try:
+    def load_model(self):
+        """Load the sentence-transformers model (idempotent)"""
+        with self._model_lock:
+            if self.model is None:
                 from sentence_transformers import SentenceTransformer
                 # Using a lightweight, fast model suitable for local inference
-                self.model = SentenceTransformer('all-MiniLM-L6-v2')
-                # Pre-calculate embeddings for concepts
-                texts = [f"{c['concept']} {c['description']}" for c in self.concepts]
-                if texts:
-                    self.concept_embeddings = self.model.encode(texts)
-            except Exception as e:
-                print(f"Error initializing semantic model: {e}")
+                self.model = SentenceTransformer(MODEL_NAME)
+
+    def load_index(self):
+        """Map (or build once) the concept embeddings; needs the model"""
+        if self.model is None:
+            raise RuntimeError("semantic model is not loaded")
+        with self._model_lock:
+            if self.index is None and self.concepts:
+                # Concept embeddings are cached on disk, keyed by a hash of concepts.json
+                self.index = EmbeddingIndex.load_or_build(CONCEPTS_PATH, self.concepts, self.model, MODEL_NAME)
+
+    def _initialize_model(self):
+        """Lazy load the model on first query unless a warm-up owns loading"""
+        if not self.lazy_load or (self.model is not None and self.index is not None):
+            return
+        try:
+            self.load_model()
+            self.load_index()
+        except Exception as e:
+            print(f"Error initializing semantic model: {e}")
+
+    def _encode_batch(self, queries: List[str]):
+        """One forward pass for every query collected by the micro-batcher"""
+        return list(self.model.encode(queries, batch_size=len(queries)))
+
+    def embed_query(self, query: str):
+        key = normalize_query(query)
+        embedding = self.embedding_cache.get(key)
+        if embedding is None:
+            embedding = self.encoder(key)
+            self.embedding_cache.put(key, embedding)
+        return embedding
 
     def search(self, query: str) -> List[Dict]:
         """Perform semantic search for a user query"""
         self._initialize_model()
         
-        if not self.model or not self.concepts:
+        if not self.model or not self.index:
             # Fallback to simple keyword search
             results = []
             q = query.lower()
@@ -48,29 +86,36 @@ class LabAssistant:
             return results[:3]
 
         # Semantic matching
-        query_embedding = self.model.encode([query])
+        query_embedding = self.embed_query(query)
         
-        # Calculate cosine similarity
-        from sklearn.metrics.pairwise import cosine_similarity
-        similarities = cosine_similarity(query_embedding, self.concept_embeddings)[0]
-        
-        # Get top 3 matches above a threshold
-        top_indices = np.argsort(similarities)[::-1]
-        results = []
-        for idx in top_indices:
-            if similarities[idx] > 0.4:  # Similarity threshold
-                results.append({
-                    **self.concepts[idx],
-                    "similarity": float(similarities[idx])
-                })
-        
-        return results[:3]
+        # Top 3 matches by cosine similarity above a threshold
+        matches = self.index.search(query_embedding, k=3, min_score=0.4)
+        return [{**self.concepts[idx], "similarity": score} for idx, score in matches]
 
     def get_answer(self, query: str) -> str:
         """Get a natural language answer based on semantic search results"""
+        key = normalize_query(query)
+        answer = self.answer_cache.get(key)
+        if answer is not None:
+            return answer
+
         matches = self.search(query)
         if not matches:
-            return "I'm not sure about that concept yet. Try asking about Pendulums, Ohm's Law, or Titration!"
+            answer = "I'm not sure about that concept yet. Try asking about Pendulums, Ohm's Law, or Titration!"
+        else:
+            best = matches[0]
+            answer = f"Regarding {best['concept']}: {best['description']} \n\nTip: {best['help']}"
+
+        # Keyword-fallback answers are not cached so they are replaced once the model loads
+        if self.index:
+            self.answer_cache.put(key, answer)
+        return answer
 
-        best = matches[0]
-        return f"Regarding {best['concept']}: {best['description']} \n\nTip: {best['help']}"
\ No newline at end of file
+    def stats(self) -> Dict:
+        return {
+            "model_loaded": self.model is not None,
+            "concepts": len(self.concepts),
+            "answer_cache": self.answer_cache.stats(),
+            "embedding_cache": self.embedding_cache.stats(),
+            "batching": self.encoder.stats(),
+        }
\ No newline at end of file
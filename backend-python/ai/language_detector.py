@@ -1,36 +1,247 @@
 # language_detector.py
+import os
 import re
+import sys
+import glob
+import hashlib
+import argparse
+from functools import lru_cache
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+# ---------------------------------------------------------------------------
+# Offline language identification (Bemba, Nyanja, Tonga, English).
+#
+# A character n-gram naive Bayes model trained from the bundled corpora in
+# ai/data/langid/<language>.txt. N-grams are hashed into BUCKETS rows, so the
+# whole model is one (BUCKETS, languages) float16 log-probability table in
+# ai/data/langid/model.npz. Scoring a text is a numpy gather and sum; short
+# texts are memoised. A few unmistakable words per language still count as
+# a prior. Without one, a local language also needs MIN_WORDS different words
+# that lean towards it on their own, so a lone science term or a list of
+# place names ("Mitochondria", "Lusaka Kafue Zambezi") stays English, as does
+# anything else without clear local evidence.
+#
+#     python -m ai.language_detector --build    # retrain after editing a corpus
+# ---------------------------------------------------------------------------
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), 'data', 'langid')
+MODEL_PATH = os.getenv('AI_LANGID_MODEL', os.path.join(CORPUS_DIR, 'model.npz'))
+MEMO_SIZE = int(os.getenv('AI_LANGID_MEMO_SIZE', 4096))
+MEMO_MAX_CHARS = int(os.getenv('AI_LANGID_MEMO_MAX_CHARS', 256))
+# Mean per-n-gram log-likelihood a local language must beat English by
+MIN_MARGIN = float(os.getenv('AI_LANGID_MIN_MARGIN', 0.1))
+# Words that must each favour a local language when no dictionary word does
+MIN_WORDS = int(os.getenv('AI_LANGID_MIN_WORDS', 2))
+
+DEFAULT_LANGUAGE = 'english'
+ORDERS = (1, 2, 3, 4)
+HASH_BITS = 14
+BUCKETS = 1 << HASH_BITS
+SMOOTHING = 0.5
+KEYWORD_PRIOR = 2.0  # log-likelihood bonus per dictionary word
+
+_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+_SHIFT = np.uint64(64 - HASH_BITS)
+_BASE = np.uint64(1_000_003)
+_SALTS = {n: np.uint64((n * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF) for n in ORDERS}
+_NON_LETTERS = re.compile(r"[^a-z']+")
+
+# Basic offline heuristic dictionary mapping for fast detection
+DICTIONARIES = {
+    'bemba': {'shani', 'mulishani', 'mukwai', 'icintu', 'ifyakucita', 'ndeya', 'ebo', 'iyo', 'cinshi', 'natotela', 'bushe'},
+    'nyanja': {'bwanji', 'pangono', 'ziya', 'nchito', 'ife', 'ine', 'kodi', 'chiani', 'ndiri', 'zikomo', 'chiyani'},
+    'tonga': {'mbuti', 'kabotu', 'ndapota', 'makani', 'sunu', 'mebo', 'buti', 'twalumba', 'kapati'},
+}
+
+
+def normalize(text: str) -> str:
+    """Lower-case letters with single spaces, padded so word edges are n-grams."""
+    return ' ' + _NON_LETTERS.sub(' ', text.lower()).strip() + ' '
+
+
+def ngram_ids(text: str) -> np.ndarray:
+    """Hashed bucket ids of every 1..4-character n-gram of the normalised text."""
+    codes = np.frombuffer(normalize(text).encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    ids, hashed = [], np.zeros(len(codes), dtype=np.uint64)
+    for n in range(1, max(ORDERS) + 1):
+        if len(codes) < n:
+            break
+        # Polynomial hash of each n-character window (wraps mod 2**64), built
+        # from the (n-1)-character ones, then salted with n and Fibonacci
+        # hashed into the top HASH_BITS bits
+        hashed = hashed[:len(codes) - n + 1] * _BASE + codes[n - 1:]
+        if n in ORDERS:
+            ids.append(((hashed + _SALTS[n]) * _MULTIPLIER) >> _SHIFT)
+    return np.concatenate(ids).astype(np.intp) if ids else np.zeros(0, dtype=np.intp)
+
+
+# ---------------------------------------------------------------------------
+# Training
+# ---------------------------------------------------------------------------
+def corpus_files(corpus_dir: str = CORPUS_DIR) -> Dict[str, str]:
+    return {os.path.splitext(os.path.basename(p))[0]: p
+            for p in sorted(glob.glob(os.path.join(corpus_dir, '*.txt')))}
+
+
+def fingerprint(files: Dict[str, str]) -> str:
+    """Changes whenever a corpus or the n-gram scheme does."""
+    digest = hashlib.sha256(repr((ORDERS, HASH_BITS, SMOOTHING)).encode('utf-8'))
+    for language, path in sorted(files.items()):
+        digest.update(language.encode('utf-8'))
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def train(corpus_dir: str = CORPUS_DIR) -> Dict[str, np.ndarray]:
+    files = corpus_files(corpus_dir)
+    if DEFAULT_LANGUAGE not in files:
+        raise RuntimeError(f"No {DEFAULT_LANGUAGE}.txt corpus in {corpus_dir}")
+    languages = sorted(files)
+    counts = np.zeros((BUCKETS, len(languages)), dtype=np.float64)
+    for column, language in enumerate(languages):
+        with open(files[language], 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    counts[:, column] += np.bincount(ngram_ids(line), minlength=BUCKETS)
+    log_probs = np.log((counts + SMOOTHING) / (counts.sum(axis=0) + SMOOTHING * BUCKETS))
+    return {
+        "languages": np.array(languages),
+        "log_probs": log_probs.astype(np.float16),
+        "fingerprint": np.array(fingerprint(files)),
+    }
+
+
+def build(path: str = MODEL_PATH, corpus_dir: str = CORPUS_DIR) -> Dict[str, np.ndarray]:
+    model = train(corpus_dir)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    np.savez_compressed(path, **model)
+    print(f"Language model written to {path} ({', '.join(model['languages'])})")
+    return model
+
+
+def load_model(path: str = MODEL_PATH, corpus_dir: str = CORPUS_DIR) -> Dict[str, np.ndarray]:
+    """The saved table, retrained (and re-saved if possible) when it is
+    missing or older than the corpora."""
+    try:
+        with np.load(path) as saved:
+            model = {key: saved[key] for key in saved.files}
+        if str(model['fingerprint']) == fingerprint(corpus_files(corpus_dir)):
+            return model
+        print(f"Language model {path} is stale, retraining")
+    except (OSError, KeyError, ValueError) as e:
+        print(f"Language model not loaded ({e}), training from corpora")
+    try:
+        return build(path, corpus_dir)
+    except OSError as e:
+        print(f"Could not save language model: {e}")
+        return train(corpus_dir)
+
 
 class LocalLanguageDetector:
-    def __init__(self):
-        # Basic offline heuristic dictionary mapping for fast detection
-        self.dictionaries = {
-            'bemba': set(['shani', 'mulishani', 'bwino', 'mukwai', 'icintu', 'ifyakucita', 'ndeya', 'ebo', 'e', 'iyo', 'kuti', 'cinshi']),
-            'nyanja': set(['bwanji', 'muli', 'bwino', 'pangono', 'ziya', 'nchito', 'ife', 'ine', 'kodi', 'chiani', 'ndiri']),
-            'tonga': set(['mbuti', 'kabotu', 'ndapota', 'makani', 'sunu', 'mebo', 'pe', 'ayi', 'buti', 'kuli'])
-        }
-        
+    def __init__(self, model: Dict[str, np.ndarray] = None):
+        model = model if model is not None else load_model()
+        self.languages: List[str] = [str(language) for language in model['languages']]
+        # float32 for summing; the stored float16 keeps the file small
+        self.log_probs = model['log_probs'].astype(np.float32)
+        self.dictionaries = {language: DICTIONARIES.get(language, set()) for language in self.languages}
+        self._default = self.languages.index(DEFAULT_LANGUAGE)
+        self._memo = lru_cache(maxsize=MEMO_SIZE)(self._detect)
+
+    def _prior(self, text: str) -> np.ndarray:
+        words = set(normalize(text).split())
+        return np.array([len(words & self.dictionaries[language]) for language in self.languages],
+                        dtype=np.float32) * KEYWORD_PRIOR
+
+    def _leans(self, scores: np.ndarray, ngrams: int) -> int:
+        """Index of the language these scores favour, English unless a local
+        language beats it by MIN_MARGIN per n-gram."""
+        best = int(np.argmax(scores))
+        margin = (scores[best] - scores[self._default]) / max(ngrams, 1)
+        return best if margin >= MIN_MARGIN else self._default
+
+    def _supporting_words(self, text: str, language: int) -> int:
+        """How many different words of text favour language on their own
+        (counting stops at MIN_WORDS)."""
+        count = 0
+        for word in set(normalize(text).split()):
+            ids = ngram_ids(word)
+            if self._leans(self.log_probs[ids].sum(axis=0), ids.size) == language:
+                count += 1
+                if count >= MIN_WORDS:
+                    break
+        return count
+
+    def _decide(self, scores: np.ndarray, ngrams: int, prior: np.ndarray, text: str) -> str:
+        best = int(np.argmax(scores + prior))
+        if best == self._default:
+            return DEFAULT_LANGUAGE
+        if prior[best] > 0:
+            return self.languages[best]
+        # Without a dictionary word, demand a clear per-n-gram margin over
+        # English from the whole text and from enough of its words
+        if self._leans(scores, ngrams) == best and self._supporting_words(text, best) >= MIN_WORDS:
+            return self.languages[best]
+        return DEFAULT_LANGUAGE
+
+    def _detect(self, text: str) -> str:
+        ids = ngram_ids(text)
+        if ids.size == 0:
+            return DEFAULT_LANGUAGE
+        return self._decide(self.log_probs[ids].sum(axis=0), ids.size, self._prior(text), text)
+
     def detect(self, text):
         """
-        Tokenizes text and checks word frequencies against local dictionaries.
+        Scores text against every language's n-gram table.
         Returns 'english' by default if no significant local traits are found.
         """
-        words = set(re.findall(r'\b\w+\b', text.lower()))
-        
-        scores = {lang: 0 for lang in self.dictionaries.keys()}
-        
-        for lang, vocab in self.dictionaries.items():
-            intersection = words.intersection(vocab)
-            scores[lang] = len(intersection)
-            
-        # Get the language with max recognized words
-        best_match = max(scores, key=scores.get)
-        
-        # Threshold: if it matches at least 1 specific local word, classify it
-        if scores[best_match] > 0:
-            return best_match
-            
-        return 'english'
+        text = text or ''
+        return self._memo(text) if len(text) <= MEMO_MAX_CHARS else self._detect(text)
+
+    def detect_many(self, texts: Sequence[str]) -> List[str]:
+        """detect() for a batch, scored with one gather over all n-grams."""
+        texts = [text or '' for text in texts]
+        per_text = [ngram_ids(text) for text in texts]
+        sizes = np.array([ids.size for ids in per_text])
+        if not sizes.any():
+            return [DEFAULT_LANGUAGE] * len(texts)
+        # Per-text sums of the gathered rows; empty texts have no segment
+        starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        scores = np.zeros((len(texts), len(self.languages)), dtype=np.float32)
+        scores[sizes > 0] = np.add.reduceat(self.log_probs[np.concatenate(per_text)],
+                                            starts[sizes > 0], axis=0)
+        return [self._decide(scores[i], sizes[i], self._prior(text), text) if sizes[i] else DEFAULT_LANGUAGE
+                for i, text in enumerate(texts)]
+
+    def stats(self) -> Dict:
+        info = self._memo.cache_info()
+        return {
+            "languages": self.languages,
+            "buckets": int(self.log_probs.shape[0]),
+            "memo_hits": info.hits,
+            "memo_misses": info.misses,
+            "memo_size": info.currsize,
+        }
+
 
 # Global Singleton
 detector_instance = LocalLanguageDetector()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline language identification')
+    parser.add_argument('--build', action='store_true', help='Retrain the n-gram table from the corpora')
+    parser.add_argument('text', nargs='*', help='Text to classify')
+    args = parser.parse_args()
+
+    if args.build:
+        build()
+    if args.text:
+        print(LocalLanguageDetector().detect(' '.join(args.text)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+import os
+import time
+import uuid
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional
+
+import openai
+
+# ---------------------------------------------------------------------------
+# Shared OpenAI client for the tutor and content generator.
+#
+# One openai.OpenAI instance per process keeps its HTTP connection pool warm.
+# Every call has a hard timeout, is retried with exponential backoff + full
+# jitter on transient errors, and holds one of MAX_CONCURRENCY slots. When
+# more than MAX_QUEUE callers are already waiting for a slot (or a slot does
+# not free up within QUEUE_TIMEOUT) the call fails fast with LLMBusy so the
+# caller can answer offline instead of tying up a worker.
+# ---------------------------------------------------------------------------
+
+MODEL = os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo')
+TIMEOUT = float(os.getenv('AI_LLM_TIMEOUT', 20))
+MAX_RETRIES = int(os.getenv('AI_LLM_MAX_RETRIES', 2))
+BACKOFF_BASE = float(os.getenv('AI_LLM_BACKOFF_BASE', 0.5))
+MAX_CONCURRENCY = int(os.getenv('AI_LLM_MAX_CONCURRENCY', 8))
+MAX_QUEUE = int(os.getenv('AI_LLM_MAX_QUEUE', 16))
+QUEUE_TIMEOUT = float(os.getenv('AI_LLM_QUEUE_TIMEOUT', 5))
+
+RETRYABLE = (openai.APITimeoutError, openai.APIConnectionError,
+             openai.RateLimitError, openai.InternalServerError)
+
+
+class LLMBusy(Exception):
+    """Raised instead of queueing when the upstream is saturated."""
+
+
+class LLMClient:
+    def __init__(self, api_key: str = None, model: str = MODEL, timeout: float = TIMEOUT,
+                 max_retries: int = MAX_RETRIES, max_concurrency: int = MAX_CONCURRENCY,
+                 max_queue: int = MAX_QUEUE, queue_timeout: float = QUEUE_TIMEOUT):
+        self.api_key = api_key if api_key is not None else os.getenv('OPENAI_API_KEY')
+        self.model = model
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._client = None
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._in_flight = 0
+        self._stats = {"calls": 0, "failures": 0, "retries": 0, "timeouts": 0, "rejected": 0}
+        self.max_concurrency = max_concurrency
+
+    @property
+    def available(self) -> bool:
+        return bool(self.api_key)
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    # Retries are ours (with jitter); the SDK's would stack on top
+                    self._client = openai.OpenAI(api_key=self.api_key, timeout=self.timeout, max_retries=0)
+        return self._client
+
+    # ------------------------------------------------------------------
+    # Concurrency
+    # ------------------------------------------------------------------
+    @contextmanager
+    def slot(self):
+        """Hold one of the concurrency slots, or raise LLMBusy."""
+        with self._lock:
+            if self._waiting >= self.max_queue:
+                self._stats["rejected"] += 1
+                raise LLMBusy(f"{self._waiting} requests already waiting for the language model")
+            self._waiting += 1
+        try:
+            acquired = self._slots.acquire(timeout=self.queue_timeout)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+        if not acquired:
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise LLMBusy(f"No language model slot free within {self.queue_timeout}s")
+
+        with self._lock:
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+    # ------------------------------------------------------------------
+    # Calls
+    # ------------------------------------------------------------------
+    def chat(self, messages: List[Dict], **kwargs) -> str:
+        """Completion text for messages. Raises LLMBusy when saturated and
+        the last upstream error once retries are exhausted."""
+        if not self.available:
+            raise RuntimeError("OPENAI_API_KEY is not configured")
+        kwargs.setdefault('model', self.model)
+        with self.slot():
+            response = self._with_retries(lambda: self.client.chat.completions.create(
+                messages=messages, timeout=self.timeout, **kwargs))
+        return response.choices[0].message.content.strip()
+
+    def stream(self, messages: List[Dict], **kwargs) -> Iterator[str]:
+        """Yield completion text as it arrives. Retries cover opening the
+        stream only; the slot is held until the stream ends or is closed."""
+        if not self.available:
+            raise RuntimeError("OPENAI_API_KEY is not configured")
+        kwargs.setdefault('model', self.model)
+        with self.slot():
+            chunks = self._with_retries(lambda: self.client.chat.completions.create(
+                messages=messages, stream=True, timeout=self.timeout, **kwargs))
+            try:
+                for chunk in chunks:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            finally:
+                # Client went away mid-answer: drop the upstream connection too
+                close = getattr(chunks, 'close', None)
+                if close:
+                    close()
+
+    def _with_retries(self, call: Callable):
+        for attempt in range(self.max_retries + 1):
+            with self._lock:
+                self._stats["calls"] += 1
+            try:
+                return call()
+            except RETRYABLE as e:
+                with self._lock:
+                    self._stats["failures"] += 1
+                    if isinstance(e, openai.APITimeoutError):
+                        self._stats["timeouts"] += 1
+                if attempt == self.max_retries:
+                    raise
+                with self._lock:
+                    self._stats["retries"] += 1
+                # Full jitter keeps retrying workers from hitting the API in step
+                time.sleep(random.uniform(0, BACKOFF_BASE * (2 ** attempt)))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "model": self.model,
+                "available": self.available,
+                "in_flight": self._in_flight,
+                "waiting": self._waiting,
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+                **self._stats,
+            }
+
+
+class LLMJobs:
+    """Runs tutor requests on a small thread pool so clients can submit and
+    poll instead of holding an HTTP worker for the whole completion.
+
+    Jobs are "queued" until a worker picks them up, then "running", then
+    "succeeded" or "failed". Submitting while max_queue jobs are already
+    queued raises LLMBusy, like a saturated LLMClient.slot(). Only finished
+    jobs are forgotten (oldest first) once more than history are kept.
+    """
+
+    def __init__(self, workers: int = MAX_CONCURRENCY, history: int = 200, max_queue: int = MAX_QUEUE):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='llm-job')
+        self._jobs: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._queued = 0
+        self.history = history
+        self.max_queue = max_queue
+
+    def submit(self, fn: Callable[[], Dict]) -> Dict:
+        job_id = uuid.uuid4().hex[:12]
+        job = {"job_id": job_id, "state": "queued", "created_at": datetime.now().isoformat(),
+               "started_at": None, "finished_at": None, "result": None, "error": None}
+        with self._lock:
+            if self._queued >= self.max_queue:
+                raise LLMBusy(f"{self._queued} tutor jobs already queued")
+            self._queued += 1
+            self._jobs[job_id] = job
+            self._forget_finished()
+            snapshot = dict(job)
+        self._executor.submit(self._run, job, fn)
+        return snapshot
+
+    def _run(self, job, fn):
+        with self._lock:
+            self._queued -= 1
+            job.update(state="running", started_at=datetime.now().isoformat())
+        try:
+            result, state, error = fn(), "succeeded", None
+        except Exception as e:
+            print(f"LLM job {job['job_id']} failed: {e}")
+            result, state, error = None, "failed", str(e)
+        with self._lock:
+            job.update(state=state, result=result, error=error, finished_at=datetime.now().isoformat())
+            self._forget_finished()
+
+    def _forget_finished(self):
+        # Callers hold self._lock; queued and running jobs are never dropped
+        excess = len(self._jobs) - self.history
+        if excess <= 0:
+            return
+        finished = [job_id for job_id, job in self._jobs.items() if job["finished_at"] is not None]
+        for job_id in finished[:excess]:
+            del self._jobs[job_id]
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            states = [job["state"] for job in self._jobs.values()]
+        return {"queued": states.count("queued"), "running": states.count("running"),
+                "kept": len(states), "max_queue": self.max_queue}
+
+
+llm_client = LLMClient()
+llm_jobs = LLMJobs()
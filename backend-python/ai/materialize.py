@@ -0,0 +1,304 @@
+import os
+import sys
+import time
+import threading
+import argparse
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from ai.adaptive import AdaptiveLearningEngine
+from ai.feature_store import FeatureStore
+
+# ---------------------------------------------------------------------------
+# Batch materialisation of adaptive recommendations and risk scores.
+#
+# Scores every student in chunks (one feature-store read, one predict and
+# one predict_proba per chunk) and writes the results to student_recommendations
+# and student_risk (database/migrations/009). The adaptive endpoints serve
+# these rows and only fall back to live inference when a row is missing,
+# older than MAX_AGE_HOURS or produced by a different model version.
+#
+#     python -m ai.materialize                 # one run
+#     AI_MATERIALIZE_NIGHTLY=1 (app.py)        # daily at AI_MATERIALIZE_AT
+#     POST /api/ai/adaptive/materialize        # one background run now
+# ---------------------------------------------------------------------------
+
+CHUNK_SIZE = int(os.getenv('AI_MATERIALIZE_CHUNK_SIZE', 500))
+TOP_K = int(os.getenv('AI_MATERIALIZE_TOP_K', 3))
+MAX_AGE_HOURS = float(os.getenv('AI_MATERIALIZE_MAX_AGE_HOURS', 26))
+NIGHTLY = os.getenv('AI_MATERIALIZE_NIGHTLY', '0').lower() in ('1', 'true', 'yes', 'on')
+RUN_AT = os.getenv('AI_MATERIALIZE_AT', '02:00')
+
+
+def _student_ids(db) -> List[int]:
+    cursor = db.cursor(dictionary=True)
+    cursor.execute("SELECT id FROM users WHERE role = 'student' ORDER BY id")
+    ids = [row['id'] for row in cursor.fetchall()]
+    cursor.close()
+    return ids
+
+
+def store_recommendations(db, recommendations: Dict[int, List[Dict]], version: str, computed_at: datetime):
+    if not recommendations:
+        return
+    user_ids = list(recommendations)
+    placeholders = ', '.join(['%s'] * len(user_ids))
+    cursor = db.cursor()
+    cursor.execute(f"DELETE FROM student_recommendations WHERE user_id IN ({placeholders})", tuple(user_ids))
+    rows = [(user_id, rank, rec['experiment_id'], rec['predicted_score'], version, computed_at)
+            for user_id, recs in recommendations.items()
+            for rank, rec in enumerate(recs, start=1)]
+    if rows:
+        cursor.executemany("""
+            INSERT INTO student_recommendations
+                (user_id, rank_position, experiment_id, predicted_score, model_version, computed_at)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """, rows)
+    cursor.close()
+
+
+def store_risk(db, risks: Dict[int, Dict], version: str, computed_at: datetime):
+    if not risks:
+        return
+    cursor = db.cursor()
+    cursor.executemany("""
+        INSERT INTO student_risk (user_id, is_at_risk, probability, actual_avg_score, model_version, computed_at)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE is_at_risk = VALUES(is_at_risk), probability = VALUES(probability),
+            actual_avg_score = VALUES(actual_avg_score), model_version = VALUES(model_version),
+            computed_at = VALUES(computed_at)
+    """, [(user_id, int(r['is_at_risk']), r['probability'], r.get('actual_avg_score'), version, computed_at)
+          for user_id, r in risks.items()])
+    cursor.close()
+
+
+def materialize(db, chunk_size: int = CHUNK_SIZE, k: int = TOP_K) -> Dict:
+    """Score every student and persist the results. Returns run stats."""
+    started = time.perf_counter()
+    engine = AdaptiveLearningEngine(db)
+    engine.load_models()
+    if not engine.is_trained:
+        raise RuntimeError("No trained adaptive models to materialize")
+
+    student_ids = _student_ids(db)
+    computed_at = datetime.now()
+    at_risk = 0
+    for i in range(0, len(student_ids), chunk_size):
+        chunk = student_ids[i:i + chunk_size]
+        recommendations = engine.recommend_batch(chunk, k)
+        # Feature rows for the chunk; dirty ones are recomputed from progress
+        risks = engine.assess_risk(FeatureStore(db).get_many(chunk))
+        at_risk += sum(1 for r in risks.values() if r['is_at_risk'])
+
+        store_recommendations(db, recommendations, engine.model_version, computed_at)
+        store_risk(db, risks, engine.model_version, computed_at)
+        db.commit()
+
+    stats = {
+        "students": len(student_ids),
+        "at_risk": at_risk,
+        "chunks": (len(student_ids) + chunk_size - 1) // chunk_size,
+        "model_version": engine.model_version,
+        "computed_at": computed_at.isoformat(),
+        "duration_s": round(time.perf_counter() - started, 2),
+    }
+    print(f"Materialized adaptive results: {stats}")
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# Serving helpers
+# ---------------------------------------------------------------------------
+def _is_fresh(row, version) -> bool:
+    return (row['model_version'] == version
+            and datetime.now() - row['computed_at'] <= timedelta(hours=MAX_AGE_HOURS))
+
+
+def precomputed_recommendations(db, user_id: int, version: str) -> Optional[List[Dict]]:
+    """Stored top-k for user_id, or None when missing or stale."""
+    cursor = db.cursor(dictionary=True)
+    cursor.execute("""
+        SELECT r.experiment_id, r.predicted_score, r.model_version, r.computed_at, e.title, e.subject
+        FROM student_recommendations r
+        JOIN experiments e ON r.experiment_id = e.id
+        WHERE r.user_id = %s
+        ORDER BY r.rank_position
+    """, (user_id,))
+    rows = cursor.fetchall()
+    cursor.close()
+    if not rows or not _is_fresh(rows[0], version):
+        return None
+    return [{
+        "experiment_id": row['experiment_id'],
+        "title": row['title'],
+        "subject": row['subject'],
+        "predicted_score": float(row['predicted_score']),
+        "reason": f"Matches your competency in {row['subject']}",
+        "computed_at": row['computed_at'].isoformat(),
+    } for row in rows]
+
+
+def precomputed_risk(db, user_id: int, version: str) -> Optional[Dict]:
+    """Stored risk row for user_id, or None when missing or stale."""
+    cursor = db.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM student_risk WHERE user_id = %s", (user_id,))
+    row = cursor.fetchone()
+    cursor.close()
+    if not row or not _is_fresh(row, version):
+        return None
+    result = {
+        "user_id": user_id,
+        "is_at_risk": bool(row['is_at_risk']),
+        "probability": float(row['probability']),
+        "computed_at": row['computed_at'].isoformat(),
+    }
+    if row['actual_avg_score'] is not None:
+        result["actual_avg_score"] = float(row['actual_avg_score'])
+    return result
+
+
+def serve_recommendations(db, engine: AdaptiveLearningEngine, user_id: int):
+    """(recommendations, source): precomputed rows when fresh, otherwise
+    live inference whose result is written back for the next request."""
+    engine.load_models()
+    try:
+        stored = precomputed_recommendations(db, user_id, engine.model_version)
+    except Exception as e:
+        print(f"Precomputed recommendations unavailable: {e}")
+        return engine.get_recommendations(user_id), "live"
+    if stored is not None:
+        return stored, "precomputed"
+
+    live = engine.get_recommendations(user_id)
+    if engine.is_trained:
+        try:
+            store_recommendations(db, {user_id: live}, engine.model_version, datetime.now())
+            db.commit()
+        except Exception as e:
+            print(f"Recommendation write-back failed: {e}")
+    return live, "live"
+
+
+def serve_risk(db, engine: AdaptiveLearningEngine, user_id: int):
+    """(risk, source), same fallback rules as serve_recommendations."""
+    engine.load_models()
+    try:
+        stored = precomputed_risk(db, user_id, engine.model_version)
+    except Exception as e:
+        print(f"Precomputed risk unavailable: {e}")
+        return engine.predict_risk(user_id), "live"
+    if stored is not None:
+        return stored, "precomputed"
+
+    live = engine.predict_risk(user_id)
+    if engine.is_trained and 'error' not in live:
+        try:
+            store_risk(db, {user_id: live}, engine.model_version, datetime.now())
+            db.commit()
+        except Exception as e:
+            print(f"Risk write-back failed: {e}")
+    return live, "live"
+
+
+# ---------------------------------------------------------------------------
+# Nightly scheduler
+# ---------------------------------------------------------------------------
+class NightlyMaterializer:
+    """Runs materialize() in a daemon thread: daily at run_at (HH:MM) once
+    start() is called, and on demand via run_now(). At most one run is in
+    progress at a time."""
+
+    def __init__(self, connect: Callable, run_at: str = RUN_AT):
+        self.connect = connect
+        hour, minute = run_at.split(':')
+        self.hour, self.minute = int(hour), int(minute)
+        self.last_run: Optional[Dict] = None
+        self._lock = threading.Lock()
+        self._running = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    def seconds_until_next_run(self, now: datetime = None) -> float:
+        now = now or datetime.now()
+        target = now.replace(hour=self.hour, minute=self.minute, second=0, microsecond=0)
+        if target <= now:
+            target += timedelta(days=1)
+        return (target - now).total_seconds()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='nightly-materializer', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def run_now(self) -> bool:
+        """Start a run in the background. False if one is already running."""
+        if not self._claim():
+            return False
+        threading.Thread(target=self._materialize, name='materialize-now', daemon=True).start()
+        return True
+
+    def run(self) -> Optional[Dict]:
+        """One run in the calling thread (None if another run is in progress)."""
+        if not self._claim():
+            return None
+        return self._materialize()
+
+    def status(self) -> Dict:
+        with self._lock:
+            running = self._running
+        return {
+            "running": running,
+            "last_run": self.last_run,
+            "nightly": self._thread is not None and self._thread.is_alive(),
+            "run_at": f"{self.hour:02d}:{self.minute:02d}",
+        }
+
+    def _claim(self) -> bool:
+        with self._lock:
+            if self._running:
+                return False
+            self._running = True
+            return True
+
+    def _materialize(self):
+        # Caller has claimed the run
+        db = None
+        try:
+            db = self.connect()
+            self.last_run = materialize(db)
+        except Exception as e:
+            print(f"Materialization failed: {e}")
+            self.last_run = {"error": str(e), "at": datetime.now().isoformat()}
+        finally:
+            if db is not None:
+                db.close()
+            with self._lock:
+                self._running = False
+        return self.last_run
+
+    def _run(self):
+        while not self._stop.wait(self.seconds_until_next_run()):
+            if self.run() is None:
+                print("Nightly materialization skipped: a run is already in progress")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute adaptive recommendations and risk for all students')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Students scored per chunk')
+    parser.add_argument('--top-k', type=int, default=TOP_K, help='Recommendations stored per student')
+    args = parser.parse_args()
+
+    from db.pool import mysql_connect
+    db = mysql_connect()
+    try:
+        materialize(db, args.chunk_size, args.top_k)
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+import itertools
+import json
+import os
+import shutil
+import threading
+import time
+import joblib
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# ---------------------------------------------------------------------------
+# Process-wide registry for the adaptive learning models.
+#
+# Layout under ai/models/:
+#     versions/<version>/{recommender,risk_model,le_subject}.joblib
+#     versions/<version>/meta.json
+#     CURRENT                      <- name of the active version
+# The original flat ai/models/*.joblib files are served as version
+# "baseline" until a trained version is published.
+#
+# Models are loaded once per process with mmap_mode='r' (tree arrays stay
+# in the page cache and are shared between workers) and swapped atomically:
+# publish() writes a new version directory, then os.replace()s CURRENT.
+# ---------------------------------------------------------------------------
+
+MODEL_NAMES = ('recommender', 'risk_model', 'le_subject')
+MODEL_PATH = os.path.join(os.path.dirname(__file__), 'models')
+CHECK_INTERVAL = float(os.getenv('AI_MODEL_CHECK_INTERVAL', 5))
+KEEP_VERSIONS = int(os.getenv('AI_MODEL_KEEP_VERSIONS', 5))
+BASELINE_VERSION = 'baseline'
+
+
+class ModelBundle:
+    """One loaded, immutable set of adaptive models plus its metadata."""
+
+    def __init__(self, version: str, models: Dict, metadata: Dict):
+        self.version = version
+        self.recommender = models['recommender']
+        self.risk_model = models['risk_model']
+        self.le_subject = models['le_subject']
+        self.metadata = metadata
+
+
+class ModelRegistry:
+    def __init__(self, root: str = MODEL_PATH, check_interval: float = CHECK_INTERVAL):
+        self.root = root
+        self.versions_dir = os.path.join(root, 'versions')
+        self.pointer_path = os.path.join(root, 'CURRENT')
+        self.check_interval = check_interval
+        self._bundle: Optional[ModelBundle] = None
+        self._lock = threading.Lock()
+        self._last_check = 0.0
+        self._failed_version: Optional[str] = None  # reported once, until it changes
+        self._sequence = itertools.count(1)
+        self.swaps = 0
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    def get(self) -> Optional[ModelBundle]:
+        """Current bundle, or None when no models exist. Picks up versions
+        published by other processes within check_interval seconds."""
+        bundle = self._bundle
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return bundle
+
+        with self._lock:
+            self._last_check = now
+            version = self.current_version()
+            if self._bundle is None or self._bundle.version != version:
+                try:
+                    self._swap(self._load(version))
+                    self._failed_version = None
+                except (OSError, ValueError, KeyError) as e:
+                    if self._failed_version != version:
+                        print(f"Model registry: could not load version {version}: {e}")
+                        self._failed_version = version
+            return self._bundle
+
+    def refresh(self) -> Optional[ModelBundle]:
+        """Re-read CURRENT now instead of waiting for check_interval."""
+        self._last_check = 0.0
+        return self.get()
+
+    def current_version(self) -> str:
+        try:
+            with open(self.pointer_path) as f:
+                return f.read().strip() or BASELINE_VERSION
+        except OSError:
+            return BASELINE_VERSION
+
+    def _version_dir(self, version):
+        if version == BASELINE_VERSION:
+            return self.root
+        return os.path.join(self.versions_dir, version)
+
+    def _load(self, version) -> ModelBundle:
+        directory = self._version_dir(version)
+        started = time.perf_counter()
+        models = {name: joblib.load(os.path.join(directory, f'{name}.joblib'), mmap_mode='r')
+                  for name in MODEL_NAMES}
+        metadata = self._read_metadata(version)
+        metadata['loaded_at'] = datetime.now().isoformat()
+        metadata['load_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        return ModelBundle(version, models, metadata)
+
+    def _swap(self, bundle):
+        # Callers hold self._lock; readers see either the old or new bundle
+        self._bundle = bundle
+        self.swaps += 1
+        print(f"Adaptive models: serving version {bundle.version}")
+
+    def _read_metadata(self, version) -> Dict:
+        path = os.path.join(self._version_dir(version), 'meta.json')
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"version": version}
+
+    # ------------------------------------------------------------------
+    # Publishing
+    # ------------------------------------------------------------------
+    def publish(self, recommender, risk_model, le_subject, metadata: Optional[Dict] = None) -> ModelBundle:
+        """Persist a newly trained set of models and make it current."""
+        # Microseconds, pid and a per-process sequence: unique even for two
+        # publishes in the same second, and still sorts oldest to newest
+        version = f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')}-{os.getpid()}-{next(self._sequence)}"
+        final_dir = os.path.join(self.versions_dir, version)
+        tmp_dir = f"{final_dir}.tmp"
+        os.makedirs(tmp_dir, exist_ok=True)
+
+        models = {'recommender': recommender, 'risk_model': risk_model, 'le_subject': le_subject}
+        for name, model in models.items():
+            # Uncompressed so the arrays can be memory-mapped on load
+            joblib.dump(model, os.path.join(tmp_dir, f'{name}.joblib'))
+        meta = {"version": version, "created_at": datetime.now().isoformat(), **(metadata or {})}
+        with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+            json.dump(meta, f, indent=2, default=str)
+        os.replace(tmp_dir, final_dir)
+
+        return self.activate(version)
+
+    def activate(self, version: str) -> ModelBundle:
+        """Point CURRENT at an existing version (also used for rollback)."""
+        bundle = self._load(version)
+        with self._lock:
+            tmp = f"{self.pointer_path}.{os.getpid()}.tmp"
+            with open(tmp, 'w') as f:
+                f.write(version)
+            os.replace(tmp, self.pointer_path)
+            self._swap(bundle)
+            self._last_check = time.monotonic()
+        self._prune()
+        return bundle
+
+    def _prune(self):
+        if not os.path.isdir(self.versions_dir):
+            return
+        keep = {self.current_version()}
+        for version in self.versions()[:KEEP_VERSIONS]:
+            keep.add(version['version'])
+        for name in os.listdir(self.versions_dir):
+            if name not in keep and not name.endswith('.tmp'):
+                shutil.rmtree(os.path.join(self.versions_dir, name), ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+    def versions(self) -> List[Dict]:
+        """Metadata of stored versions, newest first."""
+        if not os.path.isdir(self.versions_dir):
+            return []
+        names = sorted((n for n in os.listdir(self.versions_dir) if not n.endswith('.tmp')), reverse=True)
+        return [self._read_metadata(n) for n in names]
+
+    def info(self) -> Dict:
+        bundle = self.get()
+        return {
+            "current_version": bundle.version if bundle else None,
+            "metadata": bundle.metadata if bundle else None,
+            "swaps": self.swaps,
+            "versions": self.versions(),
+        }
+
+
+model_registry = ModelRegistry()
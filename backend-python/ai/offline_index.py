@@ -0,0 +1,209 @@
+import json
+import math
+import os
+import re
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# ---------------------------------------------------------------------------
+# Offline answer retrieval (no network, no model).
+#
+# A BM25 inverted index over short documents: the tutor's canned answers,
+# ai/data/concepts.json and ai/data/context.json, or a command vocabulary.
+# Each document has boosted keywords plus body text. Query words that are
+# not in the vocabulary are matched to vocabulary words within a small edit
+# distance (symmetric-delete candidates, Damerau-Levenshtein check), so
+# "pendulm" and "titraton" still find their answers. Lookups over a few
+# hundred documents take well under a millisecond.
+# ---------------------------------------------------------------------------
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+CONCEPTS_PATH = os.path.join(DATA_DIR, 'concepts.json')
+CONTEXT_PATH = os.path.join(DATA_DIR, 'context.json')
+
+K1 = 1.5
+B = 0.75
+KEYWORD_BOOST = 3      # keyword occurrences count this many times
+FUZZY_WEIGHT = 0.7     # per edit: a corrected word scores this fraction of an exact one
+MIN_FUZZY_LENGTH = 5   # shorter words are too ambiguous to correct ("step" vs "stop")
+SUBJECT_BOOST = 1.5    # documents in the asked-about subject
+
+STOPWORDS = frozenset("""
+a an and are as at be but by can do does for from how i if in is it me my of on or so
+that the their there these this to was what when where which who why will with you your
+""".split())
+
+# Asking words that say nothing about the topic (kept for command indexes,
+# where "explain" is the command)
+QUESTION_WORDS = frozenset("explain describe tell about please define meaning mean".split())
+
+_WORDS = re.compile(r"[a-z0-9]+")
+
+
+def stem(word: str) -> str:
+    """Strip the commonest English suffixes ('pendulums' -> 'pendulum')."""
+    if word.endswith(('xes', 'ches', 'shes', 'sses')):
+        return word[:-2]
+    for suffix in ('ing', 'ed', 's'):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3 and not word.endswith('ss'):
+            return word[:-len(suffix)]
+    return word
+
+
+def tokenize(text: str, stopwords: frozenset = STOPWORDS) -> List[str]:
+    return [stem(w) for w in _WORDS.findall(text.lower()) if w not in stopwords]
+
+
+def _deletes(word: str) -> set:
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Damerau-Levenshtein (adjacent transpositions); returns limit + 1 as
+    soon as the distance is known to exceed limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous, current = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        before, previous, current = previous, current, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+    return current[-1]
+
+
+def _merge(words: List[Dict[str, float]]) -> Dict[str, float]:
+    weights: Dict[str, float] = {}
+    for terms in words:
+        for term, weight in terms.items():
+            weights[term] = max(weights.get(term, 0.0), weight)
+    return weights
+
+
+class OfflineIndex:
+    """BM25 over documents {"id", "keywords", "text", "answer", "subject", ...}."""
+
+    def __init__(self, documents: Iterable[Dict], stopwords: frozenset = STOPWORDS):
+        self.documents = list(documents)
+        self.stopwords = stopwords
+        self.postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self.lengths = []
+        for i, doc in enumerate(self.documents):
+            tokens = (tokenize(doc.get('keywords', ''), stopwords) * KEYWORD_BOOST +
+                      tokenize(doc.get('text', ''), stopwords))
+            self.lengths.append(len(tokens))
+            for term, tf in Counter(tokens).items():
+                self.postings[term].append((i, tf))
+        n = len(self.documents)
+        self.avg_length = sum(self.lengths) / n if n else 0.0
+        self.idf = {term: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5)) for term, p in self.postings.items()}
+        # Symmetric-delete map for typo correction
+        self._by_delete: Dict[str, List[str]] = defaultdict(list)
+        for term in self.postings:
+            if len(term) >= 4:
+                for variant in _deletes(term):
+                    self._by_delete[variant].append(term)
+        self._corrections = lru_cache(maxsize=4096)(self._correct)
+
+    def _correct(self, word: str) -> Tuple[Tuple[str, int], ...]:
+        """(vocabulary word, edit distance) within the allowed distance of word."""
+        if len(word) < MIN_FUZZY_LENGTH:
+            return ()
+        limit = 1 if len(word) <= 6 else 2
+        candidates = set(self._by_delete.get(word, ()))
+        for variant in _deletes(word):
+            if variant in self.postings:
+                candidates.add(variant)
+            candidates.update(self._by_delete.get(variant, ()))
+        distances = ((c, edit_distance(word, c, limit)) for c in sorted(candidates))
+        return tuple((c, d) for c, d in distances if d <= limit)
+
+    def _expand_words(self, query: str) -> List[Dict[str, float]]:
+        """Per query word: vocabulary term -> weight (empty if nothing matches)."""
+        expanded = []
+        for word in tokenize(query, self.stopwords):
+            if word in self.postings:
+                expanded.append({word: 1.0})
+            else:
+                expanded.append({term: FUZZY_WEIGHT ** distance for term, distance in self._corrections(word)})
+        return expanded
+
+    def expand(self, query: str) -> Dict[str, float]:
+        """Query terms -> weight, with unknown words replaced by corrections."""
+        return _merge(self._expand_words(query))
+
+    def search(self, query: str, k: int = 3, subject: Optional[str] = None,
+               min_score: float = 0.0, min_coverage: float = 0.0) -> List[Tuple[Dict, float]]:
+        """Top-k (document, score) for query, best first. min_coverage is the
+        fraction of the query's words (unknown ones included) a document must
+        match, so one incidental shared word is not an answer."""
+        words = self._expand_words(query)
+        scores: Dict[int, float] = defaultdict(float)
+        for term, weight in _merge(words).items():
+            idf = self.idf[term]
+            for i, tf in self.postings[term]:
+                norm = K1 * (1 - B + B * self.lengths[i] / self.avg_length)
+                scores[i] += weight * idf * tf * (K1 + 1) / (tf + norm)
+        if min_coverage > 0:
+            matched: Dict[int, set] = defaultdict(set)
+            for position, terms in enumerate(words):
+                for term in terms:
+                    for i, _ in self.postings[term]:
+                        matched[i].add(position)
+            scores = {i: score for i, score in scores.items()
+                      if len(matched[i]) >= min_coverage * len(words)}
+        if subject:
+            for i in scores:
+                if self.documents[i].get('subject') == subject:
+                    scores[i] *= SUBJECT_BOOST
+        # Ties keep document order, so earlier documents win
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:k]
+        return [(self.documents[i], round(score, 3)) for i, score in ranked if score > min_score]
+
+    def best(self, query: str, subject: Optional[str] = None, min_score: float = 0.0,
+             min_coverage: float = 0.0) -> Optional[Dict]:
+        results = self.search(query, k=1, subject=subject, min_score=min_score, min_coverage=min_coverage)
+        return results[0][0] if results else None
+
+
+# ---------------------------------------------------------------------------
+# Tutor corpus
+# ---------------------------------------------------------------------------
+def _load_json(path, default):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Offline index: could not read {path}: {e}")
+        return default
+
+
+def tutor_documents(canned: Dict[str, Dict[str, str]]) -> List[Dict]:
+    """Canned answers first (so they win ties), then concepts and local context."""
+    documents = [{"id": f"{subject}:{key}", "source": "canned", "subject": subject,
+                  "keywords": key, "text": answer, "answer": answer, "title": key}
+                 for subject, answers in canned.items() for key, answer in answers.items()]
+    for concept in _load_json(CONCEPTS_PATH, []):
+        documents.append({
+            "id": f"concept:{concept['id']}", "source": "concept", "subject": concept.get('subject'),
+            "keywords": concept['concept'], "text": f"{concept['description']} {concept.get('help', '')}",
+            "answer": f"{concept['concept']}: {concept['description']} Tip: {concept['help']}",
+            "title": concept['concept'],
+        })
+    for key, entry in _load_json(CONTEXT_PATH, {}).items():
+        documents.append({
+            "id": f"context:{key}", "source": "context", "subject": None,
+            "keywords": f"{key.replace('_', ' ')} {entry.get('theme', '')}", "text": entry['context'],
+            "answer": f"{entry['context']} ({entry.get('theme', 'Local context')})",
+            "title": key.replace('_', ' '),
+        })
+    return documents
+
+
+def build_tutor_index(canned: Dict[str, Dict[str, str]]) -> OfflineIndex:
+    return OfflineIndex(tutor_documents(canned), stopwords=STOPWORDS | QUESTION_WORDS)
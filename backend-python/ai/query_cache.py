@@ -0,0 +1,154 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, Counter
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional
+
+# ---------------------------------------------------------------------------
+# Shared helpers for LabAssistant query traffic: an LRU cache keyed by a
+# normalised query, and a micro-batcher that folds concurrent encode()
+# calls into a single forward pass.
+# ---------------------------------------------------------------------------
+
+QUERY_CACHE_SIZE = int(os.getenv('AI_QUERY_CACHE_SIZE', 1024))
+BATCH_MAX_SIZE = int(os.getenv('AI_BATCH_MAX_SIZE', 32))
+BATCH_WAIT_MS = float(os.getenv('AI_BATCH_WAIT_MS', 5))
+
+_PUNCTUATION = re.compile(r"[^\w\s']")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """'  What is Ohm's law?? ' -> "what is ohm's law" """
+    query = _PUNCTUATION.sub(' ', query.lower())
+    return _SPACES.sub(' ', query).strip()
+
+
+class LRUCache:
+    """Thread-safe LRU mapping with hit/miss counters."""
+
+    def __init__(self, max_size: int = QUERY_CACHE_SIZE):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+class MicroBatcher:
+    """Collect concurrent requests for a short window and process them as
+    one batch.
+
+    process_batch receives a list of distinct inputs and must return one
+    result per input, in order. A batch is flushed when it reaches
+    max_batch_size or when the oldest request has waited max_wait_ms.
+    """
+
+    def __init__(self, process_batch: Callable[[List], List],
+                 max_batch_size: int = BATCH_MAX_SIZE, max_wait_ms: float = BATCH_WAIT_MS):
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self._pending: "OrderedDict[object, List[Future]]" = OrderedDict()
+        self._oldest = None
+        self._cond = threading.Condition()
+        self._thread = None
+        self.batch_sizes = Counter()
+        self.requests = 0
+
+    def submit(self, item) -> Future:
+        future = Future()
+        with self._cond:
+            self.requests += 1
+            if not self._pending:
+                self._oldest = time.monotonic()
+            # Identical in-flight inputs share one slot in the batch
+            self._pending.setdefault(item, []).append(future)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return future
+
+    def __call__(self, item, timeout: Optional[float] = None):
+        return self.submit(item).result(timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                while len(self._pending) < self.max_batch_size:
+                    remaining = self._oldest + self.max_wait - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = []
+                while self._pending and len(batch) < self.max_batch_size:
+                    batch.append(self._pending.popitem(last=False))
+                if self._pending:
+                    self._oldest = time.monotonic()
+                self.batch_sizes[len(batch)] += 1
+
+            items = [item for item, _ in batch]
+            try:
+                results = self.process_batch(items)
+            except Exception as e:
+                for _, futures in batch:
+                    for future in futures:
+                        future.set_exception(e)
+                continue
+            for (_, futures), result in zip(batch, results):
+                for future in futures:
+                    future.set_result(result)
+
+    def stats(self) -> Dict:
+        with self._cond:
+            batches = sum(self.batch_sizes.values())
+            items = sum(size * count for size, count in self.batch_sizes.items())
+            return {
+                "requests": self.requests,
+                "batches": batches,
+                "mean_batch_size": round(items / batches, 2) if batches else 0.0,
+                "batch_size_histogram": {str(k): v for k, v in sorted(self.batch_sizes.items())},
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000.0,
+            }
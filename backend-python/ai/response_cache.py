@@ -0,0 +1,269 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import sqlite3
+import argparse
+import threading
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from ai.query_cache import normalize_query
+
+# ---------------------------------------------------------------------------
+# Persistent cache for generated teaching content (ECZContentGenerator).
+#
+# Entries live in a local SQLite file keyed by the normalised request
+# (kind, scope, topic), where scope is everything except the free-text topic
+# ("worksheet|grade 10", "quiz|physics|3"). For content and quizzes a miss
+# on the exact key falls back to the closest cached topic in the same scope
+# when the embedder is available and the cosine similarity clears SIMILARITY,
+# so "Ohm's law" and "ohms law" share one generation. Tutor answers are
+# exact-match only (a near-duplicate question can ask something else) and
+# capped at TUTOR_MAX_ENTRIES, oldest first. Entries expire after TTL_DAYS.
+#
+#     python -m ai.response_cache --prewarm     # content + quiz per experiment
+# ---------------------------------------------------------------------------
+
+ENABLED = os.getenv('AI_RESPONSE_CACHE', '1').lower() not in ('0', 'false', 'no', 'off')
+CACHE_PATH = os.getenv('AI_RESPONSE_CACHE_PATH',
+                       os.path.join(os.path.dirname(__file__), 'cache', 'responses.sqlite3'))
+TTL_DAYS = float(os.getenv('AI_RESPONSE_CACHE_TTL_DAYS', 120))
+SIMILARITY = float(os.getenv('AI_RESPONSE_CACHE_SIMILARITY', 0.92))
+PREWARM_TYPES = [t.strip() for t in os.getenv('AI_RESPONSE_PREWARM_TYPES', 'worksheet,explanation').split(',') if t.strip()]
+TUTOR_MAX_ENTRIES = int(os.getenv('AI_RESPONSE_CACHE_TUTOR_MAX_ENTRIES', 5000))
+SEMANTIC_KINDS = ('content', 'quiz')
+QUIZ_COUNT = 3  # what /api/ai/quiz asks for
+
+
+def scope_key(*parts) -> str:
+    return '|'.join(normalize_query(str(p)) for p in parts)
+
+
+class ResponseCache:
+    def __init__(self, path: str = CACHE_PATH, ttl_days: float = TTL_DAYS, similarity: float = SIMILARITY,
+                 tutor_max_entries: int = TUTOR_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.similarity = similarity
+        self.tutor_max_entries = tutor_max_entries
+        # Returns a vector for a topic, or None while no model is loaded
+        self.embedder: Optional[Callable[[str], Optional[np.ndarray]]] = None
+        self._conn = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+
+    def _db(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    scope TEXT NOT NULL,
+                    topic TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    embedding BLOB,
+                    created_at REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_scope ON responses (kind, scope)")
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def key(kind: str, scope: str, topic: str) -> str:
+        return hashlib.sha256(json.dumps([kind, scope, topic]).encode('utf-8')).hexdigest()
+
+    def _embed(self, topic: str):
+        if self.embedder is None:
+            return None
+        try:
+            vector = self.embedder(topic)
+        except Exception as e:
+            print(f"Response cache embedding failed: {e}")
+            return None
+        if vector is None:
+            return None
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    # ------------------------------------------------------------------
+    # Lookup / store
+    # ------------------------------------------------------------------
+    def get(self, kind: str, scope: str, topic: str):
+        """Cached value for (kind, scope, topic) or, for SEMANTIC_KINDS, its
+        nearest neighbour within the same scope; None on a miss."""
+        topic = normalize_query(topic)
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            db = self._db()
+            row = db.execute("SELECT key, value FROM responses WHERE key = ? AND created_at >= ?",
+                             (self.key(kind, scope, topic), cutoff)).fetchone()
+            if row is not None:
+                self.hits += 1
+                db.execute("UPDATE responses SET hits = hits + 1 WHERE key = ?", (row[0],))
+                db.commit()
+                return json.loads(row[1])
+
+        vector = self._embed(topic) if kind in SEMANTIC_KINDS else None
+        if vector is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            rows = self._db().execute("""
+                SELECT key, embedding FROM responses
+                WHERE kind = ? AND scope = ? AND created_at >= ? AND embedding IS NOT NULL
+            """, (kind, scope, cutoff)).fetchall()
+        # Score outside the lock so other lookups are not held up
+        stored = [(key, np.frombuffer(blob, dtype=np.float32)) for key, blob in rows]
+        stored = [(key, e) for key, e in stored if e.shape == vector.shape]
+        if stored:
+            scores = np.stack([e for _, e in stored]) @ vector
+            best = int(np.argmax(scores))
+            if scores[best] >= self.similarity:
+                with self._lock:
+                    db = self._db()
+                    row = db.execute("SELECT value FROM responses WHERE key = ?", (stored[best][0],)).fetchone()
+                    if row is not None:
+                        self.near_hits += 1
+                        db.execute("UPDATE responses SET hits = hits + 1 WHERE key = ?", (stored[best][0],))
+                        db.commit()
+                        return json.loads(row[0])
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, kind: str, scope: str, topic: str, value):
+        topic = normalize_query(topic)
+        vector = self._embed(topic) if kind in SEMANTIC_KINDS else None
+        with self._lock:
+            db = self._db()
+            db.execute("""
+                INSERT OR REPLACE INTO responses (key, kind, scope, topic, value, embedding, created_at, hits)
+                VALUES (?, ?, ?, ?, ?, ?, ?, 0)
+            """, (self.key(kind, scope, topic), kind, scope, topic, json.dumps(value),
+                  vector.tobytes() if vector is not None else None, time.time()))
+            if kind == 'tutor':
+                # Every opening question is stored; drop the oldest beyond the cap
+                db.execute("""
+                    DELETE FROM responses WHERE key IN (
+                        SELECT key FROM responses WHERE kind = 'tutor'
+                        ORDER BY created_at DESC LIMIT -1 OFFSET ?
+                    )
+                """, (self.tutor_max_entries,))
+            db.commit()
+
+    def contains(self, kind: str, scope: str, topic: str) -> bool:
+        """Exact, unexpired entry present (no near-duplicate matching)."""
+        with self._lock:
+            row = self._db().execute("SELECT 1 FROM responses WHERE key = ? AND created_at >= ?",
+                                     (self.key(kind, scope, normalize_query(topic)),
+                                      time.time() - self.ttl)).fetchone()
+        return row is not None
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            db = self._db()
+            removed = db.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,)).rowcount
+            db.commit()
+        return removed
+
+    def stats(self) -> Dict:
+        with self._lock:
+            rows = self._db().execute("SELECT kind, COUNT(*) FROM responses GROUP BY kind").fetchall()
+            total = self.hits + self.near_hits + self.misses
+            return {
+                "path": self.path,
+                "entries": {kind: count for kind, count in rows},
+                "hits": self.hits,
+                "near_hits": self.near_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.near_hits) / total, 3) if total else 0.0,
+                "ttl_days": self.ttl / 86400,
+                "tutor_max_entries": self.tutor_max_entries,
+                "semantic": self.embedder is not None,
+            }
+
+
+# ---------------------------------------------------------------------------
+# Pre-generation
+# ---------------------------------------------------------------------------
+def _experiments(db) -> List[Dict]:
+    cursor = db.cursor(dictionary=True)
+    cursor.execute("SELECT id, title, subject, grade_or_form FROM experiments ORDER BY id")
+    rows = cursor.fetchall()
+    cursor.close()
+    return rows
+
+
+def prewarm(db, generator, content_types: List[str] = PREWARM_TYPES) -> Dict:
+    """Generate content and a quiz for every experiment not cached yet."""
+    if generator.client is None:
+        raise RuntimeError("OPENAI_API_KEY is not configured; nothing to pre-generate")
+    if generator.cache is None:
+        raise RuntimeError("Response cache is disabled (AI_RESPONSE_CACHE=0)")
+    cache = generator.cache
+    started = time.perf_counter()
+    generated = skipped = not_stored = 0
+    for exp in _experiments(db):
+        jobs = [('content', scope_key(content_type, exp['grade_or_form']),
+                 lambda content_type=content_type: generator.generate(content_type, exp['title'], exp['grade_or_form']))
+                for content_type in content_types]
+        jobs.append(('quiz', scope_key(exp['subject'], QUIZ_COUNT),
+                     lambda: generator.generate_quiz(exp['subject'], exp['title'], count=QUIZ_COUNT)))
+        for kind, scope, generate in jobs:
+            if cache.contains(kind, scope, exp['title']):
+                skipped += 1
+                continue
+            generate()
+            # Errors are not stored and near-duplicate hits store nothing new,
+            # so only count what is actually in the cache now
+            if cache.contains(kind, scope, exp['title']):
+                generated += 1
+            else:
+                not_stored += 1
+    stats = {"generated": generated, "skipped": skipped, "not_stored": not_stored,
+             "duration_s": round(time.perf_counter() - started, 2)}
+    print(f"Response cache prewarmed: {stats}")
+    return stats
+
+
+response_cache = ResponseCache() if ENABLED else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generated-content cache maintenance')
+    parser.add_argument('--prewarm', action='store_true', help='Pre-generate content for every experiment')
+    parser.add_argument('--purge', action='store_true', help='Delete expired entries')
+    args = parser.parse_args()
+
+    if response_cache is None:
+        print("Response cache is disabled (AI_RESPONSE_CACHE=0)")
+        return 1
+    if args.purge:
+        print(f"Removed {response_cache.purge_expired()} expired entries")
+    if args.prewarm:
+        from db.pool import mysql_connect
+        from ai.tutor import ECZContentGenerator
+        db = mysql_connect()
+        try:
+            prewarm(db, ECZContentGenerator())
+        finally:
+            db.close()
+    print(response_cache.stats())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List
+
+from ai.tokens import count_message_tokens
+
+# ---------------------------------------------------------------------------
+# Tutor conversation memory.
+#
+# Histories are lists of OpenAI message dicts, truncated oldest-pair-first to
+# max_messages and max_tokens (counted locally). Sessions idle for longer
+# than TTL are dropped, and the least recently used ones are evicted when
+# the store exceeds MAX_SESSIONS or MAX_TOTAL_TOKENS.
+#
+#     TUTOR_SESSION_BACKEND=memory   per-process (default)
+#     TUTOR_SESSION_BACKEND=sqlite   one file shared by every worker on the host
+# ---------------------------------------------------------------------------
+
+BACKEND = os.getenv('TUTOR_SESSION_BACKEND', 'memory')
+SQLITE_PATH = os.getenv('TUTOR_SESSION_PATH',
+                        os.path.join(os.path.dirname(__file__), 'cache', 'sessions.sqlite3'))
+TTL = float(os.getenv('TUTOR_SESSION_TTL', 7200))
+MAX_SESSIONS = int(os.getenv('TUTOR_SESSION_MAX_SESSIONS', 5000))
+MAX_TOKENS = int(os.getenv('TUTOR_SESSION_MAX_TOKENS', 2000))
+MAX_TOTAL_TOKENS = int(os.getenv('TUTOR_SESSION_MAX_TOTAL_TOKENS', 2_000_000))
+
+
+def truncate(history: List[Dict], max_messages: int, max_tokens: int) -> List[Dict]:
+    """Drop the oldest user/assistant pairs until both limits hold. A
+    leading system message (the rolling summary) is always kept."""
+    head = history[:1] if history and history[0]['role'] == 'system' else []
+    turns = history[len(head):]
+    start = max(0, len(turns) - max_messages)
+    start += start % 2  # never split a pair
+    while start < len(turns) and count_message_tokens(head + turns[start:]) > max_tokens:
+        start += 2
+    return head + turns[start:]
+
+
+class MemorySessionStore:
+    """Per-process LRU of session histories."""
+
+    backend = 'memory'
+
+    def __init__(self, max_messages: int = 20, max_tokens: int = MAX_TOKENS, ttl: float = TTL,
+                 max_sessions: int = MAX_SESSIONS, max_total_tokens: int = MAX_TOTAL_TOKENS):
+        self.max_messages = max_messages
+        self.max_tokens = max_tokens
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.max_total_tokens = max_total_tokens
+        # session_id -> (history, tokens, last_used)
+        self._sessions: "OrderedDict[str, tuple]" = OrderedDict()
+        self._tokens = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, session_id: str) -> List[Dict]:
+        with self._lock:
+            return self._get(session_id)
+
+    def save(self, session_id: str, history: List[Dict]) -> None:
+        with self._lock:
+            self._save(session_id, history)
+
+    def update(self, session_id: str, fn: Callable[[List[Dict]], List[Dict]]) -> List[Dict]:
+        """Atomically replace the history with fn(history) and return what
+        was stored. fn runs under the store lock, so it must be quick."""
+        with self._lock:
+            return list(self._save(session_id, fn(self._get(session_id))))
+
+    def append(self, session_id: str, *messages: Dict) -> List[Dict]:
+        return self.update(session_id, lambda history: history + list(messages))
+
+    def _get(self, session_id):
+        # Callers hold self._lock
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return []
+        if time.time() - entry[2] > self.ttl:
+            self._drop(session_id)
+            self.expirations += 1
+            return []
+        self._sessions.move_to_end(session_id)
+        return list(entry[0])
+
+    def _save(self, session_id, history):
+        # Callers hold self._lock
+        history = truncate(history, self.max_messages, self.max_tokens)
+        tokens = count_message_tokens(history) if history else 0
+        self._drop(session_id)
+        self._sessions[session_id] = (history, tokens, time.time())
+        self._tokens += tokens
+        while len(self._sessions) > 1 and (len(self._sessions) > self.max_sessions
+                                           or self._tokens > self.max_total_tokens):
+            self._drop(next(iter(self._sessions)))
+            self.evictions += 1
+        return history
+
+    def clear(self, session_id: str) -> None:
+        with self._lock:
+            self._drop(session_id)
+
+    def _drop(self, session_id):
+        # Callers hold self._lock
+        entry = self._sessions.pop(session_id, None)
+        if entry is not None:
+            self._tokens -= entry[1]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "backend": self.backend,
+                "sessions": len(self._sessions),
+                "tokens": self._tokens,
+                "max_sessions": self.max_sessions,
+                "max_total_tokens": self.max_total_tokens,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class SQLiteSessionStore:
+    """Session histories in a WAL-mode SQLite file so every worker process
+    on the host sees the same conversation."""
+
+    backend = 'sqlite'
+
+    def __init__(self, path: str = SQLITE_PATH, max_messages: int = 20, max_tokens: int = MAX_TOKENS,
+                 ttl: float = TTL, max_sessions: int = MAX_SESSIONS, max_total_tokens: int = MAX_TOTAL_TOKENS):
+        self.path = path
+        self.max_messages = max_messages
+        self.max_tokens = max_tokens
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.max_total_tokens = max_total_tokens
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._db() as db:
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS tutor_sessions (
+                    session_id TEXT PRIMARY KEY,
+                    history TEXT NOT NULL,
+                    tokens INTEGER NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            db.execute("CREATE INDEX IF NOT EXISTS idx_tutor_sessions_updated ON tutor_sessions (updated_at)")
+
+    def _db(self):
+        # One connection per thread; sqlite3 connections are not thread-safe
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, session_id: str) -> List[Dict]:
+        db = self._db()
+        row = db.execute("SELECT history FROM tutor_sessions WHERE session_id = ? AND updated_at >= ?",
+                         (session_id, time.time() - self.ttl)).fetchone()
+        if row is None:
+            return []
+        # Touch for LRU ordering
+        with db:
+            db.execute("UPDATE tutor_sessions SET updated_at = ? WHERE session_id = ?", (time.time(), session_id))
+        return json.loads(row[0])
+
+    def save(self, session_id: str, history: List[Dict]) -> None:
+        history = truncate(history, self.max_messages, self.max_tokens)
+        tokens = count_message_tokens(history) if history else 0
+        now = time.time()
+        with self._db() as db:
+            db.execute("INSERT OR REPLACE INTO tutor_sessions (session_id, history, tokens, updated_at) "
+                       "VALUES (?, ?, ?, ?)",
+                       (session_id, json.dumps(history, separators=(',', ':')), tokens, now))
+            self._evict(db, now)
+
+    def update(self, session_id: str, fn: Callable[[List[Dict]], List[Dict]]) -> List[Dict]:
+        """Atomically replace the history with fn(history) and return what
+        was stored. fn runs inside the write transaction, so it must be quick."""
+        db = self._db()
+        # BEGIN IMMEDIATE serialises read-modify-write across workers
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            row = db.execute("SELECT history FROM tutor_sessions WHERE session_id = ? AND updated_at >= ?",
+                             (session_id, time.time() - self.ttl)).fetchone()
+            history = fn(json.loads(row[0]) if row else [])
+            history = truncate(history, self.max_messages, self.max_tokens)
+            now = time.time()
+            db.execute("INSERT OR REPLACE INTO tutor_sessions (session_id, history, tokens, updated_at) "
+                       "VALUES (?, ?, ?, ?)",
+                       (session_id, json.dumps(history, separators=(',', ':')),
+                        count_message_tokens(history), now))
+            self._evict(db, now)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return history
+
+    def append(self, session_id: str, *messages: Dict) -> List[Dict]:
+        return self.update(session_id, lambda history: history + list(messages))
+
+    def _evict(self, db, now):
+        db.execute("DELETE FROM tutor_sessions WHERE updated_at < ?", (now - self.ttl,))
+        count, tokens = db.execute("SELECT COUNT(*), COALESCE(SUM(tokens), 0) FROM tutor_sessions").fetchone()
+        if count <= self.max_sessions and tokens <= self.max_total_tokens:
+            return
+        # Oldest first until both caps hold (the newest session always stays)
+        excess_tokens = tokens - self.max_total_tokens
+        doomed = []
+        for session_id, session_tokens in db.execute(
+                "SELECT session_id, tokens FROM tutor_sessions ORDER BY updated_at LIMIT ?", (count - 1,)):
+            if count <= self.max_sessions and excess_tokens <= 0:
+                break
+            doomed.append((session_id,))
+            count -= 1
+            excess_tokens -= session_tokens
+        db.executemany("DELETE FROM tutor_sessions WHERE session_id = ?", doomed)
+
+    def clear(self, session_id: str) -> None:
+        with self._db() as db:
+            db.execute("DELETE FROM tutor_sessions WHERE session_id = ?", (session_id,))
+
+    def stats(self) -> Dict:
+        count, tokens = self._db().execute(
+            "SELECT COUNT(*), COALESCE(SUM(tokens), 0) FROM tutor_sessions WHERE updated_at >= ?",
+            (time.time() - self.ttl,)).fetchone()
+        return {
+            "backend": self.backend,
+            "path": self.path,
+            "sessions": count,
+            "tokens": tokens,
+            "max_sessions": self.max_sessions,
+            "max_total_tokens": self.max_total_tokens,
+        }
+
+
+def session_store_from_env(max_messages: int = 20):
+    if BACKEND == 'sqlite':
+        return SQLiteSessionStore(max_messages=max_messages)
+    if BACKEND != 'memory':
+        print(f"Unknown TUTOR_SESSION_BACKEND '{BACKEND}', using memory")
+    return MemorySessionStore(max_messages=max_messages)
@@ -0,0 +1,44 @@
+import re
+from functools import lru_cache
+from typing import Dict, List
+
+# ---------------------------------------------------------------------------
+# Local token counting for chat prompts.
+#
+# Uses tiktoken when it is installed; otherwise a word/punctuation estimate
+# that tracks the BPE count of ordinary English and Zambian-language text
+# closely enough for budgeting (long words are split every ~4 characters).
+# ---------------------------------------------------------------------------
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+ENCODING = 'cl100k_base'
+# Per-message framing (role, separators) and reply priming, as counted by
+# the chat completions API
+MESSAGE_OVERHEAD = 4
+REPLY_PRIMING = 3
+
+_PIECES = re.compile(r"\w+|[^\w\s]")
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    return tiktoken.get_encoding(ENCODING) if TIKTOKEN_AVAILABLE else None
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return sum((len(piece) + 3) // 4 for piece in _PIECES.findall(text))
+
+
+def count_message_tokens(messages: List[Dict]) -> int:
+    """Prompt tokens for a chat completions messages list."""
+    return sum(MESSAGE_OVERHEAD + count_tokens(m.get('content') or '') for m in messages) + REPLY_PRIMING
@@ -0,0 +1,327 @@
+import os
+import sys
+import json
+import math
+import time
+import uuid
+import argparse
+import threading
+import subprocess
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score, log_loss, mean_absolute_error, r2_score, roc_auc_score
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+from ai.model_registry import model_registry
+
+# ---------------------------------------------------------------------------
+# Out-of-core training for the adaptive models.
+#
+# progress ⋈ experiments is streamed with pd.read_sql(chunksize=...):
+#   * recommender: RandomForestRegressor(warm_start=True) grows a few trees
+#     per chunk, each fitted on that chunk only, across all cores (n_jobs)
+#   * risk model:  StandardScaler + SGDClassifier(log_loss), partial_fit
+# Every HOLDOUT_EVERY-th progress row (by id) is held out for validation.
+# Jobs run in a separate process so the HTTP worker is never blocked.
+#
+#     python -m ai.training            # train and publish from the command line
+# ---------------------------------------------------------------------------
+
+CHUNK_SIZE = int(os.getenv('AI_TRAIN_CHUNK_SIZE', 50000))
+TARGET_TREES = int(os.getenv('AI_TRAIN_TREES', 100))
+N_JOBS = int(os.getenv('AI_TRAIN_N_JOBS', -1))
+HOLDOUT_EVERY = int(os.getenv('AI_TRAIN_HOLDOUT_EVERY', 5))
+MAX_HOLDOUT_ROWS = int(os.getenv('AI_TRAIN_MAX_HOLDOUT_ROWS', 50000))
+MIN_ROWS = 5
+# Below this many rows a holdout split is too small to mean anything
+MIN_ROWS_FOR_HOLDOUT = 50
+
+FEATURES = ['subject_enc', 'completed_steps', 'time_spent']
+QUERY = """
+    SELECT p.id, p.score, p.completed_steps, p.time_spent, e.subject
+    FROM progress p
+    JOIN experiments e ON p.experiment_id = e.id
+    ORDER BY p.id
+"""
+
+
+def _count_rows(conn) -> int:
+    cursor = conn.cursor()
+    cursor.execute("SELECT COUNT(*) FROM progress p JOIN experiments e ON p.experiment_id = e.id")
+    (count,) = cursor.fetchone()
+    cursor.close()
+    return int(count)
+
+
+def _subjects(conn):
+    cursor = conn.cursor()
+    cursor.execute("SELECT DISTINCT subject FROM experiments")
+    subjects = [row[0] for row in cursor.fetchall()]
+    cursor.close()
+    return subjects
+
+
+def _prepare(chunk: pd.DataFrame, le_subject: LabelEncoder):
+    chunk = chunk.dropna(subset=['score', 'subject'])
+    X = pd.DataFrame({
+        'subject_enc': le_subject.transform(chunk['subject']),
+        'completed_steps': chunk['completed_steps'].fillna(0).astype(float).to_numpy(),
+        'time_spent': chunk['time_spent'].fillna(0).astype(float).to_numpy(),
+    }, columns=FEATURES)
+    y = chunk['score'].astype(float).to_numpy()
+    return X, y, chunk['id'].to_numpy()
+
+
+def _validate(recommender, risk_model, X, y, in_sample) -> Dict:
+    if len(X) == 0:
+        return {}
+    y_risk = (y < 50).astype(int)
+    proba = risk_model.predict_proba(X)[:, 1]
+    metrics = {
+        "rows": int(len(X)),
+        "in_sample": in_sample,
+        "recommender_mae": round(float(mean_absolute_error(y, recommender.predict(X))), 3),
+        "recommender_r2": round(float(r2_score(y, recommender.predict(X))), 3) if len(X) > 1 else None,
+        "risk_accuracy": round(float(accuracy_score(y_risk, proba > 0.5)), 3),
+        "risk_log_loss": round(float(log_loss(y_risk, proba, labels=[0, 1])), 3),
+    }
+    if len(np.unique(y_risk)) == 2:
+        metrics["risk_roc_auc"] = round(float(roc_auc_score(y_risk, proba)), 3)
+    return metrics
+
+
+def train_incremental(conn, chunk_size: int = CHUNK_SIZE, progress: Optional[Callable[[Dict], None]] = None,
+                      registry=model_registry) -> Dict:
+    """Stream training data from conn, fit both models and publish them.
+
+    Returns a run report (version, timings, data size, validation metrics).
+    """
+    started = time.perf_counter()
+    report = progress or (lambda update: None)
+
+    total = _count_rows(conn)
+    if total < MIN_ROWS:
+        raise ValueError(f"Insufficient data for ML training ({total} rows)")
+
+    # Never more chunks than trees, so every chunk contributes at least one
+    chunk_size = max(chunk_size, math.ceil(total / TARGET_TREES))
+    n_chunks = math.ceil(total / chunk_size)
+    trees_per_chunk = math.ceil(TARGET_TREES / n_chunks)
+    use_holdout = total >= MIN_ROWS_FOR_HOLDOUT
+
+    le_subject = LabelEncoder().fit(_subjects(conn))
+    recommender = RandomForestRegressor(n_estimators=0, warm_start=True, n_jobs=N_JOBS, random_state=42)
+    scaler = StandardScaler()
+    classifier = SGDClassifier(loss='log_loss', random_state=42)
+
+    holdout_X, holdout_y = [], []
+    holdout_rows = train_rows = 0
+    report({"stage": "training", "chunks_total": n_chunks, "chunks_done": 0, "rows_total": total})
+
+    for i, chunk in enumerate(pd.read_sql(QUERY, conn, chunksize=chunk_size)):
+        X, y, ids = _prepare(chunk, le_subject)
+        if use_holdout:
+            held = ids % HOLDOUT_EVERY == 0
+            if holdout_rows < MAX_HOLDOUT_ROWS:
+                holdout_X.append(X[held])
+                holdout_y.append(y[held])
+                holdout_rows += int(held.sum())
+            X, y = X[~held], y[~held]
+
+        if len(X):
+            recommender.n_estimators += trees_per_chunk
+            recommender.fit(X, y)
+
+            X_scaled = scaler.partial_fit(X).transform(X)
+            classifier.partial_fit(X_scaled, (y < 50).astype(int), classes=[0, 1])
+            train_rows += len(X)
+
+        report({"stage": "training", "chunks_total": n_chunks, "chunks_done": i + 1,
+                "rows_total": total, "rows_trained": train_rows})
+
+    if train_rows == 0:
+        raise ValueError("No usable training rows")
+
+    risk_model = Pipeline([('scale', scaler), ('clf', classifier)])
+    report({"stage": "validating"})
+    if use_holdout and holdout_rows:
+        metrics = _validate(recommender, risk_model, pd.concat(holdout_X), np.concatenate(holdout_y), False)
+    else:
+        # Tiny datasets: report in-sample fit rather than nothing
+        sample = pd.read_sql(QUERY, conn)
+        X, y, _ = _prepare(sample, le_subject)
+        metrics = _validate(recommender, risk_model, X, y, True)
+
+    duration = round(time.perf_counter() - started, 2)
+    bundle = registry.publish(recommender, risk_model, le_subject, {
+        "rows": total,
+        "train_rows": train_rows,
+        "holdout_rows": holdout_rows,
+        "chunks": n_chunks,
+        "chunk_size": chunk_size,
+        "n_estimators": recommender.n_estimators,
+        "subjects": [str(s) for s in le_subject.classes_],
+        "training_seconds": duration,
+        "metrics": metrics,
+    })
+    print(f"Adaptive models trained: version {bundle.version}, {train_rows} rows in {duration}s")
+    return bundle.metadata
+
+
+# ---------------------------------------------------------------------------
+# Background jobs
+#
+# Each job is a separate `python -m ai.training` process (no fork of the
+# multithreaded server, and the same on Windows). The child reports on
+# stdout with EVENT_PREFIX lines carrying JSON; anything else it prints is
+# passed through to the server log.
+# ---------------------------------------------------------------------------
+EVENT_PREFIX = "TRAINING_EVENT "
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _emit(kind, data):
+    print(EVENT_PREFIX + json.dumps({"kind": kind, "data": data}, default=str), flush=True)
+
+
+class TrainingJobs:
+    """Runs one training job at a time in a worker process and tracks its
+    progress for the status endpoint."""
+
+    def __init__(self, history: int = 20, python_exe: str = None):
+        self.python_exe = python_exe or sys.executable
+        self._jobs: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._active: Optional[str] = None
+        self.history = history
+
+    def start(self, chunk_size: int = CHUNK_SIZE) -> Optional[Dict]:
+        """Launch a job; None when one is already running."""
+        with self._lock:
+            if self._active is not None:
+                return None
+            job_id = uuid.uuid4().hex[:12]
+            job = {"job_id": job_id, "state": "running", "created_at": datetime.now().isoformat(),
+                   "finished_at": None, "progress": {}, "result": None, "error": None}
+            self._jobs[job_id] = job
+            self._active = job_id
+            self._trim()
+
+        try:
+            process = subprocess.Popen(
+                [self.python_exe, '-m', 'ai.training', '--chunk-size', str(int(chunk_size)), '--events'],
+                cwd=BACKEND_DIR,
+                env=dict(os.environ, PYTHONUNBUFFERED='1'),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                stdin=subprocess.DEVNULL,
+                text=True,
+                bufsize=1,
+            )
+        except OSError as e:
+            self._finish(job_id, "failed", f"could not start training process: {e}")
+            return self.status(job_id)
+        with self._lock:
+            job["pid"] = process.pid
+        threading.Thread(target=self._follow, args=(job_id, process), daemon=True,
+                         name=f"training-{job_id}").start()
+        return self.status(job_id)
+
+    def _follow(self, job_id, process):
+        state, payload = "failed", "training process exited unexpectedly"
+        for line in process.stdout:
+            line = line.rstrip('\n')
+            if not line.startswith(EVENT_PREFIX):
+                print(f"[training {job_id}] {line}")
+                continue
+            try:
+                event = json.loads(line[len(EVENT_PREFIX):])
+            except ValueError:
+                continue
+            if event["kind"] == "progress":
+                with self._lock:
+                    self._jobs[job_id]["progress"] = event["data"]
+            else:
+                state, payload = event["kind"], event["data"]
+        code = process.wait()
+        if state == "failed" and payload == "training process exited unexpectedly":
+            payload = f"training process exited with code {code}"
+        self._finish(job_id, state, payload)
+
+    def _finish(self, job_id, state, payload):
+        with self._lock:
+            job = self._jobs[job_id]
+            job["state"] = state
+            job["finished_at"] = datetime.now().isoformat()
+            if state == "succeeded":
+                job["result"] = payload
+            else:
+                job["error"] = payload
+            self._active = None
+        if state == "succeeded":
+            # The child repointed CURRENT; swap this process over right away
+            model_registry.refresh()
+
+    def _trim(self):
+        while len(self._jobs) > self.history:
+            oldest = next(iter(self._jobs))
+            if oldest == self._active:
+                break
+            del self._jobs[oldest]
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def active(self) -> Optional[Dict]:
+        with self._lock:
+            return dict(self._jobs[self._active]) if self._active else None
+
+
+_training_jobs: Optional[TrainingJobs] = None
+_training_jobs_lock = threading.Lock()
+
+
+def training_jobs() -> TrainingJobs:
+    """The process-wide job runner, created on first use."""
+    global _training_jobs
+    with _training_jobs_lock:
+        if _training_jobs is None:
+            _training_jobs = TrainingJobs()
+        return _training_jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Train the adaptive models from the progress table')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Rows streamed per chunk')
+    parser.add_argument('--events', action='store_true', help='Report progress as TRAINING_EVENT lines')
+    args = parser.parse_args()
+
+    progress = (lambda update: _emit("progress", update)) if args.events else None
+    from db.pool import mysql_connect
+    conn = None
+    try:
+        conn = mysql_connect()
+        result = train_incremental(conn, args.chunk_size, progress=progress)
+    except Exception as e:
+        if not args.events:
+            raise
+        _emit("failed", str(e))
+        return 1
+    finally:
+        if conn is not None:
+            conn.close()
+    if args.events:
+        _emit("succeeded", result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,18 @@
-import openai
-import os
-from typing import Dict, List
-
-# ---------------------------------------------------------------------------
-# Session-based conversation memory (REC-02)
-# Key: session_id (str)  Value: list of OpenAI message dicts (max 10 pairs)
-# ---------------------------------------------------------------------------
-_session_memory: Dict[str, List[Dict]] = {}
+import json
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from ai.history import (SUMMARY_INSTRUCTIONS, SUMMARY_MAX_TOKENS, fold, needs_compaction, new_summary,
+                        split_for_compaction, transcript, user_message)
+from ai.llm_client import LLMBusy, llm_client
+from ai.offline_index import build_tutor_index
+from ai.response_cache import response_cache, scope_key
+from ai.session_store import session_store_from_env
+from ai.tokens import count_message_tokens
 
 SYSTEM_PROMPT = (
     "You are 'Sayansi Yathu', an intelligent virtual science tutor for Zambian "
@@ -19,70 +25,231 @@ SYSTEM_PROMPT = (
 
 MAX_HISTORY = 10  # maximum number of user+assistant message pairs to retain
 
+# ---------------------------------------------------------------------------
+# Offline mode (no API key, API errors, saturation): canned answers plus
+# concepts.json and context.json in one BM25 index (see ai/offline_index.py)
+# ---------------------------------------------------------------------------
+OFFLINE_RESPONSES = {
+    'physics': {
+        'pendulum':   "The period of a pendulum depends on its length and gravity. Use T = 2π√(L/g). Try changing the length in the simulation!",
+        'circuit':    "Ohm's Law states V = IR. If you increase resistance while keeping voltage constant, current decreases.",
+        'free fall':  "In free fall, an object falls under gravity alone. Distance: h = ½gt². All objects fall at the same rate (g ≈ 9.81 m/s²)!",
+        'gravity':    "Gravity pulls objects toward each other. On Earth g ≈ 9.81 m/s².",
+        'force':      "Newton's Second Law: F = ma. Force equals mass times acceleration.",
+    },
+    'chemistry': {
+        'titration':  "In a titration, the equivalence point is where acid equals base. The indicator changes colour to signal this.",
+        'reaction':   "Reaction rates depend on temperature, concentration, and surface area.",
+        'acid':       "Acids have pH < 7. They turn blue litmus red and react with bases to form salt + water.",
+        'base':       "Bases have pH > 7. They turn red litmus blue and feel slippery.",
+    },
+    'biology': {
+        'cell':       "Cells are the building blocks of life. The nucleus controls the cell; mitochondria produce energy.",
+        'dna':        "DNA carries genetic instructions. During replication the helix unwinds and new strands are built.",
+        'osmosis':    "Osmosis is the movement of water from high to low concentration through a semi-permeable membrane.",
+    },
+}
+
+offline_index = build_tutor_index(OFFLINE_RESPONSES)
+# An answer needs a real BM25 score and must match most of the question's
+# words ("speed of light" shares only "light" with the circuit context)
+OFFLINE_MIN_SCORE = 2.5
+OFFLINE_MIN_COVERAGE = 0.6
+
+# ---------------------------------------------------------------------------
+# Session-based conversation memory (REC-02)
+# Key: session_id (str)  Value: list of OpenAI message dicts (max 10 pairs).
+# Bounded by token count, idle TTL and LRU eviction; TUTOR_SESSION_BACKEND=sqlite
+# shares it between workers (see ai/session_store.py).
+# ---------------------------------------------------------------------------
+_session_memory = session_store_from_env(max_messages=MAX_HISTORY * 2)
+
 
 class AITutor:
-    def __init__(self):
-        self.api_key = os.getenv('OPENAI_API_KEY')
+    def __init__(self, client=llm_client, cache=response_cache, sessions=None):
+        self.client = client
+        self.cache = cache
+        self.sessions = sessions if sessions is not None else _session_memory
+        # Prompt tokens of recent OpenAI calls, for capacity planning
+        self._prompt_tokens = deque(maxlen=1000)
+        self._usage_lock = threading.Lock()
+        self.compactions = 0
+        # Summaries are written off the request path, one session at a time
+        self._compactor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='tutor-compact')
+        self._compacting = set()
 
     # ------------------------------------------------------------------
     # Public: get a tutoring response (with optional session memory)
     # ------------------------------------------------------------------
     def get_response(self, question: str, context: Dict,
-                     session_id: str = None) -> str:
-        """Return a tutoring response, maintaining per-session chat history."""
+                     session_id: str = None, usage: Dict = None) -> str:
+        """Return a tutoring response, maintaining per-session chat history.
 
-        subject = context.get('subject', 'general')
-        level   = context.get('level', 'secondary')
+        When given, usage is filled with the prompt token count and where
+        the answer came from (openai, cache or offline).
+        """
 
-        if self.api_key:
+        subject = context.get('subject', 'general')
+        messages = self._build_messages(question, context, session_id)
+        scope = self._cache_scope(context, messages)
+        cached = self._cache_get(scope, question)
+        if cached is not None:
+            self._report(usage, messages, 'cache')
+            self._remember(session_id, messages, cached)
+            return cached
+
+        if self.client.available:
             try:
-                client = openai.OpenAI(api_key=self.api_key)
-
-                # ---- Build the messages list for this API call ----
-                # Start with the system prompt (always present)
-                messages = [{"role": "system", "content": SYSTEM_PROMPT}]
-
-                # Append rolling history so GPT can follow up
-                if session_id:
-                    messages += _session_memory.get(session_id, [])
-
-                # Add the current user question with subject context
-                user_content = (
-                    f"[Subject: {subject} | Level: {level}]\n{question}"
-                )
-                messages.append({"role": "user", "content": user_content})
-
-                response = client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=messages,
-                    max_tokens=300,
-                    temperature=0.7
-                )
+                ai_text = self.client.chat(messages, max_tokens=300, temperature=0.7)
+                self._report(usage, messages, 'openai')
+                self._remember(session_id, messages, ai_text)
+                self._cache_put(scope, question, ai_text)
+                return ai_text
 
-                ai_text = response.choices[0].message.content.strip()
+            except LLMBusy as e:
+                print(f"OpenAI busy (answering offline): {e}")
+            except Exception as e:
+                print(f"OpenAI API Error (falling back to offline mode): {e}")
 
-                # ---- Persist this exchange to session memory ----
-                if session_id:
-                    history = _session_memory.setdefault(session_id, [])
-                    history.append({"role": "user",      "content": user_content})
-                    history.append({"role": "assistant",  "content": ai_text})
-                    # Keep only the last MAX_HISTORY pairs (2 messages per pair)
-                    if len(history) > MAX_HISTORY * 2:
-                        _session_memory[session_id] = history[-(MAX_HISTORY * 2):]
+        # ---- OFFLINE / FALLBACK (no API key, API error or saturated) ----
+        self._report(usage, messages, 'offline')
+        return self._offline_response(question, subject)
 
-                return ai_text
+    def stream_response(self, question: str, context: Dict,
+                        session_id: str = None, usage: Dict = None) -> Iterator[str]:
+        """Yield the response piece by piece as the model produces it.
 
+        Same fallback and usage rules as get_response; the exchange is
+        written to session memory only once the whole answer has arrived.
+        """
+        subject = context.get('subject', 'general')
+        messages = self._build_messages(question, context, session_id)
+        scope = self._cache_scope(context, messages)
+        cached = self._cache_get(scope, question)
+        if cached is not None:
+            self._report(usage, messages, 'cache')
+            self._remember(session_id, messages, cached)
+            yield cached
+            return
+
+        if self.client.available:
+            parts = []
+            try:
+                for text in self.client.stream(messages, max_tokens=300, temperature=0.7):
+                    if not parts:
+                        self._report(usage, messages, 'openai')
+                    parts.append(text)
+                    yield text
+                ai_text = ''.join(parts).strip()
+                self._remember(session_id, messages, ai_text)
+                self._cache_put(scope, question, ai_text)
+                return
+
+            except LLMBusy as e:
+                print(f"OpenAI busy (answering offline): {e}")
             except Exception as e:
                 print(f"OpenAI API Error (falling back to offline mode): {e}")
+                if parts:
+                    # Part of the answer is already on the wire
+                    return
 
-        # ---- OFFLINE / FALLBACK (no API key or API error) ----
-        return self._offline_response(question, subject)
+        self._report(usage, messages, 'offline')
+        yield self._offline_response(question, subject)
+
+    def _build_messages(self, question: str, context: Dict, session_id: str = None) -> List[Dict]:
+        """System prompt, the session's (compacted) history, then the question."""
+        subject = context.get('subject', 'general')
+        level   = context.get('level', 'secondary')
+        history = self.sessions.get(session_id) if session_id else []
+
+        # The subject/level prefix is only repeated when it changes
+        user_content = user_message(question, subject, level, history)
+        return ([{"role": "system", "content": SYSTEM_PROMPT}] + history +
+                [{"role": "user", "content": user_content}])
+
+    def _remember(self, session_id: str, messages: List[Dict], ai_text: str) -> Optional[Future]:
+        """Persist this exchange to session memory. Once the history is over
+        budget, folding older turns into the rolling summary is handed to a
+        background thread (returned) so the answer is not held up by the
+        summarisation call."""
+        if not session_id:
+            return None
+        exchange = [messages[-1], {"role": "assistant", "content": ai_text}]
+        # The store keeps only the last MAX_HISTORY pairs within its token budget
+        history = self.sessions.append(session_id, *exchange)
+        if not needs_compaction(history):
+            return None
+        with self._usage_lock:
+            if session_id in self._compacting:
+                return None
+            self._compacting.add(session_id)
+        return self._compactor.submit(self._compact, session_id)
+
+    def _compact(self, session_id: str) -> None:
+        try:
+            history = self.sessions.get(session_id)
+            if not needs_compaction(history):
+                return
+            # Summarise outside the store's lock (it may call the model), then
+            # swap the summary in atomically, keeping turns appended meanwhile
+            summary, old, _ = split_for_compaction(history)
+            text = new_summary(summary, old, self._summarize)
+            self.sessions.update(session_id, lambda current: fold(current, summary, old, text))
+            with self._usage_lock:
+                self.compactions += 1
+        except Exception as e:
+            print(f"Tutor history compaction failed for {session_id}: {e}")
+        finally:
+            with self._usage_lock:
+                self._compacting.discard(session_id)
+
+    def _summarize(self, summary, turns: List[Dict]) -> str:
+        if not self.client.available:
+            raise RuntimeError("no language model for summarisation")
+        content = (f"Earlier summary: {summary}\n\n" if summary else '') + transcript(turns)
+        return self.client.chat([{"role": "system", "content": SUMMARY_INSTRUCTIONS},
+                                 {"role": "user", "content": content}],
+                                max_tokens=SUMMARY_MAX_TOKENS, temperature=0.3)
+
+    def _report(self, usage, messages: List[Dict], source: str) -> None:
+        prompt_tokens = count_message_tokens(messages)
+        if source == 'openai':
+            with self._usage_lock:
+                self._prompt_tokens.append(prompt_tokens)
+        if usage is not None:
+            usage.update(prompt_tokens=prompt_tokens, history_messages=len(messages) - 2, source=source)
+
+    def stats(self) -> Dict:
+        with self._usage_lock:
+            tokens = np.array(self._prompt_tokens)
+            compactions = self.compactions
+        prompts = {"calls": int(len(tokens)), "compactions": compactions}
+        if len(tokens):
+            prompts.update(mean=round(float(tokens.mean()), 1), p50=float(np.percentile(tokens, 50)),
+                           p95=float(np.percentile(tokens, 95)), max=int(tokens.max()))
+        return {"sessions": self.sessions.stats(), "prompt_tokens": prompts}
+
+    def _cache_scope(self, context: Dict, messages: List[Dict]):
+        """Cache scope for this question, or None when it must not be
+        cached: follow-ups depend on the conversation, only opening
+        questions (system prompt + question) are shareable, and only by
+        exact (normalised) wording."""
+        if self.cache is None or len(messages) != 2:
+            return None
+        return scope_key(context.get('subject', 'general'), context.get('level', 'secondary'))
+
+    def _cache_get(self, scope, question: str):
+        return self.cache.get('tutor', scope, question) if scope else None
+
+    def _cache_put(self, scope, question: str, answer: str) -> None:
+        if scope and answer:
+            self.cache.put('tutor', scope, question, answer)
 
     # ------------------------------------------------------------------
     # Clear session memory (e.g. on logout or new experiment)
     # ------------------------------------------------------------------
     def clear_session(self, session_id: str) -> None:
-        _session_memory.pop(session_id, None)
+        self.sessions.clear(session_id)
 
     # ------------------------------------------------------------------
     # Analyse student progress (unchanged logic, kept for compatibility)
@@ -105,49 +272,71 @@ class AITutor:
     # Internal: keyword-based offline fallback
     # ------------------------------------------------------------------
     def _offline_response(self, question: str, subject: str) -> str:
-        responses = {
-            'physics': {
-                'pendulum':   "The period of a pendulum depends on its length and gravity. Use T = 2π√(L/g). Try changing the length in the simulation!",
-                'circuit':    "Ohm's Law states V = IR. If you increase resistance while keeping voltage constant, current decreases.",
-                'free fall':  "In free fall, an object falls under gravity alone. Distance: h = ½gt². All objects fall at the same rate (g ≈ 9.81 m/s²)!",
-                'gravity':    "Gravity pulls objects toward each other. On Earth g ≈ 9.81 m/s².",
-                'force':      "Newton's Second Law: F = ma. Force equals mass times acceleration.",
-            },
-            'chemistry': {
-                'titration':  "In a titration, the equivalence point is where acid equals base. The indicator changes colour to signal this.",
-                'reaction':   "Reaction rates depend on temperature, concentration, and surface area.",
-                'acid':       "Acids have pH < 7. They turn blue litmus red and react with bases to form salt + water.",
-                'base':       "Bases have pH > 7. They turn red litmus blue and feel slippery.",
-            },
-            'biology': {
-                'cell':       "Cells are the building blocks of life. The nucleus controls the cell; mitochondria produce energy.",
-                'dna':        "DNA carries genetic instructions. During replication the helix unwinds and new strands are built.",
-                'osmosis':    "Osmosis is the movement of water from high to low concentration through a semi-permeable membrane.",
-            },
-        }
-
-        q = question.lower()
-        for key, answer in responses.get(subject, {}).items():
-            if key in q:
-                return answer
-        for sub in responses:
-            for key, answer in responses[sub].items():
-                if key in q:
-                    return answer
-
-        return (
-            "I am currently in offline mode. Ask about specific topics like "
-            "'pendulum', 'titration', 'cell', or any ECZ science topic."
-        )
+        """Best BM25 match over the canned answers, concepts.json and
+        context.json (typo tolerant), plus related topics to try next."""
+        results = offline_index.search(question, k=3, subject=subject, min_score=OFFLINE_MIN_SCORE,
+                                       min_coverage=OFFLINE_MIN_COVERAGE)
+        if not results:
+            return (
+                "I am currently in offline mode. Ask about specific topics like "
+                "'pendulum', 'titration', 'cell', or any ECZ science topic."
+            )
+
+        answer = results[0][0]['answer']
+        related = [doc['title'] for doc, _ in results[1:] if doc['title'] != results[0][0]['title']]
+        if related:
+            answer += f"\n\nRelated topics: {', '.join(related)}."
+        return answer
 
 class ECZContentGenerator:
-    def __init__(self):
-        self.api_key = os.getenv('OPENAI_API_KEY')
-        self.client = openai.OpenAI(api_key=self.api_key) if self.api_key else None
+    def __init__(self, client=llm_client, cache=response_cache):
+        self.client = client if client.available else None
+        # Generated content is shared by every teacher asking for the same thing
+        self.cache = cache
 
     def generate(self, content_type: str, topic: str, grade: str) -> str:
         """Generate ECZ-aligned educational content"""
-        
+        cached = self._cached('content', scope_key(content_type, grade), topic)
+        if cached is not None:
+            return cached
+
+        if self.client:
+            try:
+                content = self.client.chat(self._content_messages(content_type, topic, grade),
+                                           max_tokens=800, temperature=0.7)
+                self._store('content', scope_key(content_type, grade), topic, content)
+                return content
+            except Exception as e:
+                return self._error_content(e)
+
+        # Fallback for demo without API key
+        return self._demo_content(content_type, topic, grade)
+
+    def generate_stream(self, content_type: str, topic: str, grade: str) -> Iterator[str]:
+        """generate(), yielding the content as the model produces it"""
+        cached = self._cached('content', scope_key(content_type, grade), topic)
+        if cached is not None:
+            yield cached
+            return
+
+        if self.client:
+            parts = []
+            try:
+                for text in self.client.stream(self._content_messages(content_type, topic, grade),
+                                               max_tokens=800, temperature=0.7):
+                    parts.append(text)
+                    yield text
+                self._store('content', scope_key(content_type, grade), topic, ''.join(parts).strip())
+                return
+            except Exception as e:
+                print(f"Content streaming error: {e}")
+                if not parts:
+                    yield self._error_content(e)
+                return
+
+        yield self._demo_content(content_type, topic, grade)
+
+    def _content_messages(self, content_type: str, topic: str, grade: str) -> List[Dict]:
         prompts = {
             'exam_questions': f"Generate 5 multiple-choice exam questions about '{topic}' for {grade} level, strictly following the Examinations Council of Zambia (ECZ) format and standards. Include an answer key.",
             'worksheet': f"Create a structured laboratory experiment worksheet for '{topic}' suitable for {grade} students in Zambia. Include Objectives, Materials, Procedure, and Observation questions.",
@@ -156,23 +345,22 @@ class ECZContentGenerator:
         }
 
         prompt = prompts.get(content_type, f"Explain '{topic}' for {grade} level.")
+        return [
+            {"role": "system", "content": "You are 'Sayansi AI', a specialist in the Zambian Science Curriculum (ECZ). Your goal is to help teachers generate high-quality, relevant educational materials."},
+            {"role": "user", "content": prompt}
+        ]
 
-        if self.client:
-            try:
-                response = self.client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": "You are 'Sayansi AI', a specialist in the Zambian Science Curriculum (ECZ). Your goal is to help teachers generate high-quality, relevant educational materials."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=800,
-                    temperature=0.7
-                )
-                return response.choices[0].message.content.strip()
-            except Exception as e:
-                return f"AI Error: {str(e)}\n\n(Fallback: Please ensure your OPENAI_API_KEY is configured.)"
-        
-        # Fallback for demo without API key
+    def _cached(self, kind: str, scope: str, topic: str):
+        return self.cache.get(kind, scope, topic) if self.cache is not None else None
+
+    def _store(self, kind: str, scope: str, topic: str, value) -> None:
+        if self.cache is not None and value:
+            self.cache.put(kind, scope, topic, value)
+
+    def _error_content(self, error: Exception) -> str:
+        return f"AI Error: {str(error)}\n\n(Fallback: Please ensure your OPENAI_API_KEY is configured.)"
+
+    def _demo_content(self, content_type: str, topic: str, grade: str) -> str:
         return f"""--- DEMO CONTENT: {content_type.upper()} ---
 Topic: {topic}
 Grade: {grade}
@@ -183,8 +371,13 @@ Grade: {grade}
 3. Draw a labeled diagram illustrating {topic}.
 
 (To see real AI generation, please provide an OpenAI API key in the environment variables.)"""
+
     def generate_quiz(self, subject: str, topic: str, count: int = 3) -> List[Dict]:
         """Generate structured MCQs for a topic"""
+        cached = self._cached('quiz', scope_key(subject, count), topic)
+        if cached is not None:
+            return cached
+
         prompt = (
             f"Generate {count} multiple-choice questions about '{topic}' in the subject '{subject}' "
             "for Zambian secondary school students. "
@@ -195,21 +388,20 @@ Grade: {grade}
 
         if self.client:
             try:
-                response = self.client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
+                content = self.client.chat(
+                    [
                         {"role": "system", "content": "You are a Zambian Science Curriculum expert. You output only valid JSON."},
                         {"role": "user", "content": prompt}
                     ],
                     response_format={"type": "json_object"},
                     temperature=0.5
                 )
-                import json
-                content = response.choices[0].message.content.strip()
                 data = json.loads(content)
                 if isinstance(data, dict) and "questions" in data:
-                    return data["questions"]
-                return data if isinstance(data, list) else [data]
+                    data = data["questions"]
+                questions = data if isinstance(data, list) else [data]
+                self._store('quiz', scope_key(subject, count), topic, questions)
+                return questions
             except Exception as e:
                 print(f"Quiz Generation Error: {e}")
         
@@ -1,6 +1,26 @@
 from typing import Dict, List, Any
 import datetime
 
+from ai.offline_index import OfflineIndex
+
+COMMAND_KEYWORDS = {
+    "start": "start_experiment",
+    "begin": "start_experiment",
+    "pause": "pause_experiment",
+    "stop": "pause_experiment",
+    "explain": "explain_step",
+    "describe": "explain_step",
+    "hint": "hint",
+    "help": "help",
+    "calculate": "calculate",
+    "progress": "progress",
+    "safety": "safety_check"
+}
+
+# One document per keyword; fuzzy matching catches "calclate", "explian"
+_command_index = OfflineIndex([{"id": keyword, "keywords": keyword, "command": command}
+                               for keyword, command in COMMAND_KEYWORDS.items()])
+
 class VirtualLabAssistant:
     def __init__(self):
         self.conversation_history = {}
@@ -38,25 +58,8 @@ class VirtualLabAssistant:
     
     def extract_command(self, text: str) -> str:
         """Extract command from text"""
-        command_keywords = {
-            "start": "start_experiment",
-            "begin": "start_experiment",
-            "pause": "pause_experiment",
-            "stop": "pause_experiment",
-            "explain": "explain_step",
-            "describe": "explain_step",
-            "hint": "hint",
-            "help": "help",
-            "calculate": "calculate",
-            "progress": "progress",
-            "safety": "safety_check"
-        }
-        
-        for keyword, command in command_keywords.items():
-            if keyword in text:
-                return command
-        
-        return "natural_language"
+        match = _command_index.best(text)
+        return match["command"] if match else "natural_language"
     
     def start_experiment(self, context: Dict) -> Dict[str, Any]:
         experiment = context.get('current_experiment', 'general')
@@ -1,6 +1,18 @@
 import speech_recognition as sr
 import pyttsx3
 
+from ai.offline_index import OfflineIndex
+from ai.tutor import OFFLINE_MIN_COVERAGE, OFFLINE_MIN_SCORE, offline_index
+
+VOICE_COMMANDS = OfflineIndex([
+    {"id": "start", "keywords": "start begin",
+     "answer": "Which experiment would you like to start? Physics, chemistry, or biology?"},
+    {"id": "help", "keywords": "help",
+     "answer": "I'm here to help! You can ask me about any science concept or experiment."},
+    {"id": "explain", "keywords": "explain",
+     "answer": "I'll explain the current experiment step by step."},
+])
+
 class VoiceAssistant:
     def __init__(self):
         self.recognizer = sr.Recognizer()
@@ -28,13 +40,12 @@ class VoiceAssistant:
     
     def process_command(self, command: str) -> str:
         """Process voice commands"""
-        command = command.lower()
-        
-        if "start experiment" in command:
-            return "Which experiment would you like to start? Physics, chemistry, or biology?"
-        elif "help" in command:
-            return "I'm here to help! You can ask me about any science concept or experiment."
-        elif "explain" in command:
-            return "I'll explain the current experiment step by step."
-        else:
-            return "Let me help you with that science question."
\ No newline at end of file
+        match = VOICE_COMMANDS.best(command)
+        if match:
+            return match["answer"]
+
+        # Anything else is treated as a science question, answered offline
+        topic = offline_index.best(command, min_score=OFFLINE_MIN_SCORE, min_coverage=OFFLINE_MIN_COVERAGE)
+        if topic:
+            return topic["answer"]
+        return "Let me help you with that science question."
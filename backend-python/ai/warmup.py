@@ -0,0 +1,120 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+AI_WARMUP = os.getenv('AI_WARMUP', '1').lower() not in ('0', 'false', 'no', 'off')
+# Failed components are retried after this many seconds, doubling up to the max
+RETRY_DELAY = float(os.getenv('AI_WARMUP_RETRY_DELAY', 5))
+RETRY_MAX_DELAY = float(os.getenv('AI_WARMUP_RETRY_MAX_DELAY', 300))
+
+
+class WarmupManager:
+    """Load expensive AI components in a background thread at server start.
+
+    Components run in registration order (later ones may depend on earlier
+    ones). Each records its state (pending -> loading -> ready | failed;
+    lazy when warm-up is disabled) and load duration, so /api/ready can
+    report exactly what is still cold. Failed components are retried in the
+    background with exponential backoff (retry_delay 0 disables this), so a
+    transient failure does not degrade the process for its whole life.
+    """
+
+    def __init__(self, enabled: bool = AI_WARMUP, retry_delay: float = RETRY_DELAY,
+                 retry_max_delay: float = RETRY_MAX_DELAY):
+        self.enabled = enabled
+        self.retry_delay = retry_delay
+        self.retry_max_delay = retry_max_delay
+        self._components: List[Tuple[str, Callable[[], None]]] = []
+        self._status: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._done = threading.Event()
+        self._stop = threading.Event()
+        self.started_at = None
+
+    def register(self, name: str, load: Callable[[], None]):
+        """load() should raise if the component could not be made ready."""
+        self._components.append((name, load))
+        self._status[name] = {"state": "pending", "duration_ms": None, "error": None,
+                              "attempts": 0, "retry_at": None}
+
+    def start(self):
+        if not self.enabled:
+            # Components keep loading on first use, as before
+            for name, _ in self._components:
+                self._set(name, state="lazy")
+            self._done.set()
+            return
+        if self._thread is not None:
+            return
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name='ai-warmup', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        for name, load in self._components:
+            self._load(name, load)
+        print(f"AI warm-up finished: {self.summary()}")
+        self._done.set()
+
+        delay = self.retry_delay
+        while delay > 0:
+            with self._lock:
+                failed = [(n, load) for n, load in self._components if self._status[n]["state"] == "failed"]
+                for name, _ in failed:
+                    self._status[name]["retry_at"] = time.time() + delay
+            if not failed or self._stop.wait(delay):
+                return
+            # Registration order, so a component is retried after what it needs
+            for name, load in failed:
+                self._load(name, load)
+            print(f"AI warm-up retry: {self.summary()}")
+            delay = min(delay * 2, self.retry_max_delay)
+
+    def _load(self, name, load):
+        with self._lock:
+            self._status[name].update(state="loading", retry_at=None)
+            self._status[name]["attempts"] += 1
+        started = time.perf_counter()
+        try:
+            load()
+            self._set(name, state="ready", error=None)
+        except Exception as e:
+            print(f"Warm-up of {name} failed: {e}")
+            self._set(name, state="failed", error=str(e))
+        finally:
+            self._set(name, duration_ms=round((time.perf_counter() - started) * 1000, 1))
+
+    def stop(self):
+        """Stop retrying failed components."""
+        self._stop.set()
+
+    def _set(self, name, **fields):
+        with self._lock:
+            self._status[name].update(fields)
+
+    def is_ready(self, name: str = None) -> bool:
+        """With a name: that component loaded. Without: warm-up has finished."""
+        if name is None:
+            return self._done.is_set()
+        with self._lock:
+            return self._status.get(name, {}).get("state") == "ready"
+
+    def wait(self, timeout: float = None) -> bool:
+        return self._done.wait(timeout)
+
+    def summary(self) -> str:
+        with self._lock:
+            return ', '.join(f"{n}={s['state']}" for n, s in self._status.items())
+
+    def status(self) -> Dict:
+        with self._lock:
+            components = {name: dict(s) for name, s in self._status.items()}
+        return {
+            "enabled": self.enabled,
+            "ready": self.is_ready(),
+            "degraded": any(s["state"] == "failed" for s in components.values()),
+            "started_at": self.started_at,
+            "components": components,
+        }
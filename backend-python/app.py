@@ -1,15 +1,12 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_from_directory, g, Response, stream_with_context
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 import sys
 import os
+import atexit
+import threading
+import itertools
 from dotenv import load_dotenv
-try:
-    import mysql.connector
-    MYSQL_AVAILABLE = True
-except ImportError:
-    MYSQL_AVAILABLE = False
-    print("WARNING: mysql-connector-python not installed. Analytics will be unavailable.")
 
 # Load environment variables
 load_dotenv()
@@ -26,13 +23,26 @@ try:
     from simulations.physics_engine import PhysicsEngine
     from simulations.chemistry_engine import ChemistryEngine
     from simulations.biology_engine import BiologyEngine
+    from simulations.array_codec import encode_result, pack_binary, BINARY_MIMETYPE
+    from simulations.result_cache import cache_from_env
     from ai.tutor import AITutor, ECZContentGenerator
+    from ai.llm_client import LLMBusy, llm_client, llm_jobs
+    from ai.response_cache import prewarm as prewarm_response_cache, response_cache
     from ai.lab_assistant import LabAssistant
-    from ai.adaptive import AdaptiveLearningEngine
+    from ai.virtual_assistant import VirtualLabAssistant
+    from ai.adaptive import AdaptiveLearningEngine, MAX_BATCH_USERS
+    from ai.model_registry import model_registry
+    from ai.feature_store import FeatureStore
+    from ai.training import CHUNK_SIZE as TRAIN_CHUNK_SIZE, training_jobs
+    from ai.materialize import NIGHTLY, NightlyMaterializer, serve_recommendations, serve_risk
+    from ai.warmup import WarmupManager
     from ai.calibration import AdjustmentEngine
     from ai.translation import multilingual_engine
     from ai.language_detector import detector_instance
     from analytics.dashboard import AnalyticsDashboard
+    from db.pool import MYSQL_AVAILABLE, PoolTimeout, mysql_connect, pool_from_env
+    from ursa_lab.supervisor import SessionLimitReached, supervisor_from_env, warm_pool_from_env
+    from ursa_lab.experiments.registry import EXPERIMENTS
     import json
 except ImportError as e:
     print(f"Import error: {e}")
@@ -48,12 +58,71 @@ chemistry_engine = ChemistryEngine()
 biology_engine = BiologyEngine()
 ai_tutor = AITutor()
 ecz_gen = ECZContentGenerator()
-virtual_assistant = LabAssistant()
+lab_assistant = LabAssistant()
+virtual_lab_assistant = VirtualLabAssistant()
 adaptive_engine = AdaptiveLearningEngine(None)
 adjustment_engine = AdjustmentEngine(None)
 # Initialize analytics as a helper instance (will be updated with a real DB connection per request)
 analytics_helper = AnalyticsDashboard()
 
+def _warm_adaptive_models():
+    adaptive_engine.load_models()
+    if not adaptive_engine.is_trained:
+        raise RuntimeError("No trained adaptive models in ai/models")
+
+# Load AI models in the background at startup (AI_WARMUP=0 keeps them lazy).
+# Until the semantic model is ready the assistant answers with keyword search.
+ai_warmup = WarmupManager()
+ai_warmup.register("semantic_model", lab_assistant.load_model)
+ai_warmup.register("concept_embeddings", lab_assistant.load_index)
+ai_warmup.register("adaptive_models", _warm_adaptive_models)
+lab_assistant.lazy_load = not ai_warmup.enabled
+ai_warmup.start()
+
+# Near-duplicate lookups in the generated-content cache reuse the lab
+# assistant's sentence embeddings once its model is loaded
+if response_cache is not None:
+    response_cache.embedder = lambda text: lab_assistant.embed_query(text) if lab_assistant.model is not None else None
+
+if not MYSQL_AVAILABLE:
+    print("WARNING: mysql-connector-python not installed. Analytics will be unavailable.")
+
+# Cache of deterministic /api/*/simulate results (SIM_CACHE_* env vars)
+simulation_cache = cache_from_env()
+SIM_CACHE_MAX_AGE = int(os.getenv('SIM_CACHE_MAX_AGE', 3600))
+
+def _prewarm_simulation_cache(path):
+    """Compute the parameter sets listed in a JSON file, e.g.
+    [{"engine": "physics", "experiment": "pendulum", "parameters": {...}}]."""
+    engines = {"physics": physics_engine, "chemistry": chemistry_engine, "biology": biology_engine}
+    try:
+        with open(path, 'r') as f:
+            entries = json.load(f)
+        for entry in entries:
+            simulation_cache.warm(entry['engine'], engines[entry['engine']],
+                                  entry['experiment'], entry.get('parameters', {}))
+        print(f"Simulation cache pre-warmed with {len(entries)} entries")
+    except Exception as e:
+        print(f"Simulation cache pre-warm failed: {e}")
+
+if os.getenv('SIM_CACHE_PREWARM'):
+    _prewarm_simulation_cache(os.getenv('SIM_CACHE_PREWARM'))
+
+# Supervisor for 3D simulation child processes (SIM_MAX_SESSIONS, SIM_LOG_DIR)
+simulation_supervisor = supervisor_from_env()
+
+# Shared MySQL connection pool (sized via DB_POOL_* env vars)
+db_pool = pool_from_env() if MYSQL_AVAILABLE else None
+
+# Precompute of recommendations/risk for every student, nightly with
+# AI_MATERIALIZE_NIGHTLY=1 or on demand. Runs use their own connection
+# rather than holding a pool slot for the whole run.
+nightly_materializer = None
+if db_pool is not None:
+    nightly_materializer = NightlyMaterializer(mysql_connect)
+    if NIGHTLY:
+        nightly_materializer.start()
+
 @app.route('/')
 def home():
     return '''
@@ -62,11 +131,23 @@ def home():
     <p>Available endpoints:</p>
     <ul>
         <li>POST /api/physics/simulate</li>
+        <li>POST /api/physics/simulate/batch</li>
         <li>POST /api/chemistry/simulate</li>
         <li>POST /api/biology/simulate</li>
+        <li>POST /api/biology/simulate/stream</li>
         <li>POST /api/ai/tutor</li>
+        <li>POST /api/ai/tutor/stream</li>
+        <li>GET /api/ai/tutor/stats</li>
+        <li>GET /api/ai/tutor/jobs/&lt;job_id&gt;</li>
+        <li>GET /api/ai/llm/stats</li>
+        <li>GET /api/ai/content-cache</li>
+        <li>POST /api/ai/content-cache/prewarm</li>
         <li>POST /api/ai/generate-content</li>
+        <li>POST /api/ai/generate-content/stream</li>
         <li>POST /api/ai/virtual-assistant</li>
+        <li>POST /api/ai/assistant</li>
+        <li>GET /api/ai/assistant/stats</li>
+        <li>GET /api/ready</li>
     </ul>
     '''
 
@@ -83,44 +164,263 @@ def generate_content():
         "content": content
     })
 
-@app.route('/api/physics/simulate', methods=['POST'])
+@app.route('/api/ai/generate-content/stream', methods=['POST'])
+def generate_content_stream():
+    """Server-sent events: 'token' events as the content is generated, then
+    one 'done' event with the complete text (translated when the request
+    names a language other than English)."""
+    data = request.get_json(silent=True) or {}
+    content_type = data.get('type', 'explanation')
+    topic = data.get('topic', 'general science')
+    grade = data.get('grade', 'Grade 10')
+    language = data.get('language', 'english')
+
+    def generate():
+        parts = []
+        for text in ecz_gen.generate_stream(content_type, topic, grade):
+            parts.append(text)
+            yield _sse('token', {"text": text})
+        content = ''.join(parts).strip()
+        if language != 'english':
+            content = multilingual_engine.translate(content, language)
+        yield _sse('done', {"success": True, "content": content})
+
+    return _sse_response(generate())
+
+
+def _sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n"
+
+
+def _sse_response(events):
+    # No proxy buffering, or the tokens arrive all at once
+    return Response(stream_with_context(events), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def _cached_simulation(engine_name, engine):
+    """Run (or replay) a simulation for the current request.
+
+    Accepts a JSON body on POST, or ?experiment=...&parameters=<json> on GET
+    so browsers can cache and revalidate with If-None-Match.
+    """
+    if request.method == 'GET':
+        experiment = request.args.get('experiment')
+        try:
+            parameters = json.loads(request.args.get('parameters', '{}'))
+        except ValueError:
+            return jsonify({"error": "parameters must be JSON"}), 400
+    else:
+        data = request.json
+        experiment = data['experiment']
+        parameters = data.get('parameters', {})
+
+    key = simulation_cache.key(engine_name, experiment, parameters)
+    label = f"{engine_name}/{experiment}"
+    entry = simulation_cache.get(key, label)
+    if entry is None:
+        try:
+            result = engine.simulate(experiment, parameters)
+        except (TypeError, ValueError) as e:
+            result = {"error": str(e)}
+        if "error" in result:
+            # Bad parameters: report them, but never cache or replay the error
+            return jsonify(result), 400
+        entry = simulation_cache.put(key, json.dumps(result, separators=(',', ':')).encode('utf-8'), label)
+
+    body, etag = entry
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f'public, max-age={SIM_CACHE_MAX_AGE}'
+    return response
+
+@app.route('/api/physics/simulate', methods=['GET', 'POST'])
 def simulate_physics():
+    return _cached_simulation('physics', physics_engine)
+
+@app.route('/api/physics/simulate/batch', methods=['POST'])
+def simulate_physics_batch():
+    """Vectorized parameter sweep. Any parameter may be a list; lists form a
+    grid. Arrays are returned as base64 float32 (default) or, with
+    {"format": "binary"} / Accept: application/vnd.sayansi.arrays, in the
+    binary framing from simulations/array_codec.py."""
     data = request.json
-    result = physics_engine.simulate(data['experiment'], data['parameters'])
-    return jsonify(result)
+    result = physics_engine.simulate_batch(data['experiment'], data.get('parameters', {}))
+    if "error" in result:
+        return jsonify(result), 400
 
-@app.route('/api/chemistry/simulate', methods=['POST'])
+    wants_binary = (data.get('format') == 'binary' or
+                    request.accept_mimetypes.best == BINARY_MIMETYPE)
+    if wants_binary:
+        return Response(pack_binary(result), mimetype=BINARY_MIMETYPE)
+    return jsonify(encode_result(result))
+
+@app.route('/api/chemistry/simulate', methods=['GET', 'POST'])
 def simulate_chemistry():
-    data = request.json
-    result = chemistry_engine.simulate(data['experiment'], data['parameters'])
-    return jsonify(result)
+    return _cached_simulation('chemistry', chemistry_engine)
 
-@app.route('/api/biology/simulate', methods=['POST'])
+@app.route('/api/biology/simulate', methods=['GET', 'POST'])
 def simulate_biology():
-    data = request.json
-    result = biology_engine.simulate(data['experiment'], data['parameters'])
-    return jsonify(result)
+    return _cached_simulation('biology', biology_engine)
+
+@app.route('/api/cache/stats', methods=['GET'])
+def simulation_cache_stats():
+    """Hit/miss counters per engine/experiment plus cache occupancy."""
+    return jsonify({"success": True, "cache": simulation_cache.stats()})
+
+@app.route('/api/biology/simulate/stream', methods=['POST'])
+def simulate_biology_stream():
+    """Stream a long ecosystem run chunk by chunk.
+
+    NDJSON (one JSON object per line) by default; server-sent events when
+    the client sends Accept: text/event-stream.
+    """
+    data = request.get_json(silent=True) or {}
+    params = data.get('parameters', {})
+    chunk_size = data.get('chunk_size', 500)
+    use_sse = request.accept_mimetypes.best == 'text/event-stream'
+
+    # Parameter errors come back as the first record: answer them with a
+    # 400 before the stream (and its 200) starts
+    records = biology_engine.stream_ecosystem(params, chunk_size=chunk_size)
+    first = next(records)
+    if "error" in first:
+        return jsonify({"success": False, "error": first["error"]}), 400
+
+    def generate():
+        for record in itertools.chain([first], records):
+            line = json.dumps(record, separators=(',', ':'))
+            yield f"data: {line}\n\n" if use_sse else line + "\n"
+
+    mimetype = 'text/event-stream' if use_sse else 'application/x-ndjson'
+    return Response(stream_with_context(generate()), mimetype=mimetype)
+
+def _tutor_answer(question, context, session_id):
+    # Auto-detect language
+    detected_lang = detector_instance.detect(question)
+
+    usage = {}
+    response = ai_tutor.get_response(question, context, session_id=session_id, usage=usage)
+
+    # Translate natively if it isn't English
+    if detected_lang != 'english':
+        response = multilingual_engine.translate(response, detected_lang)
+
+    return {"response": response, "session_id": session_id, "detected_language": detected_lang,
+            "usage": usage}
+
 
 @app.route('/api/ai/tutor', methods=['POST'])
 def ai_tutor_response():
     data = request.json
     session_id = data.get('session_id')  
     question = data.get('question', '')
-    
-    # Auto-detect language
+    context = data.get('context', {})
+
+    if data.get('async'):
+        # Answer in the background; the client polls status_url
+        try:
+            job = llm_jobs.submit(lambda: _tutor_answer(question, context, session_id))
+        except LLMBusy as e:
+            return jsonify({"success": False, "error": str(e)}), 503
+        return jsonify({"success": True, "job": job,
+                        "status_url": f"/api/ai/tutor/jobs/{job['job_id']}"}), 202
+
+    return jsonify(_tutor_answer(question, context, session_id))
+
+
+_content_prewarm = {"thread": None, "last_run": None}
+
+def _run_content_prewarm():
+    db = None
+    try:
+        db = db_pool.acquire()
+        _content_prewarm["last_run"] = prewarm_response_cache(db, ecz_gen)
+    except Exception as e:
+        print(f"Content cache pre-warm failed: {e}")
+        _content_prewarm["last_run"] = {"error": str(e)}
+    finally:
+        if db is not None:
+            db.close()
+
+
+@app.route('/api/ai/content-cache', methods=['GET'])
+def content_cache_stats():
+    """Generated-content cache size, hit rates and the last pre-warm run."""
+    if response_cache is None:
+        return jsonify({"success": True, "enabled": False})
+    thread = _content_prewarm["thread"]
+    return jsonify({"success": True, "enabled": True, "cache": response_cache.stats(),
+                    "prewarm_running": bool(thread and thread.is_alive()),
+                    "last_prewarm": _content_prewarm["last_run"]})
+
+
+@app.route('/api/ai/content-cache/prewarm', methods=['POST'])
+def content_cache_prewarm():
+    """Pre-generate worksheets, explanations and quizzes for every experiment."""
+    if response_cache is None:
+        return jsonify({"success": False, "error": "Response cache disabled"}), 503
+    if db_pool is None:
+        return jsonify({"success": False, "error": "Database unavailable"}), 503
+    if ecz_gen.client is None:
+        return jsonify({"success": False, "error": "OPENAI_API_KEY is not configured"}), 503
+    thread = _content_prewarm["thread"]
+    if thread and thread.is_alive():
+        return jsonify({"success": False, "error": "Pre-warm already in progress"}), 409
+
+    thread = threading.Thread(target=_run_content_prewarm, name='content-prewarm', daemon=True)
+    _content_prewarm["thread"] = thread
+    thread.start()
+    return jsonify({"success": True, "status_url": "/api/ai/content-cache"}), 202
+
+
+@app.route('/api/ai/tutor/stream', methods=['POST'])
+def ai_tutor_stream():
+    """Server-sent events: 'token' events as the answer arrives, then one
+    'done' event with the complete response, translated if needed (clients
+    replace the streamed text with it)."""
+    data = request.get_json(silent=True) or {}
+    session_id = data.get('session_id')
+    question = data.get('question', '')
+    context = data.get('context', {})
     detected_lang = detector_instance.detect(question)
-    
-    response = ai_tutor.get_response(
-        question,
-        data.get('context', {}),
-        session_id=session_id
-    )
-    
-    # Translate natively if it isn't English
-    if detected_lang != 'english':
-        response = multilingual_engine.translate(response, detected_lang)
-        
-    return jsonify({"response": response, "session_id": session_id, "detected_language": detected_lang})
+
+    def generate():
+        parts, usage = [], {}
+        for text in ai_tutor.stream_response(question, context, session_id=session_id, usage=usage):
+            parts.append(text)
+            yield _sse('token', {"text": text})
+        response = ''.join(parts).strip()
+        if detected_lang != 'english':
+            response = multilingual_engine.translate(response, detected_lang)
+        yield _sse('done', {"response": response, "session_id": session_id,
+                            "detected_language": detected_lang, "usage": usage})
+
+    return _sse_response(generate())
+
+
+@app.route('/api/ai/tutor/stats', methods=['GET'])
+def ai_tutor_stats():
+    """Tutor session memory, prompt-size distribution of recent calls and
+    language detection."""
+    return jsonify({"success": True, **ai_tutor.stats(), "language_detector": detector_instance.stats()})
+
+
+@app.route('/api/ai/tutor/jobs/<job_id>', methods=['GET'])
+def ai_tutor_job(job_id):
+    """State and, once finished, the answer of an async tutor request."""
+    job = llm_jobs.status(job_id)
+    if job is None:
+        return jsonify({"success": False, "error": "Unknown job"}), 404
+    return jsonify({"success": True, "job": job})
+
+
+@app.route('/api/ai/llm/stats', methods=['GET'])
+def llm_stats():
+    """Shared OpenAI client: in-flight and waiting calls, retries, rejections."""
+    return jsonify({"success": True, "llm": llm_client.stats(), "jobs": llm_jobs.stats()})
 
 
 @app.route('/api/ai/tutor/clear', methods=['POST'])
@@ -135,57 +435,56 @@ def ai_tutor_clear_session():
 @app.route('/api/ai/virtual-assistant', methods=['POST'])
 def virtual_assistant():
     data = request.json
-    response = virtual_assistant.process_message(
+    response = virtual_lab_assistant.process_message(
         data['message'], 
         data['user_id'], 
         data.get('context', {})
     )
     return jsonify(response)
 
-def _launch_script(script_path, sim_type):
-    """Helper: launch a Python script in a subprocess and return JSON result."""
-    import subprocess
-    import time
-
-    # Determine Python executable (prioritize local venv)
+def _simulation_runtime():
+    """Python executable (prioritize local venv) and environment for 3D children."""
     venv_python = os.path.join(os.path.dirname(__file__), 'venv', 'bin', 'python')
     python_exe = venv_python if os.path.exists(venv_python) else sys.executable
 
     # Set environment variables for display
     env = os.environ.copy()
     env['DISPLAY'] = ':0.0'
+    return python_exe, env
+
+
+# Pre-started Ursina workers (SIM_WARM_POOL_SIZE=0 disables the pool). Started
+# by the first launch request, not at import, and stopped at exit
+simulation_warm_pool = warm_pool_from_env(simulation_supervisor, *_simulation_runtime())
+atexit.register(simulation_warm_pool.shutdown)
+
+
+def _launch_script(script_path, sim_type):
+    """Helper: start a Python script under the simulation supervisor and
+    return immediately. Poll /api/launch-simulation/<pid>/status for the
+    outcome; the child's output goes to a rotating per-session log."""
+    python_exe, env = _simulation_runtime()
 
     print(f"Launching 3D simulation: {python_exe} {script_path} --type {sim_type}")
 
-    process = subprocess.Popen(
-        [python_exe, script_path, '--type', sim_type],
-        env=env,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True
-    )
+    try:
+        session = simulation_supervisor.launch(script_path, sim_type, python_exe=python_exe, env=env)
+    except SessionLimitReached as e:
+        return jsonify({"success": False, "message": str(e)}), 429
 
-    # Wait a moment to check if it starts successfully
-    time.sleep(2)
-
-    if process.poll() is None:  # Still running
-        print(f"✅ 3D simulation launched successfully (PID: {process.pid})")
-        return jsonify({
-            "success": True,
-            "message": f"Launched {sim_type} simulation",
-            "pid": process.pid,
-            "debug": "Check for separate 3D window"
-        })
-    else:
-        stdout, stderr = process.communicate()
-        print(f"❌ 3D simulation failed to start")
-        print(f"STDOUT: {stdout}")
-        print(f"STDERR: {stderr}")
-        return jsonify({
-            "success": False,
-            "message": f"Failed to start {sim_type} simulation",
-            "error": stderr or stdout
-        })
+    print(f"✅ 3D simulation started (PID: {session.pid})")
+    return _launched(session, warm=False)
+
+
+def _launched(session, warm):
+    return jsonify({
+        "success": True,
+        "message": f"Launched {session.sim_type} simulation",
+        "pid": session.pid,
+        "warm": warm,
+        "status_url": f"/api/launch-simulation/{session.pid}/status",
+        "debug": "Check for separate 3D window"
+    })
 
 
 @app.route('/api/launch-simulation', methods=['POST'])
@@ -198,6 +497,8 @@ def launch_3d_simulation():
     data = request.json
     sim_type = data.get('type', 'pendulum')
     use_debug = data.get('debug', False)
+    if not use_debug and sim_type not in EXPERIMENTS:
+        return jsonify({"success": False, "message": f"Unknown experiment type: {sim_type}"}), 400
 
     try:
         if use_debug:
@@ -206,18 +507,52 @@ def launch_3d_simulation():
             if not os.path.exists(script_path):
                 return jsonify({"success": False, "message": "simple_3d.py not found"})
         else:
-            # Default: use the full Ursina simulation dispatcher
+            # Default: hand the experiment to a pre-started worker if one is idle
+            if simulation_warm_pool.size > 0:
+                simulation_warm_pool.start()
+                session = simulation_warm_pool.acquire(sim_type)
+                if session is not None:
+                    print(f"✅ 3D simulation assigned to warm worker (PID: {session.pid})")
+                    return _launched(session, warm=True)
+
+            # Otherwise cold-start the full Ursina simulation dispatcher
             script_path = os.path.join(os.path.dirname(__file__), 'ursa_lab', 'main.py')
             if not os.path.exists(script_path):
                 return jsonify({"success": False, "message": "ursa_lab/main.py not found"})
 
         return _launch_script(script_path, sim_type)
 
+    except SessionLimitReached as e:
+        return jsonify({"success": False, "message": str(e)}), 429
     except Exception as e:
         print(f"Error launching simulation: {e}")
         return jsonify({"success": False, "message": str(e)})
 
 
+@app.route('/api/launch-simulation/<int:pid>/status', methods=['GET'])
+def simulation_status(pid):
+    """Report whether a launched simulation is running, with its log tail."""
+    status = simulation_supervisor.status(pid)
+    if status is None:
+        return jsonify({"success": False, "error": "Unknown simulation"}), 404
+    return jsonify({"success": True, "simulation": status})
+
+
+@app.route('/api/launch-simulation/pool', methods=['GET'])
+def simulation_pool_stats():
+    """Warm worker pool occupancy and warm/cold launch counters."""
+    return jsonify({"success": True, "pool": simulation_warm_pool.stats()})
+
+
+@app.route('/api/launch-simulation/<int:pid>/stop', methods=['POST'])
+def stop_simulation(pid):
+    """Terminate a launched simulation."""
+    status = simulation_supervisor.stop(pid)
+    if status is None:
+        return jsonify({"success": False, "error": "Unknown simulation"}), 404
+    return jsonify({"success": True, "simulation": status})
+
+
 @app.route('/api/debug/launch-simulation', methods=['POST'])
 def launch_debug_simulation():
     """
@@ -242,6 +577,7 @@ def launch_debug_simulation():
 def health_check():
     return jsonify({
         "status": "healthy",
+        "ready": ai_warmup.is_ready(),
         "version": "1.1.0",
         "features": [
             "physics_simulations",
@@ -256,27 +592,55 @@ def health_check():
     })
 
 
+@app.route('/api/ready', methods=['GET'])
+def readiness_check():
+    """503 until AI warm-up has finished; per-component state and load times.
+
+    "ready" means the first warm-up pass is over, not that every component
+    loaded: a failed component sets "degraded" (the lab assistant falls back
+    to keyword search) and is retried in the background, with its attempt
+    count and next retry time listed under "components".
+    """
+    status = ai_warmup.status()
+    return jsonify({"success": True, **status}), 200 if status["ready"] else 503
+
+
 # ---------------------------------------------------------------------------
 # Analytics endpoints (REC-03)
 # ---------------------------------------------------------------------------
 
 def _get_db():
-    """Create and return a fresh MySQL connection using the same credentials
-    as the PHP backend (env vars with local dev fallbacks)."""
-    if not MYSQL_AVAILABLE:
+    """Borrow a MySQL connection from the shared pool.
+
+    The connection is returned to the pool when the route calls db.close();
+    anything a route forgets to close is handed back at request teardown.
+    """
+    if db_pool is None:
         return None
     try:
-        return mysql.connector.connect(
-            host=os.getenv('DB_HOST', '127.0.0.1'),
-            port=int(os.getenv('DB_PORT', 3306)),
-            database=os.getenv('DB_NAME', 'sayansi_yathu'),
-            user=os.getenv('DB_USER', 'sayansi_admin'),
-            password=os.getenv('DB_PASSWORD', '@mpundu23maloba'),
-            connection_timeout=5
-        )
+        db = db_pool.acquire()
+    except PoolTimeout as e:
+        print(f"Analytics DB pool exhausted: {e}")
+        return None
     except Exception as e:
         print(f"Analytics DB connection error: {e}")
         return None
+    g.setdefault('db_connections', []).append(db)
+    return db
+
+
+@app.teardown_appcontext
+def _release_db(exc):
+    for db in g.pop('db_connections', []):
+        db.close()
+
+
+@app.route('/api/db/pool/stats', methods=['GET'])
+def db_pool_stats():
+    """Return connection pool metrics (checkouts, waits, timeouts, ...)."""
+    if db_pool is None:
+        return jsonify({"success": False, "error": "Database unavailable"}), 503
+    return jsonify({"success": True, "pool": db_pool.stats()})
 
 
 @app.route('/api/analytics/student/<int:user_id>', methods=['GET'])
@@ -456,6 +820,11 @@ def handle_quiz():
             cursor.execute(query, (user_id, experiment_id, quiz_score))
             db.commit()
             cursor.close()
+            try:
+                # Keep the student's feature row current for the next inference
+                FeatureStore(db).refresh([int(user_id)])
+            except Exception as e:
+                print(f"Feature refresh failed: {e}")
             db.close()
             
             return jsonify({"success": True, "message": "Quiz score saved"})
@@ -478,14 +847,54 @@ def adaptive_recommend():
 
     try:
         engine = AdaptiveLearningEngine(db)
-        recomms = engine.get_recommendations(int(user_id))
+        recomms, source = serve_recommendations(db, engine, int(user_id))
         db.close()
-        return jsonify({"success": True, "recommendations": recomms})
+        return jsonify({"success": True, "recommendations": recomms, "source": source})
     except Exception as e:
         print(f"Adaptive Recomm error: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@app.route('/api/ai/adaptive/recommend/batch', methods=['POST'])
+def adaptive_recommend_batch():
+    """Top-k recommendations for many students (user_ids, or a class) at once."""
+    data = request.json or {}
+    k = int(data.get('k', 3))
+    user_ids = data.get('user_ids')
+    class_name = data.get('class')
+    if not user_ids and not class_name:
+        return jsonify({"success": False, "error": "user_ids or class required"}), 400
+
+    db = _get_db()
+    if not db:
+        return jsonify({"success": False, "error": "Database unavailable"}), 503
+
+    try:
+        if not user_ids:
+            cursor = db.cursor(dictionary=True)
+            query = "SELECT linked_user_id FROM students WHERE class = %s"
+            params = [class_name]
+            if data.get('school'):
+                query += " AND school = %s"
+                params.append(data['school'])
+            cursor.execute(query, tuple(params))
+            user_ids = [row['linked_user_id'] for row in cursor.fetchall()]
+            cursor.close()
+        user_ids = [int(u) for u in user_ids]
+        if len(user_ids) > MAX_BATCH_USERS:
+            return jsonify({"success": False,
+                            "error": f"At most {MAX_BATCH_USERS} users per batch"}), 400
+
+        engine = AdaptiveLearningEngine(db)
+        recomms = engine.recommend_batch(user_ids, k)
+        db.close()
+        return jsonify({"success": True,
+                        "recommendations": {str(u): r for u, r in recomms.items()}})
+    except Exception as e:
+        print(f"Adaptive Batch Recomm error: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 @app.route('/api/ai/adaptive/risk', methods=['GET'])
 def adaptive_risk():
     """Return risk assessment for a student."""
@@ -499,9 +908,9 @@ def adaptive_risk():
 
     try:
         engine = AdaptiveLearningEngine(db)
-        risk_data = engine.predict_risk(int(user_id))
+        risk_data, source = serve_risk(db, engine, int(user_id))
         db.close()
-        return jsonify({"success": True, "risk": risk_data})
+        return jsonify({"success": True, "risk": risk_data, "source": source})
     except Exception as e:
         print(f"Adaptive Risk error: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
@@ -509,19 +918,51 @@ def adaptive_risk():
 
 @app.route('/api/ai/adaptive/train', methods=['POST'])
 def adaptive_train():
-    """Trigger training of the adaptive models."""
-    db = _get_db()
-    if not db:
+    """Start training the adaptive models in a background worker process."""
+    data = request.get_json(silent=True) or {}
+    if db_pool is None:
         return jsonify({"success": False, "error": "Database unavailable"}), 503
 
-    try:
-        engine = AdaptiveLearningEngine(db)
-        engine.train_models()
-        db.close()
-        return jsonify({"success": True, "message": "Models trained successfully"})
-    except Exception as e:
-        print(f"Adaptive Training error: {e}")
-        return jsonify({"success": False, "error": str(e)}), 500
+    job = training_jobs().start(int(data.get('chunk_size', TRAIN_CHUNK_SIZE)))
+    if job is None:
+        return jsonify({"success": False, "error": "Training already in progress",
+                        "job": training_jobs().active()}), 409
+    return jsonify({"success": True, "job": job,
+                    "status_url": f"/api/ai/adaptive/train/{job['job_id']}"}), 202
+
+
+@app.route('/api/ai/adaptive/train/<job_id>', methods=['GET'])
+def adaptive_train_status(job_id):
+    """Progress, timings and validation metrics of a training job."""
+    job = training_jobs().status(job_id)
+    if job is None:
+        return jsonify({"success": False, "error": "Unknown job"}), 404
+    return jsonify({"success": True, "job": job})
+
+
+@app.route('/api/ai/adaptive/materialize', methods=['POST'])
+def adaptive_materialize():
+    """Recompute stored recommendations and risk for every student in the
+    background; poll the status URL for the result."""
+    if nightly_materializer is None:
+        return jsonify({"success": False, "error": "Database unavailable"}), 503
+    if not nightly_materializer.run_now():
+        return jsonify({"success": False, "error": "Materialization already in progress"}), 409
+    return jsonify({"success": True, "status_url": "/api/ai/adaptive/materialize"}), 202
+
+
+@app.route('/api/ai/adaptive/materialize', methods=['GET'])
+def adaptive_materialize_status():
+    """Whether a materialization is running, and the last run's stats."""
+    if nightly_materializer is None:
+        return jsonify({"success": False, "error": "Database unavailable"}), 503
+    return jsonify({"success": True, **nightly_materializer.status()})
+
+
+@app.route('/api/ai/adaptive/models', methods=['GET'])
+def adaptive_models():
+    """Active adaptive model version and stored version metadata."""
+    return jsonify({"success": True, **model_registry.info()})
 
 
 @app.route('/api/analytics/sba', methods=['GET'])
@@ -553,10 +994,16 @@ def assistant_search():
     if not query:
         return jsonify({"success": False, "error": "query required"}), 400
     
-    answer = virtual_assistant.get_answer(query)
+    answer = lab_assistant.get_answer(query)
     return jsonify({"success": True, "answer": answer})
 
 
+@app.route('/api/ai/assistant/stats', methods=['GET'])
+def assistant_stats():
+    """Query cache hit rates and encoder micro-batch sizes."""
+    return jsonify({"success": True, "stats": lab_assistant.stats()})
+
+
 UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
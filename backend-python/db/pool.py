@@ -0,0 +1,276 @@
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+try:
+    import mysql.connector
+    MYSQL_AVAILABLE = True
+except ImportError:
+    MYSQL_AVAILABLE = False
+
+
+def connect_kwargs() -> Dict:
+    """MySQL connection settings shared with the PHP backend (env vars with
+    local dev fallbacks)."""
+    return {
+        "host": os.getenv('DB_HOST', '127.0.0.1'),
+        "port": int(os.getenv('DB_PORT', 3306)),
+        "database": os.getenv('DB_NAME', 'sayansi_yathu'),
+        "user": os.getenv('DB_USER', 'sayansi_admin'),
+        "password": os.getenv('DB_PASSWORD', '@mpundu23maloba'),
+        "connection_timeout": int(os.getenv('DB_CONNECT_TIMEOUT', 5)),
+    }
+
+
+def mysql_connect():
+    """Open a single raw MySQL connection (used as the pool's factory)."""
+    return mysql.connector.connect(**connect_kwargs())
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection could be borrowed within the pool timeout."""
+
+
+class PooledConnection:
+    """Thin proxy around a driver connection.
+
+    Behaves like the underlying connection (cursor(), commit(), ...), except
+    that close() hands the connection back to the pool instead of tearing
+    down the TCP session. Calling close() more than once is harmless.
+    """
+
+    def __init__(self, pool: "ConnectionPool", raw, created_at: float):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+        self._returned = False
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    @property
+    def closed(self) -> bool:
+        return self._returned
+
+    def close(self):
+        if self._returned:
+            return
+        self._returned = True
+        self._pool._release(self._raw, self._created_at)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ConnectionPool:
+    """Bounded pool of database connections.
+
+    - size:           connections kept open between requests
+    - max_overflow:   extra short-lived connections allowed under bursts
+    - timeout:        seconds to wait for a free connection before giving up
+    - recycle:        connections older than this (seconds) are reopened
+    - pre_ping:       verify the connection is alive before handing it out
+    """
+
+    def __init__(self, factory: Callable, size: int = 5, max_overflow: int = 10,
+                 timeout: float = 5.0, recycle: float = 3600, pre_ping: bool = True):
+        self._factory = factory
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._open = 0  # connections currently open (idle + checked out)
+        self._stats = {
+            "checkouts": 0,
+            "checkins": 0,
+            "waits": 0,
+            "wait_time_total": 0.0,
+            "timeouts": 0,
+            "connects": 0,
+            "connect_errors": 0,
+            "recycled": 0,
+            "ping_failures": 0,
+            "overflow_closed": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Borrow / return
+    # ------------------------------------------------------------------
+    def acquire(self, timeout: Optional[float] = None) -> PooledConnection:
+        """Borrow a connection. Raises PoolTimeout if none frees up in time."""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        waited = False
+        wait_started = time.monotonic()
+
+        while True:
+            raw = None
+            with self._available:
+                while True:
+                    try:
+                        raw, created_at = self._idle.get_nowait()
+                        break
+                    except queue.Empty:
+                        pass
+                    if self._open < self.size + self.max_overflow:
+                        self._open += 1  # slot reserved; connect outside the lock
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolTimeout(
+                            f"No database connection available within {timeout}s "
+                            f"(pool size {self.size}, overflow {self.max_overflow})"
+                        )
+                    if not waited:
+                        waited = True
+                        self._stats["waits"] += 1
+                    # Woken by a checkin or by a discard freeing a slot
+                    self._available.wait(remaining)
+
+            if raw is None:
+                raw, created_at = self._connect()
+
+            raw, created_at = self._validate(raw, created_at)
+            if raw is None:
+                continue
+
+            with self._lock:
+                self._stats["checkouts"] += 1
+                if waited:
+                    self._stats["wait_time_total"] += time.monotonic() - wait_started
+            return PooledConnection(self, raw, created_at)
+
+    def _release(self, raw, created_at: float):
+        with self._lock:
+            self._stats["checkins"] += 1
+            overflowing = self._idle.qsize() >= self.size
+        if overflowing:
+            with self._lock:
+                self._stats["overflow_closed"] += 1
+            self._discard(raw)
+            return
+        try:
+            # Drop any half-finished transaction so the next borrower starts clean
+            raw.rollback()
+        except Exception:
+            self._discard(raw)
+            return
+        with self._available:
+            self._idle.put((raw, created_at))
+            self._available.notify()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _reserve_slot(self) -> bool:
+        with self._lock:
+            if self._open < self.size + self.max_overflow:
+                self._open += 1
+                return True
+            return False
+
+    def _connect(self):
+        try:
+            raw = self._factory()
+        except Exception as e:
+            with self._available:
+                self._open -= 1
+                self._stats["connect_errors"] += 1
+                self._available.notify()
+            raise e
+        with self._lock:
+            self._stats["connects"] += 1
+        return raw, time.monotonic()
+
+    def _discard(self, raw):
+        with self._available:
+            self._open -= 1
+            # The freed slot lets a blocked acquire() open a new connection
+            self._available.notify()
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    def _validate(self, raw, created_at: float):
+        """Recycle stale connections and (optionally) ping before handing out.
+        Returns (None, None) if the caller should try again."""
+        if self.recycle and time.monotonic() - created_at > self.recycle:
+            with self._lock:
+                self._stats["recycled"] += 1
+            self._discard(raw)
+            if not self._reserve_slot():
+                return None, None
+            return self._connect()
+
+        if self.pre_ping:
+            try:
+                raw.ping(reconnect=False)
+            except Exception:
+                with self._lock:
+                    self._stats["ping_failures"] += 1
+                self._discard(raw)
+                return None, None
+        return raw, created_at
+
+    # ------------------------------------------------------------------
+    # Introspection / shutdown
+    # ------------------------------------------------------------------
+    def stats(self) -> Dict:
+        with self._lock:
+            snapshot = dict(self._stats)
+            open_count = self._open
+        idle = self._idle.qsize()
+        snapshot.update({
+            "size": self.size,
+            "max_overflow": self.max_overflow,
+            "timeout": self.timeout,
+            "recycle": self.recycle,
+            "pre_ping": self.pre_ping,
+            "open": open_count,
+            "idle": idle,
+            "in_use": open_count - idle,
+            "avg_wait_ms": round(1000 * snapshot["wait_time_total"] / snapshot["waits"], 2)
+            if snapshot["waits"] else 0.0,
+        })
+        snapshot["wait_time_total"] = round(snapshot["wait_time_total"], 4)
+        return snapshot
+
+    def dispose(self):
+        """Close every idle connection (checked-out ones close on return)."""
+        while True:
+            try:
+                raw, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(raw)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def pool_from_env(factory: Callable = None) -> ConnectionPool:
+    """Build a pool configured from DB_POOL_* environment variables."""
+    return ConnectionPool(
+        factory or mysql_connect,
+        size=int(os.getenv('DB_POOL_SIZE', 5)),
+        max_overflow=int(os.getenv('DB_POOL_MAX_OVERFLOW', 10)),
+        timeout=float(os.getenv('DB_POOL_TIMEOUT', 5)),
+        recycle=float(os.getenv('DB_POOL_RECYCLE', 3600)),
+        pre_ping=_env_bool('DB_POOL_PRE_PING', True),
+    )
@@ -0,0 +1,115 @@
+import base64
+import json
+import struct
+import numpy as np
+
+# ---------------------------------------------------------------------------
+# Compact wire formats for NumPy simulation results.
+#
+# base64: every ndarray becomes {"dtype", "shape", "data"} with the raw
+#         little-endian float32 bytes base64-encoded inside ordinary JSON.
+# binary: MAGIC | uint32 header length | JSON header | raw array buffers.
+#         The header holds the non-array fields plus, for each array, its
+#         dtype, shape, byte offset and byte length into the buffer section.
+#         The header is space-padded so the buffer section starts on an
+#         8-byte boundary, and every buffer is padded to a multiple of 8, so
+#         clients can view each array in place (new Float32Array(buf, 8 +
+#         headerLength + offset, ...)) without copying.
+# ---------------------------------------------------------------------------
+
+MAGIC = b'SYB1'
+WIRE_DTYPE = np.dtype('<f4')
+BINARY_MIMETYPE = 'application/vnd.sayansi.arrays'
+ALIGNMENT = 8
+
+
+def _padding(length):
+    return -length % ALIGNMENT
+
+
+def _as_wire(arr):
+    return np.ascontiguousarray(arr, dtype=WIRE_DTYPE)
+
+
+def encode_array(arr):
+    """Encode one array as base64 float32."""
+    wire = _as_wire(arr)
+    return {
+        "dtype": "float32",
+        "shape": list(wire.shape),
+        "data": base64.b64encode(wire.tobytes()).decode('ascii')
+    }
+
+
+def decode_array(obj):
+    """Inverse of encode_array (handy for clients written in Python)."""
+    raw = base64.b64decode(obj["data"])
+    return np.frombuffer(raw, dtype=WIRE_DTYPE).reshape(obj["shape"])
+
+
+def encode_result(value):
+    """Recursively replace ndarrays in a result dict with base64 payloads."""
+    if isinstance(value, np.ndarray):
+        return encode_array(value)
+    if isinstance(value, dict):
+        return {k: encode_result(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode_result(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def pack_binary(result):
+    """Pack a (flat or nested) result dict into the binary framing."""
+    buffers = []
+    offset = 0
+
+    def walk(value):
+        nonlocal offset
+        if isinstance(value, np.ndarray):
+            wire = _as_wire(value)
+            raw = wire.tobytes()
+            buffers.append(raw + b'\0' * _padding(len(raw)))
+            ref = {
+                "$array": True,
+                "dtype": "float32",
+                "shape": list(wire.shape),
+                "offset": offset,
+                "length": len(raw)
+            }
+            offset += len(buffers[-1])
+            return ref
+        if isinstance(value, dict):
+            return {k: walk(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [walk(v) for v in value]
+        if isinstance(value, np.generic):
+            return value.item()
+        return value
+
+    header = json.dumps(walk(result), separators=(',', ':')).encode('utf-8')
+    # Trailing spaces are valid JSON whitespace
+    header += b' ' * _padding(len(MAGIC) + 4 + len(header))
+    return b''.join([MAGIC, struct.pack('<I', len(header)), header] + buffers)
+
+
+def unpack_binary(payload):
+    """Inverse of pack_binary."""
+    if payload[:4] != MAGIC:
+        raise ValueError("Not a Sayansi array payload")
+    (header_len,) = struct.unpack('<I', payload[4:8])
+    header = json.loads(payload[8:8 + header_len].decode('utf-8'))
+    body = memoryview(payload)[8 + header_len:]
+
+    def walk(value):
+        if isinstance(value, dict):
+            if value.get("$array"):
+                chunk = body[value["offset"]:value["offset"] + value["length"]]
+                return np.frombuffer(chunk, dtype=WIRE_DTYPE).reshape(value["shape"])
+            return {k: walk(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [walk(v) for v in value]
+        return value
+
+    return walk(header)
@@ -1,4 +1,100 @@
 import json
+import numpy as np
+
+from simulations.integrators import rk4_step
+
+MAX_BUFFERED_STEPS = 5000
+MAX_STREAMED_STEPS = 1000000
+MAX_STREAM_CHUNK = 5000  # recorded steps per streamed record (bounds the chunk buffer)
+
+# Default three-level food chain: grass grows logistically, rabbits graze,
+# foxes prey on rabbits. Rates are per time step.
+DEFAULT_SPECIES = ['grass', 'rabbit', 'fox']
+DEFAULT_POPULATIONS = [1000, 100, 10]
+DEFAULT_GROWTH_RATES = [0.1, -0.02, -0.05]
+DEFAULT_INTERACTIONS = [
+    [-1e-4, -2e-4, 0.0],     # grass: self-limiting (K = 1000), eaten by rabbits
+    [5e-5, 0.0, -1e-3],      # rabbit: gains from grass, eaten by foxes
+    [0.0, 1e-4, 0.0],        # fox: gains from rabbits
+]
+
+
+def _ecosystem_model(params):
+    """Validate parameters and build the arrays for the ODE."""
+    species = list(params.get('species', DEFAULT_SPECIES))
+    n = len(species)
+    default_web = species == DEFAULT_SPECIES
+    try:
+        x0 = np.asarray(params.get('populations', DEFAULT_POPULATIONS if default_web else [1.0] * n),
+                        dtype=np.float64)
+        r = np.asarray(params.get('growth_rates', DEFAULT_GROWTH_RATES if default_web else [0.0] * n),
+                       dtype=np.float64)
+        A = np.asarray(params.get('interaction_matrix', DEFAULT_INTERACTIONS if default_web
+                                  else np.zeros((n, n))), dtype=np.float64)
+    except (TypeError, ValueError):
+        return {"error": "populations, growth_rates and interaction_matrix must be numeric"}
+    try:
+        steps = int(params.get('time_steps', 50))
+        dt = float(params.get('dt', 1.0))
+        record_every = max(1, int(params.get('record_every', 1)))
+    except (TypeError, ValueError):
+        return {"error": "time_steps and record_every must be integers and dt a number"}
+
+    if n == 0 or x0.shape != (n,) or r.shape != (n,) or A.shape != (n, n):
+        return {"error": f"Expected {n} populations, {n} growth rates and a {n}x{n} interaction matrix"}
+    if not (np.all(np.isfinite(x0)) and np.all(np.isfinite(r)) and np.all(np.isfinite(A))):
+        return {"error": "populations, growth_rates and interaction_matrix must be finite"}
+    if np.any(x0 < 0):
+        return {"error": "Populations must be non-negative"}
+    if steps < 1:
+        return {"error": "time_steps must be at least 1"}
+    if not (np.isfinite(dt) and dt > 0):
+        return {"error": "dt must be a positive number"}
+
+    return {
+        "species": species,
+        "x0": x0,
+        "r": r,
+        "A": A,
+        "steps": steps,
+        "dt": dt,
+        "record_every": record_every
+    }
+
+
+def _integrate_ecosystem(model, chunk_size):
+    """RK4-integrate the food web, yielding (start_index, history_chunk)
+    where each chunk is a (rows, N) array of recorded populations. Raises
+    FloatingPointError (after yielding the finite rows) if the web diverges."""
+    r, A, dt = model["r"], model["A"], model["dt"]
+
+    def f(t, x):
+        return x * (r + A @ x)
+
+    x = model["x0"].copy()
+    record_every = model["record_every"]
+    buffer = np.empty((chunk_size, x.size))
+    filled = 0
+    recorded = 0
+
+    for step in range(model["steps"]):
+        if step % record_every == 0:
+            buffer[filled] = x
+            filled += 1
+            if filled == chunk_size:
+                yield recorded, buffer.copy()
+                recorded += filled
+                filled = 0
+        with np.errstate(over='ignore', invalid='ignore'):
+            x = np.maximum(rk4_step(f, step * dt, x, dt), 0.0)
+        if not np.all(np.isfinite(x)):
+            if filled:
+                yield recorded, buffer[:filled].copy()
+            raise FloatingPointError(f"Populations diverged after step {step + 1}; "
+                                     "reduce dt or the growth rates")
+
+    if filled:
+        yield recorded, buffer[:filled].copy()
 
 class BiologyEngine:
     def simulate(self, experiment_type, parameters):
@@ -58,32 +154,68 @@ class BiologyEngine:
         }
 
     def simulate_ecosystem(self, params):
-        species = params.get('species', ['grass', 'rabbit', 'fox'])
-        initial_populations = params.get('populations', [1000, 100, 10])
-        
-        # Simple predator-prey simulation
-        time_steps = 50
-        populations = {
-            species[i]: [initial_populations[i]] for i in range(len(species))
-        }
-        
-        for t in range(1, time_steps):
-            # Grass growth
-            grass_growth = 0.1 * populations['grass'][-1] * (1 - populations['grass'][-1]/1000)
-            populations['grass'].append(populations['grass'][-1] + grass_growth)
-            
-            # Rabbit dynamics
-            rabbit_birth = 0.05 * populations['rabbit'][-1] * (populations['grass'][-1]/1000)
-            rabbit_death = 0.02 * populations['rabbit'][-1]
-            populations['rabbit'].append(populations['rabbit'][-1] + rabbit_birth - rabbit_death)
-            
-            # Fox dynamics
-            fox_birth = 0.01 * populations['fox'][-1] * (populations['rabbit'][-1]/100)
-            fox_death = 0.05 * populations['fox'][-1]
-            populations['fox'].append(populations['fox'][-1] + fox_birth - fox_death)
-        
+        """Generalised Lotka–Volterra food web, returned in one response.
+
+        dx/dt = x * (r + A @ x) for N species with growth rates r and an
+        N x N interaction matrix A (A[i][j] is the per-capita effect of
+        species j on species i). Long runs should use stream_ecosystem.
+        """
+        model = _ecosystem_model(params)
+        if "error" in model:
+            return model
+        if model["steps"] > MAX_BUFFERED_STEPS:
+            return {"error": f"Use the streaming endpoint for more than {MAX_BUFFERED_STEPS} steps"}
+
+        try:
+            chunks = list(_integrate_ecosystem(model, chunk_size=model["steps"]))
+        except FloatingPointError as e:
+            return {"error": str(e)}
+        history = np.concatenate([c for _, c in chunks], axis=0)
+        species = model["species"]
+
         return {
-            "time_steps": time_steps,
-            "populations": populations,
+            "time_steps": model["steps"],
+            "time": (np.arange(history.shape[0]) * model["dt"] * model["record_every"]).tolist(),
+            "populations": {name: history[:, i].tolist() for i, name in enumerate(species)},
             "species": species
-        }
\ No newline at end of file
+        }
+
+    def stream_ecosystem(self, params, chunk_size=500):
+        """Yield the ecosystem run as JSON-ready dicts: a header, one record
+        per chunk of recorded steps, then a summary. Only one chunk of
+        history is held in memory at a time. chunk_size is clamped to
+        [1, MAX_STREAM_CHUNK]."""
+        model = _ecosystem_model(params)
+        if "error" in model:
+            yield model
+            return
+        try:
+            chunk_size = min(max(1, int(chunk_size)), MAX_STREAM_CHUNK)
+        except (TypeError, ValueError):
+            yield {"error": "chunk_size must be an integer"}
+            return
+        if model["steps"] > MAX_STREAMED_STEPS:
+            yield {"error": f"At most {MAX_STREAMED_STEPS} steps per run"}
+            return
+
+        species = model["species"]
+        step_time = model["dt"] * model["record_every"]
+        yield {"type": "header", "species": species, "time_steps": model["steps"],
+               "dt": model["dt"], "record_every": model["record_every"]}
+
+        last = None
+        try:
+            for start, chunk in _integrate_ecosystem(model, chunk_size=chunk_size):
+                last = chunk[-1]
+                yield {
+                    "type": "chunk",
+                    "start": start,
+                    "time": ((start + np.arange(chunk.shape[0])) * step_time).tolist(),
+                    "populations": {name: chunk[:, i].tolist() for i, name in enumerate(species)}
+                }
+        except FloatingPointError as e:
+            # NaN/Infinity are not valid JSON; end the stream with an error record
+            yield {"type": "error", "error": str(e)}
+            return
+
+        yield {"type": "done", "final": {name: float(last[i]) for i, name in enumerate(species)}}
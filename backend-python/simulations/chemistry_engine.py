@@ -1,6 +1,58 @@
 from typing import Dict, List
 import random
 import math
+import numpy as np
+
+PKW = 14.0
+MAX_TITRATION_SAMPLES = 5000
+MAX_PROTONS = 6
+_BISECTION_ITERATIONS = 50
+
+
+def _titration_volumes(max_volume, equivalence_points, samples):
+    """Titrant volumes: half on a uniform grid, half clustered (cubically)
+    around each equivalence point inside [0, max_volume]."""
+    n_uniform = max(2, samples // 2)
+    dense_each = max(0, (samples - n_uniform) // len(equivalence_points))
+    parts = [np.linspace(0.0, max_volume, n_uniform)]
+
+    if dense_each:
+        u = np.linspace(-1.0, 1.0, dense_each)
+        half_width = 0.1 * max_volume
+        for v_eq in equivalence_points:
+            parts.append(v_eq + half_width * u ** 3)
+
+    volumes = np.unique(np.concatenate(parts))
+    return volumes[(volumes >= 0) & (volumes <= max_volume)]
+
+
+def _mean_charge(p, log_k, n_protons):
+    """Average number of protons released per analyte molecule at p[H]."""
+    if log_k is None:
+        return np.full_like(p, float(n_protons))
+    j = np.arange(n_protons + 1)
+    log_beta = np.concatenate([[0.0], np.cumsum(log_k)])
+    # log10 of [A^j-]/[H_nA] terms: sum(log Ka_1..j) + j * pH
+    terms = log_beta[None, :] + j[None, :] * p[:, None]
+    terms -= terms.max(axis=1, keepdims=True)
+    weights = 10.0 ** terms
+    return (weights * j).sum(axis=1) / weights.sum(axis=1)
+
+
+def _solve_charge_balance(c_analyte, c_titrant, log_k, n_protons):
+    """Vectorized bisection on p = -log10[H+] for
+        c_titrant + [H+] = Kw/[H+] + c_analyte * mean_charge([H+]).
+    The residual is monotonic in p, so a fixed iteration count is enough."""
+    lo = np.full_like(c_analyte, -2.0)
+    hi = np.full_like(c_analyte, PKW + 2.0)
+    for _ in range(_BISECTION_ITERATIONS):
+        mid = 0.5 * (lo + hi)
+        residual = (c_titrant + 10.0 ** -mid - 10.0 ** (mid - PKW)
+                    - c_analyte * _mean_charge(mid, log_k, n_protons))
+        # Positive residual: too much H+ for the balance, so the pH is higher
+        lo = np.where(residual > 0, mid, lo)
+        hi = np.where(residual > 0, hi, mid)
+    return 0.5 * (lo + hi)
 
 class ChemistryEngine:
     def simulate(self, experiment_type, parameters):
@@ -14,34 +66,72 @@ class ChemistryEngine:
             return {"error": "Unknown experiment type"}
 
     def simulate_titration(self, params):
-        acid_conc = params.get('acid_concentration', 0.1)
-        acid_vol = params.get('acid_volume', 25.0)
-        base_conc = params.get('base_concentration', 0.1)
-        
-        equivalence_point = (acid_conc * acid_vol) / base_conc
-        
-        # Simulate pH curve
-        volumes = []
-        pH_values = []
-        
-        for vol in range(0, int(equivalence_point * 2), 1):
-            volumes.append(vol)
-            if vol < equivalence_point:
-                moles_acid = (acid_conc * acid_vol - base_conc * vol) / 1000
-                conc_H = max(1e-14, moles_acid / (acid_vol + vol)) # Avoid 0 or negative
-                pH = -math.log10(conc_H)
-            else:
-                moles_base = (base_conc * vol - acid_conc * acid_vol) / 1000
-                conc_OH = max(1e-14, moles_base / (acid_vol + vol)) # Avoid 0 or negative
-                pOH = -math.log10(conc_OH)
-                pH = 14 - pOH
-            
-            pH_values.append(max(0, min(14, pH)))
-        
+        """pH curve for an acid (or base) analyte titrated with a strong titrant.
+
+        Solves the exact charge balance for every sampled volume at once, so
+        the cost depends on `samples`, not on the size of the volumes. Points
+        are densified around each equivalence point where the curve is steep.
+
+        Parameters (volumes in mL, concentrations in mol/L):
+            analyte:  'acid' (default, titrated with NaOH) or 'base' (with HCl)
+            acid_concentration, acid_volume, base_concentration
+            base_volume:  analyte volume when analyte == 'base'
+            ka / kb:  omit for a strong analyte; a number for a weak one, or a
+                      list of successive constants for polyprotic species
+            protons:  number of ionisable protons for a strong analyte
+            samples:  number of points on the curve (default 200)
+            max_volume: end of the titrant axis (default 2x last equivalence)
+        """
+        analyte = params.get('analyte', 'acid')
+        acid_conc = float(params.get('acid_concentration', 0.1))
+        base_conc = float(params.get('base_concentration', 0.1))
+        samples = min(int(params.get('samples', 200)), MAX_TITRATION_SAMPLES)
+
+        if analyte == 'base':
+            analyte_conc, titrant_conc = base_conc, acid_conc
+            analyte_vol = float(params.get('base_volume', 25.0))
+            constants = params.get('kb')
+        else:
+            analyte_conc, titrant_conc = acid_conc, base_conc
+            analyte_vol = float(params.get('acid_volume', 25.0))
+            constants = params.get('ka')
+
+        if min(analyte_conc, titrant_conc, analyte_vol) <= 0 or samples < 2:
+            return {"error": "Concentrations, volumes and samples must be positive"}
+
+        if constants is None:
+            log_k = None
+            n_protons = int(params.get('protons', 1))
+        else:
+            ks = np.atleast_1d(np.asarray(constants, dtype=np.float64))
+            if np.any(ks <= 0):
+                return {"error": "Dissociation constants must be positive"}
+            log_k = np.log10(ks)
+            n_protons = len(ks)
+        if not 1 <= n_protons <= MAX_PROTONS:
+            return {"error": f"Between 1 and {MAX_PROTONS} ionisable protons (or constants) are supported"}
+
+        equivalence_points = [
+            k * analyte_conc * analyte_vol / titrant_conc for k in range(1, n_protons + 1)
+        ]
+        max_volume = float(params.get('max_volume', 2 * equivalence_points[-1]))
+        if not max_volume > 0:
+            return {"error": "max_volume must be positive"}
+
+        volumes = _titration_volumes(max_volume, equivalence_points, samples)
+        total = analyte_vol + volumes
+        c_analyte = analyte_conc * analyte_vol / total
+        c_titrant = titrant_conc * volumes / total
+
+        # For a base analyte the same balance holds with OH- in place of H+
+        p_value = _solve_charge_balance(c_analyte, c_titrant, log_k, n_protons)
+        pH_values = 14 - p_value if analyte == 'base' else p_value
+
         return {
-            "volumes": volumes,
-            "pH_values": pH_values,
-            "equivalence_point": equivalence_point
+            "volumes": volumes.tolist(),
+            "pH_values": np.clip(pH_values, 0, 14).tolist(),
+            "equivalence_point": equivalence_points[0],
+            "equivalence_points": equivalence_points
         }
 
     def simulate_reaction(self, params):
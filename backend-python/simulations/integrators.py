@@ -0,0 +1,100 @@
+import numpy as np
+
+# ---------------------------------------------------------------------------
+# Vectorized ODE integrators shared by the REST engines and the 3D lab.
+#
+# States are NumPy arrays of shape (d, ...) where axis 0 holds the state
+# variables and any trailing axes hold independent cases, so one call can
+# integrate a whole class's worth of parameter sets at once.
+# ---------------------------------------------------------------------------
+
+# Dormand–Prince 5(4) tableau
+_C = np.array([0, 1/5, 3/10, 4/5, 8/9, 1, 1])
+_A = [
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+    [35/384, 0, 500/1113, 125/192, -2187/6784, 11/84],
+]
+# Difference between the 5th and embedded 4th order weights
+_E = np.array([71/57600, 0, -71/16695, 71/1920, -17253/339200, 22/525, -1/40])
+
+
+def _error_norm(err, y_old, y_new, rtol, atol):
+    """RMS error over the state axis, worst case over the batch."""
+    scale = atol + rtol * np.maximum(np.abs(y_old), np.abs(y_new))
+    per_case = np.sqrt(np.mean((err / scale) ** 2, axis=0))
+    return float(np.max(per_case))
+
+
+def dopri45(f, y0, t_eval, rtol=1e-6, atol=1e-9, max_steps=100000):
+    """Adaptive Dormand–Prince RK45 integration of dy/dt = f(t, y).
+
+    One step size is shared by every case in the batch (chosen by the
+    stiffest case). Results are sampled at t_eval using cubic Hermite
+    interpolation between accepted steps.
+
+    Returns an array of shape (len(t_eval),) + y0.shape. Raises ValueError
+    when max_steps is not enough to reach t_eval[-1] (a duration far longer
+    than the system's time scale), which callers report as a bad request.
+    """
+    t_eval = np.asarray(t_eval, dtype=np.float64)
+    y = np.array(y0, dtype=np.float64)
+    out = np.empty((len(t_eval),) + y.shape)
+    if len(t_eval) == 0:
+        return out
+
+    t = float(t_eval[0])
+    t_end = float(t_eval[-1])
+    out[t_eval <= t] = y
+    idx = int(np.searchsorted(t_eval, t, side='right'))
+
+    k1 = f(t, y)
+    h = max((t_end - t) * 1e-3, 1e-6)
+
+    for _ in range(max_steps):
+        if t >= t_end:
+            break
+        h = min(h, t_end - t)
+
+        k = [k1]
+        for i in range(1, 7):
+            yi = y + h * sum(a * kj for a, kj in zip(_A[i], k) if a)
+            k.append(f(t + _C[i] * h, yi))
+        y_new = yi  # stage 7 is evaluated at the 5th-order solution (FSAL)
+        err = h * sum(e * kj for e, kj in zip(_E, k) if e)
+        norm = _error_norm(err, y, y_new, rtol, atol)
+
+        if norm <= 1.0:
+            t_new = t + h
+            stop = int(np.searchsorted(t_eval, t_new, side='right'))
+            if stop > idx:
+                s = (t_eval[idx:stop] - t) / h
+                s = s.reshape((-1,) + (1,) * y.ndim)
+                s2, s3 = s * s, s * s * s
+                out[idx:stop] = ((2 * s3 - 3 * s2 + 1) * y
+                                 + (s3 - 2 * s2 + s) * h * k1
+                                 + (-2 * s3 + 3 * s2) * y_new
+                                 + (s3 - s2) * h * k[6])
+                idx = stop
+            t, y, k1 = t_new, y_new, k[6]
+
+        factor = 0.9 * norm ** -0.2 if norm > 0 else 5.0
+        h *= min(5.0, max(0.2, factor))
+    else:
+        raise ValueError("Simulation needs too many steps; shorten the duration")
+
+    out[idx:] = y
+    return out
+
+
+def rk4_step(f, t, y, h):
+    """One classical Runge–Kutta step of size h (fixed-step integration)."""
+    k1 = f(t, y)
+    k2 = f(t + h / 2, y + h / 2 * k1)
+    k3 = f(t + h / 2, y + h / 2 * k2)
+    k4 = f(t + h, y + h * k3)
+    return y + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
@@ -0,0 +1,93 @@
+import os
+from functools import lru_cache
+import numpy as np
+
+from simulations.integrators import dopri45
+
+# ---------------------------------------------------------------------------
+# Full nonlinear (optionally damped) pendulum:
+#     theta'' = -(g / L) * sin(theta) - damping * theta'
+# Used by PhysicsEngine (REST) and by ursa_lab's 3D pendulum.
+# ---------------------------------------------------------------------------
+
+G = 9.81
+PENDULUM_CACHE_SIZE = int(os.getenv('PENDULUM_CACHE_SIZE', 256))
+# Longer trajectories are recomputed rather than memoized, which bounds the
+# cache at about PENDULUM_CACHE_SIZE * 3 * 8 * PENDULUM_CACHE_MAX_SAMPLES bytes
+# (~30 MB at the defaults)
+PENDULUM_CACHE_MAX_SAMPLES = int(os.getenv('PENDULUM_CACHE_MAX_SAMPLES', 5000))
+
+
+def _rhs(g_over_l, damping):
+    def f(t, y):
+        theta, omega = y
+        return np.stack([omega, -g_over_l * np.sin(theta) - damping * omega])
+    return f
+
+
+def exact_period(length, angle):
+    """Undamped large-amplitude period via the arithmetic–geometric mean:
+    T = 2π√(L/g) / AGM(1, cos(θ0/2)). angle is in radians."""
+    a = np.ones_like(np.asarray(angle, dtype=np.float64))
+    b = np.cos(np.asarray(angle, dtype=np.float64) / 2)
+    for _ in range(8):  # AGM converges quadratically
+        a, b = (a + b) / 2, np.sqrt(a * b)
+    return 2 * np.pi * np.sqrt(np.asarray(length) / G) / a
+
+
+def solve_pendulum_batch(lengths, angles, damping=0.0, duration=10.0, samples=1000):
+    """Integrate many pendulums at once.
+
+    lengths (m) and angles (degrees) are equally sized 1-D arrays.
+    Returns (t, theta, omega) with theta/omega of shape (cases, samples).
+    """
+    lengths = np.atleast_1d(np.asarray(lengths, dtype=np.float64))
+    theta_0 = np.radians(np.atleast_1d(np.asarray(angles, dtype=np.float64)))
+    t = np.linspace(0, duration, samples)
+
+    y0 = np.stack([theta_0, np.zeros_like(theta_0)])
+    sol = dopri45(_rhs(G / lengths, damping), y0, t)  # (samples, 2, cases)
+    return t, sol[:, 0, :].T, sol[:, 1, :].T
+
+
+def solve_pendulum(length, angle, damping=0.0, duration=10.0, samples=1000):
+    """Single-pendulum trajectory, memoized on its full parameter tuple
+    when samples <= PENDULUM_CACHE_MAX_SAMPLES.
+
+    Returned arrays may be shared between callers and are therefore read-only.
+    """
+    if samples > PENDULUM_CACHE_MAX_SAMPLES:
+        return _solve_pendulum(length, angle, damping, duration, samples)
+    return _solve_pendulum_cached(length, angle, damping, duration, samples)
+
+
+def _solve_pendulum(length, angle, damping, duration, samples):
+    t, theta, omega = solve_pendulum_batch([length], [angle], damping, duration, samples)
+    theta, omega = theta[0], omega[0]
+    for arr in (t, theta, omega):
+        arr.flags.writeable = False
+    return t, theta, omega
+
+
+_solve_pendulum_cached = lru_cache(maxsize=PENDULUM_CACHE_SIZE)(_solve_pendulum)
+
+
+def step_pendulum(theta, omega, dt, length, damping=0.0, g=G, substeps=4):
+    """Advance a pendulum by dt with semi-implicit (symplectic) Euler.
+
+    Cheap enough for per-frame updates and, unlike explicit Euler, does not
+    pump energy into the swing at large frame times. Works on scalars or
+    arrays of pendulums.
+    """
+    h = dt / substeps
+    for _ in range(substeps):
+        omega = omega + h * (-(g / length) * np.sin(theta) - damping * omega)
+        theta = theta + h * omega
+    return theta, omega
+
+
+def cache_info():
+    info = _solve_pendulum_cached.cache_info()
+    return {"hits": info.hits, "misses": info.misses,
+            "size": info.currsize, "maxsize": info.maxsize,
+            "max_samples": PENDULUM_CACHE_MAX_SAMPLES}
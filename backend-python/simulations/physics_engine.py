@@ -1,6 +1,30 @@
 import numpy as np
 import math
 
+from simulations.pendulum_solver import solve_pendulum, solve_pendulum_batch, exact_period
+
+G = 9.81  # gravity
+
+# Upper bounds for a single batch request (cases x samples for pendulums)
+MAX_BATCH_CASES = 10000
+MAX_BATCH_VALUES = 5000000
+
+
+def _sweep_grid(params, names, defaults):
+    """Expand scalar-or-list parameters into flat, equally sized case arrays.
+
+    Every list-valued parameter becomes an axis of a Cartesian grid, so
+    {"length": [0.5, 1, 2], "angle": [10, 20]} yields 6 cases.
+    """
+    axes = [np.atleast_1d(np.asarray(params.get(n, d), dtype=np.float64)).ravel()
+            for n, d in zip(names, defaults)]
+    shape = tuple(len(a) for a in axes)
+    if int(np.prod(shape)) > MAX_BATCH_CASES:
+        raise ValueError("Batch too large")
+    mesh = np.meshgrid(*axes, indexing='ij')
+    return {n: m.ravel() for n, m in zip(names, mesh)}, shape
+
+
 class PhysicsEngine:
     def simulate(self, experiment_type, parameters):
         if experiment_type == 'pendulum':
@@ -12,30 +36,87 @@ class PhysicsEngine:
         else:
             return {"error": "Unknown experiment type"}
 
+    def simulate_batch(self, experiment_type, parameters):
+        """Evaluate a whole parameter grid in one vectorized pass.
+
+        Returns NumPy arrays (not lists); callers choose the wire encoding.
+        """
+        try:
+            if experiment_type == 'pendulum':
+                return self.sweep_pendulum(parameters)
+            elif experiment_type == 'circuit':
+                return self.sweep_circuit(parameters)
+            elif experiment_type == 'optics':
+                return self.sweep_optics(parameters)
+            else:
+                return {"error": "Unknown experiment type"}
+        except (TypeError, ValueError) as e:
+            return {"error": str(e)}
+
+    # ------------------------------------------------------------------
+    # Pendulum
+    # ------------------------------------------------------------------
     def simulate_pendulum(self, params):
-        g = 9.81  # gravity
-        L = params.get('length', 1.0)
-        theta_0 = params.get('angle', 30) * math.pi / 180
-        t = np.linspace(0, 10, 1000)
-        
-        omega = math.sqrt(g / L)
-        theta = theta_0 * np.cos(omega * t)
-        
+        L = float(params.get('length', 1.0))
+        angle = float(params.get('angle', 30))
+        damping = float(params.get('damping', 0.0))
+        duration = float(params.get('duration', 10))
+        samples = int(params.get('samples', 1000))
+        if L <= 0:
+            return {"error": "Length must be positive"}
+        if samples > MAX_BATCH_VALUES:
+            return {"error": "Too many samples"}
+
+        # Full nonlinear solution, memoized on the parameter tuple
+        try:
+            t, theta, _ = solve_pendulum(L, angle, damping, duration, samples)
+        except ValueError as e:
+            return {"error": str(e)}
         x = L * np.sin(theta)
         y = -L * np.cos(theta)
-        
+
         return {
             "time": t.tolist(),
             "angle": theta.tolist(),
             "position": {"x": x.tolist(), "y": y.tolist()},
-            "period": 2 * math.pi * math.sqrt(L / g)
+            "period": float(exact_period(L, math.radians(angle))),
+            "small_angle_period": 2 * math.pi * math.sqrt(L / G)
         }
 
+    def sweep_pendulum(self, params):
+        grid, shape = _sweep_grid(params, ['length', 'angle'], [1.0, 30])
+        samples = int(params.get('samples', 1000))
+        duration = float(params.get('duration', 10))
+        damping = float(params.get('damping', 0.0))
+        cases = grid['length'].size
+
+        if cases * samples > MAX_BATCH_VALUES:
+            return {"error": "Batch too large"}
+        if np.any(grid['length'] <= 0):
+            return {"error": "Length must be positive"}
+
+        t, theta, _ = solve_pendulum_batch(grid['length'], grid['angle'], damping, duration, samples)
+        L = grid['length'][:, None]
+
+        return {
+            "grid_shape": list(shape),
+            "cases": cases,
+            "length": grid['length'],
+            "angle_0": grid['angle'],
+            "time": t,
+            "angle": theta,
+            "position": {"x": L * np.sin(theta), "y": -L * np.cos(theta)},
+            "period": exact_period(grid['length'], np.radians(grid['angle']))
+        }
+
+    # ------------------------------------------------------------------
+    # Circuit (Ohm's law)
+    # ------------------------------------------------------------------
     def simulate_circuit(self, params):
         V = params.get('voltage', 12)
         R = params.get('resistance', 10)
         I = V / R
-        
+
         return {
             "voltage": V,
             "current": I,
@@ -43,20 +124,57 @@ class PhysicsEngine:
             "power": V * I
         }
 
+    def sweep_circuit(self, params):
+        grid, shape = _sweep_grid(params, ['voltage', 'resistance'], [12, 10])
+
+        V, R = grid['voltage'], grid['resistance']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            I = np.where(R != 0, V / R, np.nan)
+
+        return {
+            "grid_shape": list(shape),
+            "cases": V.size,
+            "voltage": V,
+            "resistance": R,
+            "current": I,
+            "power": V * I
+        }
+
+    # ------------------------------------------------------------------
+    # Optics (thin lens)
+    # ------------------------------------------------------------------
     def simulate_optics(self, params):
         # Implement lens/mirror equations
         focal_length = params.get('focal_length', 10)
         object_distance = params.get('object_distance', 15)
-        
+
         if object_distance == focal_length:
             return {"error": "Object at focal length"}
-        
+
         image_distance = 1 / (1/focal_length - 1/object_distance)
         magnification = -image_distance / object_distance
-        
+
         return {
             "focal_length": focal_length,
             "object_distance": object_distance,
             "image_distance": image_distance,
             "magnification": magnification
-        }
\ No newline at end of file
+        }
+
+    def sweep_optics(self, params):
+        grid, shape = _sweep_grid(params, ['focal_length', 'object_distance'], [10, 15])
+
+        f, u = grid['focal_length'], grid['object_distance']
+        # Object at the focal point has no image: reported as NaN
+        with np.errstate(divide='ignore', invalid='ignore'):
+            v = 1 / (1 / f - 1 / u)
+        v = np.where(np.isfinite(v) & (f != u), v, np.nan)
+
+        return {
+            "grid_shape": list(shape),
+            "cases": f.size,
+            "focal_length": f,
+            "object_distance": u,
+            "image_distance": v,
+            "magnification": -v / u
+        }
@@ -0,0 +1,189 @@
+import glob
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+def _canonical(value):
+    """Normalise parameters so equivalent requests hash the same
+    (1 == 1.0, key order irrelevant, tuples == lists)."""
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return str(value)
+
+
+def engine_version() -> str:
+    """Digest of the simulation engine sources, so a deploy that changes any
+    engine stops replaying results computed by the old code."""
+    digest = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), '*.py'))):
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+class SimulationCache:
+    """Cache of serialized simulation responses.
+
+    Entries live in an in-process LRU bounded by total body bytes. When a
+    disk directory is configured, every entry is also written there, so a
+    restarted (or pre-warmed) server can serve results without recomputing.
+    Keys include version, so entries from other engine code are never served.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, disk_dir: Optional[str] = None,
+                 version: str = ''):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.version = version
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+        self._entries: "OrderedDict[str, Tuple[bytes, str]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._evictions = 0
+        self._per_experiment: Dict[str, Dict[str, int]] = {}
+
+    def key(self, engine: str, experiment: str, parameters) -> str:
+        canonical = json.dumps([self.version, engine, experiment, _canonical(parameters)],
+                               sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Lookup / store
+    # ------------------------------------------------------------------
+    def get(self, key: str, label: str) -> Optional[Tuple[bytes, str]]:
+        """Return (body, etag) or None, counting a hit for label. Misses are
+        counted by put(), once the engine has accepted the experiment, so
+        arbitrary client strings never become counter labels."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._count(label, "hits")
+                return entry
+
+        entry = self._read_disk(key)
+        with self._lock:
+            if entry is None:
+                return None
+            self._count(label, "hits")
+            self._count(label, "disk_hits")
+            self._insert(key, entry)
+        return entry
+
+    def put(self, key: str, body: bytes, label: Optional[str] = None) -> Tuple[bytes, str]:
+        """Store a computed result; label counts the miss that produced it."""
+        etag = hashlib.sha1(body).hexdigest()
+        entry = (body, etag)
+        with self._lock:
+            if label is not None:
+                self._count(label, "misses")
+            self._insert(key, entry)
+        self._write_disk(key, body)
+        return entry
+
+    def warm(self, engine_name: str, engine, experiment: str, parameters) -> str:
+        """Compute and store one result ahead of time. Returns its key.
+        Error results are reported, not stored."""
+        key = self.key(engine_name, experiment, parameters)
+        with self._lock:
+            cached = key in self._entries
+        if not cached and self._read_disk(key) is None:
+            result = engine.simulate(experiment, parameters)
+            if "error" in result:
+                print(f"Simulation cache: not storing {engine_name}/{experiment}: {result['error']}")
+                return key
+            self.put(key, json.dumps(result, separators=(',', ':')).encode('utf-8'))
+        return key
+
+    # ------------------------------------------------------------------
+    # Internals (callers hold self._lock)
+    # ------------------------------------------------------------------
+    def _insert(self, key, entry):
+        size = len(entry[0])
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old[0])
+        self._entries[key] = entry
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self._evictions += 1
+
+    def _count(self, label, field):
+        counters = self._per_experiment.setdefault(label, {"hits": 0, "misses": 0, "disk_hits": 0})
+        counters[field] += 1
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), 'rb') as f:
+                body = f.read()
+        except OSError:
+            return None
+        return body, hashlib.sha1(body).hexdigest()
+
+    def _write_disk(self, key, body):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, 'wb') as f:
+                f.write(body)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Simulation cache disk write failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+    def stats(self) -> Dict:
+        with self._lock:
+            per_experiment = {k: dict(v) for k, v in self._per_experiment.items()}
+            summary = {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self._evictions,
+                "disk_dir": self.disk_dir,
+                "version": self.version,
+            }
+        for counters in per_experiment.values():
+            total = counters["hits"] + counters["misses"]
+            counters["hit_rate"] = round(counters["hits"] / total, 3) if total else 0.0
+        summary["experiments"] = per_experiment
+        return summary
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+def cache_from_env() -> SimulationCache:
+    """Build the cache from SIM_CACHE_MAX_BYTES / SIM_CACHE_DIR /
+    SIM_CACHE_VERSION (default: a digest of the engine sources)."""
+    return SimulationCache(
+        max_bytes=int(os.getenv('SIM_CACHE_MAX_BYTES', 64 * 1024 * 1024)),
+        disk_dir=os.getenv('SIM_CACHE_DIR') or None,
+        version=os.getenv('SIM_CACHE_VERSION') or engine_version(),
+    )
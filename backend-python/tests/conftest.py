@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Tests import the backend packages (ai, simulations, ursa_lab) the way
+# app.py does, from the backend-python directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
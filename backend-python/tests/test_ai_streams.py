@@ -0,0 +1,130 @@
+import json
+import os
+
+# Keep the app from loading models in the background while it is imported
+os.environ.setdefault('AI_WARMUP', '0')
+
+import pytest
+
+import app as app_module
+
+
+class FakeLLM:
+    available = True
+
+    def __init__(self, pieces):
+        self.pieces = pieces
+
+    def stream(self, messages, **kwargs):
+        yield from self.pieces
+
+
+def _events(response):
+    events = []
+    for block in response.get_data(as_text=True).strip().split("\n\n"):
+        event, data = block.split("\n")
+        events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # No response cache, so every request reaches the (fake) model
+    monkeypatch.setattr(app_module.ai_tutor, 'cache', None)
+    monkeypatch.setattr(app_module.ecz_gen, 'cache', None)
+    monkeypatch.setattr(app_module.detector_instance, 'detect', lambda text: 'english')
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def translate(monkeypatch):
+    calls = []
+
+    def fake(text, language):
+        calls.append((text, language))
+        return f"[{language}] {text}"
+
+    monkeypatch.setattr(app_module.multilingual_engine, 'translate', fake)
+    return calls
+
+
+# ---------------------------------------------------------------------------
+# /api/ai/tutor/stream
+# ---------------------------------------------------------------------------
+def test_tutor_streams_tokens_then_done(client, monkeypatch):
+    monkeypatch.setattr(app_module.ai_tutor, 'client', FakeLLM(["Plants ", "make ", "sugar."]))
+    response = client.post('/api/ai/tutor/stream', json={"question": "What is photosynthesis?"})
+    assert response.mimetype == 'text/event-stream'
+    assert response.headers['Cache-Control'] == 'no-cache'
+
+    events = _events(response)
+    assert events[:-1] == [("token", {"text": "Plants "}), ("token", {"text": "make "}),
+                           ("token", {"text": "sugar."})]
+    name, done = events[-1]
+    assert name == "done"
+    assert done["response"] == "Plants make sugar."
+    assert done["detected_language"] == "english"
+    assert done["usage"]["source"] == "openai"
+
+
+def test_tutor_offline_answer_is_one_token(client, monkeypatch):
+    offline = FakeLLM([])
+    offline.available = False
+    monkeypatch.setattr(app_module.ai_tutor, 'client', offline)
+    events = _events(client.post('/api/ai/tutor/stream', json={"question": "pendulum period"}))
+    assert [name for name, _ in events] == ["token", "done"]
+    assert events[1][1]["response"] == events[0][1]["text"].strip()
+    assert events[1][1]["usage"]["source"] == "offline"
+
+
+def test_tutor_done_is_translated(client, monkeypatch, translate):
+    monkeypatch.setattr(app_module.ai_tutor, 'client', FakeLLM(["Water ", "boils."]))
+    monkeypatch.setattr(app_module.detector_instance, 'detect', lambda text: 'bemba')
+    events = _events(client.post('/api/ai/tutor/stream', json={"question": "Amenshi yabila shani?"}))
+    # Tokens go out as generated; only the final answer is translated
+    assert events[0] == ("token", {"text": "Water "})
+    assert events[-1][1]["response"] == "[bemba] Water boils."
+    assert events[-1][1]["detected_language"] == "bemba"
+    assert translate == [("Water boils.", "bemba")]
+
+
+def test_tutor_stream_without_json_body(client, monkeypatch):
+    monkeypatch.setattr(app_module.ai_tutor, 'client', FakeLLM(["Ask ", "me."]))
+    response = client.post('/api/ai/tutor/stream')
+    assert response.status_code == 200
+    assert _events(response)[-1][0] == "done"
+
+
+# ---------------------------------------------------------------------------
+# /api/ai/generate-content/stream
+# ---------------------------------------------------------------------------
+def test_content_streams_tokens_then_done(client, monkeypatch):
+    monkeypatch.setattr(app_module.ecz_gen, 'client', FakeLLM(["1. ", "Define ", "force."]))
+    events = _events(client.post('/api/ai/generate-content/stream',
+                                 json={"type": "exam_questions", "topic": "forces"}))
+    assert [name for name, _ in events] == ["token"] * 3 + ["done"]
+    assert events[-1][1] == {"success": True, "content": "1. Define force."}
+
+
+def test_content_demo_is_one_token(client, monkeypatch):
+    monkeypatch.setattr(app_module.ecz_gen, 'client', None)
+    events = _events(client.post('/api/ai/generate-content/stream',
+                                 json={"type": "worksheet", "topic": "osmosis"}))
+    assert [name for name, _ in events] == ["token", "done"]
+    assert "DEMO CONTENT: WORKSHEET" in events[0][1]["text"]
+    assert events[1][1]["content"] == events[0][1]["text"].strip()
+
+
+def test_content_done_is_translated(client, monkeypatch, translate):
+    monkeypatch.setattr(app_module.ecz_gen, 'client', FakeLLM(["Light ", "bends."]))
+    events = _events(client.post('/api/ai/generate-content/stream',
+                                 json={"topic": "refraction", "language": "nyanja"}))
+    assert events[-1][1]["content"] == "[nyanja] Light bends."
+    assert translate == [("Light bends.", "nyanja")]
+
+
+def test_content_stream_without_json_body(client, monkeypatch):
+    monkeypatch.setattr(app_module.ecz_gen, 'client', None)
+    response = client.post('/api/ai/generate-content/stream')
+    assert response.status_code == 200
+    assert "general science" in _events(response)[-1][1]["content"]
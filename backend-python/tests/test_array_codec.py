@@ -0,0 +1,38 @@
+import json
+import struct
+
+import numpy as np
+
+from simulations.array_codec import ALIGNMENT, MAGIC, encode_result, decode_array, pack_binary, unpack_binary
+
+
+def _header(payload):
+    (length,) = struct.unpack('<I', payload[4:8])
+    return length, json.loads(payload[8:8 + length])
+
+
+def test_binary_round_trip():
+    result = {"t": np.linspace(0, 1, 7), "nested": {"x": np.ones((3, 5))}, "steps": [np.zeros(1)], "n": np.int64(4)}
+    decoded = unpack_binary(pack_binary(result))
+    np.testing.assert_allclose(decoded["t"], result["t"], rtol=1e-6)
+    assert decoded["nested"]["x"].shape == (3, 5)
+    assert decoded["steps"][0].shape == (1,)
+    assert decoded["n"] == 4
+
+
+def test_binary_buffers_are_aligned():
+    # Odd sizes everywhere: 3 floats, 5 floats, a header of arbitrary length
+    payload = pack_binary({"a": np.arange(3.0), "label": "abc", "b": np.arange(5.0)})
+    length, header = _header(payload)
+    body = len(MAGIC) + 4 + length
+    assert body % ALIGNMENT == 0
+    for ref in (header["a"], header["b"]):
+        assert (body + ref["offset"]) % ALIGNMENT == 0
+        view = np.frombuffer(payload, dtype='<f4', count=ref["length"] // 4, offset=body + ref["offset"])
+        assert view.size == ref["shape"][0]
+
+
+def test_base64_round_trip():
+    encoded = encode_result({"x": np.arange(4.0), "meta": {"ok": True}})
+    assert encoded["meta"] == {"ok": True}
+    np.testing.assert_array_equal(decode_array(encoded["x"]), np.arange(4.0, dtype=np.float32))
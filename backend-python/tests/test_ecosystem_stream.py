@@ -0,0 +1,41 @@
+import json
+
+from simulations.biology_engine import MAX_STREAM_CHUNK, BiologyEngine
+
+
+def test_chunk_size_is_clamped():
+    records = list(BiologyEngine().stream_ecosystem({"time_steps": 2 * MAX_STREAM_CHUNK + 10}, chunk_size=10 ** 12))
+    chunks = [r for r in records if r["type"] == "chunk"]
+    assert max(len(r["time"]) for r in chunks) == MAX_STREAM_CHUNK
+    assert records[-1]["type"] == "done"
+
+
+def test_streamed_chunks_match_buffered_run():
+    engine = BiologyEngine()
+    buffered = engine.simulate('ecosystem', {"time_steps": 300})
+    records = list(engine.stream_ecosystem({"time_steps": 300}, chunk_size=0))
+    rabbits = [v for r in records if r["type"] == "chunk" for v in r["populations"]["rabbit"]]
+    assert rabbits == buffered["populations"]["rabbit"]
+
+
+def test_non_integer_chunk_size_is_an_error():
+    assert list(BiologyEngine().stream_ecosystem({}, chunk_size="lots")) == [{"error": "chunk_size must be an integer"}]
+
+
+def test_bad_step_settings_are_errors_not_exceptions():
+    engine = BiologyEngine()
+    for params in ({"time_steps": "abc"}, {"dt": "fast"}, {"record_every": None}):
+        assert "error" in next(engine.stream_ecosystem(params))
+        assert "error" in engine.simulate('ecosystem', params)
+    assert engine.simulate('ecosystem', {"dt": float('nan')}) == {"error": "dt must be a positive number"}
+
+
+def test_divergent_web_ends_with_an_error_record():
+    params = {"growth_rates": [50, 50, 50], "time_steps": 300}
+    records = list(BiologyEngine().stream_ecosystem(params, chunk_size=20))
+    assert records[-1]["type"] == "error" and "diverged" in records[-1]["error"]
+    assert all(r["type"] in ("header", "chunk") for r in records[:-1])
+    # Every streamed value is finite, so each record is valid JSON
+    for record in records:
+        json.dumps(record, allow_nan=False)
+    assert "diverged" in BiologyEngine().simulate('ecosystem', params)["error"]
@@ -0,0 +1,93 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from ai.embedding_index import EmbeddingIndex, concept_text, fingerprint, normalize
+
+
+class FakeModel:
+    """Encodes a text as the counts of a few marker words."""
+
+    WORDS = ("pendulum", "acid", "cell", "circuit")
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, texts, batch_size=None):
+        self.calls += 1
+        return np.array([[text.lower().count(w) for w in self.WORDS] for text in texts], dtype=np.float32)
+
+
+def _write(path, concepts):
+    with open(path, 'w') as f:
+        json.dump(concepts, f)
+    return concepts
+
+
+CONCEPTS = [
+    {"concept": "Pendulum", "description": "A pendulum swings"},
+    {"concept": "Acid", "description": "An acid acid has low pH"},
+    {"concept": "Cell", "description": "The cell is the unit of life"},
+    {"concept": "Circuit", "description": "A circuit with a pendulum clock"},
+]
+
+
+@pytest.fixture
+def concepts_path(tmp_path):
+    path = str(tmp_path / "concepts.json")
+    _write(path, CONCEPTS)
+    return path
+
+
+def test_normalize_handles_zero_rows():
+    vectors = normalize([[3, 4], [0, 0]])
+    assert np.allclose(vectors, [[0.6, 0.8], [0, 0]])
+
+
+def test_index_is_built_once_and_mapped(tmp_path, concepts_path):
+    model, cache = FakeModel(), str(tmp_path / "cache")
+    index = EmbeddingIndex.load_or_build(concepts_path, CONCEPTS, model, "fake", cache_dir=cache)
+    again = EmbeddingIndex.load_or_build(concepts_path, CONCEPTS, model, "fake", cache_dir=cache)
+    assert model.calls == 1
+    assert len(again) == 4 and isinstance(again.embeddings, np.memmap)
+    assert np.allclose(np.linalg.norm(index.embeddings, axis=1), 1.0)
+
+
+def test_index_rebuilds_when_concepts_or_model_change(tmp_path, concepts_path):
+    model, cache = FakeModel(), str(tmp_path / "cache")
+    EmbeddingIndex.load_or_build(concepts_path, CONCEPTS, model, "fake", cache_dir=cache)
+    old_key = fingerprint(concepts_path, "fake")
+
+    edited = _write(concepts_path, CONCEPTS + [{"concept": "Acid rain", "description": "acid"}])
+    index = EmbeddingIndex.load_or_build(concepts_path, edited, model, "fake", cache_dir=cache)
+    assert model.calls == 2 and len(index) == 5
+    # The stale file (and its metadata) are removed
+    assert not any(old_key in name for name in os.listdir(cache))
+
+    assert fingerprint(concepts_path, "other") != fingerprint(concepts_path, "fake")
+    EmbeddingIndex.load_or_build(concepts_path, edited, model, "other", cache_dir=cache)
+    assert model.calls == 3
+
+
+def test_search_returns_top_k_best_first():
+    model = FakeModel()
+    index = EmbeddingIndex(normalize(model.encode([concept_text(c) for c in CONCEPTS])))
+    query = model.encode(["pendulum"])[0]
+    results = index.search(query, k=2)
+    assert [row for row, _ in results] == [0, 3]
+    assert results[0][1] == pytest.approx(1.0)
+    assert results[0][1] > results[1][1]
+    # k larger than the index, and the min_score filter
+    assert len(index.search(query, k=10)) == 4
+    assert [row for row, _ in index.search(query, k=10, min_score=0.4)] == [0, 3]
+    assert EmbeddingIndex(np.zeros((0, 4), dtype=np.float32)).search(query) == []
+
+
+def test_argpartition_agrees_with_a_full_sort():
+    rng = np.random.default_rng(0)
+    index = EmbeddingIndex(normalize(rng.normal(size=(500, 16))))
+    query = rng.normal(size=16)
+    expected = np.argsort(-(index.embeddings @ normalize(query)))[:7]
+    assert [row for row, _ in index.search(query, k=7)] == expected.tolist()
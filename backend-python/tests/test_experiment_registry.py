@@ -0,0 +1,34 @@
+import os
+import sys
+
+import pytest
+
+URSA_LAB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ursa_lab')
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    # The way ursa_lab/main.py, headless.py and worker.py see the package
+    monkeypatch.syspath_prepend(URSA_LAB)
+    from experiments import registry
+    return registry
+
+
+def test_package_is_a_regular_package(registry):
+    import experiments
+    assert experiments.__file__.endswith('__init__.py')
+    assert registry.__package__ == 'experiments'
+
+
+def test_every_registered_module_exists(registry):
+    for experiment_type, target in registry.EXPERIMENTS.items():
+        module_name, class_name = target.split(':')
+        path = os.path.join(URSA_LAB, 'experiments', f'{module_name}.py')
+        assert os.path.exists(path), experiment_type
+        with open(path) as f:
+            assert f"class {class_name}" in f.read(), experiment_type
+
+
+def test_unknown_experiment(registry):
+    assert registry.create_experiment('no_such_experiment') is None
+    assert 'pendulum' in registry.available_experiments()
@@ -0,0 +1,114 @@
+import json
+from datetime import datetime, timedelta
+
+from ai import feature_store
+from ai.feature_store import FEATURE_COLUMNS, FeatureStore, compute_features, empty_features
+
+
+def _progress(user_id, score, steps, time_spent, days_ago, subject):
+    return {"user_id": user_id, "score": score, "completed_steps": steps, "time_spent": time_spent,
+            "last_accessed": datetime(2026, 1, 31) - timedelta(days=days_ago), "subject": subject}
+
+
+PROGRESS = [
+    _progress(1, 40, 2, 100, 3, "physics"),
+    _progress(1, 60, 4, 300, 2, "physics"),
+    _progress(1, 80, 6, 500, 1, "chemistry"),
+    _progress(2, 90, 5, 200, 0, "biology"),
+]
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.rows = []
+
+    def execute(self, sql, params=()):
+        if "FROM student_features" in sql:
+            self.rows = [dict(self.db.features[u]) for u in params if u in self.db.features]
+        elif "FROM progress" in sql:
+            self.db.progress_reads.append(list(params))
+            self.rows = [row for row in self.db.progress if row["user_id"] in params]
+
+    def executemany(self, sql, rows):
+        columns = ("user_id",) + FEATURE_COLUMNS
+        for values in rows:
+            row = dict(zip(columns, values[:-1]), dirty=0, computed_at=values[-1])
+            self.db.features[row["user_id"]] = row
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+class FakeDB:
+    """student_features plus what the migration 010 triggers do on progress writes."""
+
+    def __init__(self, progress):
+        self.progress = list(progress)
+        self.features = {}
+        self.progress_reads = []
+
+    def cursor(self, dictionary=False):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def add_progress(self, row):
+        self.progress.append(row)
+        self.features.setdefault(row["user_id"], {"user_id": row["user_id"]})["dirty"] = 1
+
+
+def test_compute_features():
+    features = compute_features(PROGRESS)
+    first = features[1]
+    assert first["attempts"] == 3 and first["score_mean"] == 60.0
+    assert first["steps_median"] == 4.0 and first["time_p50"] == 300.0
+    assert first["subject_stats"]["physics"] == {"attempts": 2, "score_mean": 50.0,
+                                                  "last_at": "2026-01-29T00:00:00"}
+    assert first["last_activity_at"] == datetime(2026, 1, 30)
+    assert set(first) == set(FEATURE_COLUMNS)
+    assert compute_features([]) == {}
+
+
+def test_recent_mean_uses_the_newest_attempts(monkeypatch):
+    monkeypatch.setattr(feature_store, "RECENT_ATTEMPTS", 2)
+    assert compute_features(PROGRESS)[1]["score_mean_recent"] == 70.0
+
+
+def test_clean_rows_are_served_from_the_store():
+    db = FakeDB(PROGRESS)
+    store = FeatureStore(db)
+    first = store.get_many([1, 2, 1])
+    assert db.progress_reads == [[1, 2]]
+    assert store.get_many([1, 2]) == first
+    assert len(db.progress_reads) == 1
+
+
+def test_dirty_rows_are_recomputed_alone():
+    db = FakeDB(PROGRESS)
+    store = FeatureStore(db)
+    store.get_many([1, 2])
+    db.add_progress(_progress(2, 10, 1, 50, 0, "biology"))
+    features = store.get_many([1, 2])
+    assert db.progress_reads[-1] == [2]
+    assert features[2]["attempts"] == 2 and features[2]["score_mean"] == 50.0
+    assert db.features[2]["dirty"] == 0
+
+
+def test_old_rows_are_recomputed():
+    db = FakeDB(PROGRESS)
+    FeatureStore(db).get(1)
+    db.features[1]["computed_at"] = datetime.now() - timedelta(hours=feature_store.MAX_AGE_HOURS + 1)
+    FeatureStore(db).get(1)
+    assert db.progress_reads == [[1], [1]]
+
+
+def test_students_without_progress_get_empty_rows():
+    db = FakeDB(PROGRESS)
+    assert FeatureStore(db).get(99) == empty_features()
+    assert db.features[99]["attempts"] == 0
+    assert json.loads(db.features[99]["subject_stats"]) == {}
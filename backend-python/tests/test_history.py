@@ -0,0 +1,121 @@
+import threading
+
+from ai import history
+from ai.history import (HISTORY_TARGET_TOKENS, SUMMARY_PREFIX, compact, context_prefix, fold, needs_compaction,
+                        new_summary, split_for_compaction, split_summary, user_message)
+from ai.session_store import MemorySessionStore
+from ai.tokens import count_message_tokens
+from ai.tutor import AITutor
+
+
+def _history(pairs, words=40):
+    prefix = context_prefix('physics', 'form 2')
+    return [m for i in range(pairs) for m in (
+        {"role": "user", "content": (prefix if i == 0 else '') + f"question {i} " + "word " * words},
+        {"role": "assistant", "content": f"answer {i} " + "word " * words})]
+
+
+def _summarize(summary, turns):
+    return f"covered {len(turns) // 2} questions"
+
+
+def test_prefix_is_only_sent_when_it_changes():
+    past = _history(1)
+    assert user_message("why?", 'physics', 'form 2', past) == "why?"
+    assert user_message("why?", 'chemistry', 'form 2', past).startswith("[Subject: chemistry")
+
+
+def test_compaction_goes_below_the_low_water_mark():
+    long = _history(12)
+    assert needs_compaction(long)
+    compacted = compact(long, _summarize)
+    assert compacted[0]["content"].startswith(SUMMARY_PREFIX)
+    assert count_message_tokens(compacted) <= HISTORY_TARGET_TOKENS
+    assert not needs_compaction(compacted + _history(1))
+    # the newest turn always survives verbatim
+    assert compacted[-2:] == long[-2:]
+
+
+def test_compaction_keeps_fewer_pairs_when_they_are_large():
+    summary, old, recent = split_for_compaction(_history(8, words=150))
+    assert summary is None
+    assert len(recent) == 2 and len(old) == 14
+
+
+def test_kept_question_regains_its_context_prefix():
+    compacted = compact(_history(12), _summarize)
+    _, turns = split_summary(compacted)
+    assert turns[0]["content"].startswith("[Subject: physics | Level: form 2]\n")
+
+
+def test_failed_summary_falls_back_to_extractive():
+    def broken(summary, turns):
+        raise RuntimeError("offline")
+    text = new_summary(None, _history(2), broken)
+    assert text.startswith("Student asked about: ") and "question 1" in text
+
+
+def test_fold_keeps_turns_appended_meanwhile():
+    before = _history(12)
+    summary, old, _ = split_for_compaction(before)
+    after = before + _history(1, words=3)
+    folded = fold(after, summary, old, "summary")
+    assert folded[-2:] == after[-2:]
+    assert len(folded) == 1 + len(after) - len(old)
+    # Already compacted by someone else: left alone
+    assert fold(folded, summary, old, "again") == folded
+
+
+def test_low_water_default():
+    assert history.HISTORY_TARGET_TOKENS < history.HISTORY_TOKEN_BUDGET
+
+
+class _SlowClient:
+    """A model whose summary call lets another worker append a turn."""
+
+    available = True
+
+    def __init__(self, on_summarize):
+        self.on_summarize = on_summarize
+
+    def chat(self, messages, **kwargs):
+        self.on_summarize()
+        return "earlier questions about pendulums"
+
+
+def test_tutor_compaction_does_not_lose_concurrent_turns():
+    store = MemorySessionStore(max_messages=100, max_tokens=100_000)
+    long = _history(12)
+    store.save("s1", long[:-2])
+    concurrent = {"role": "user", "content": "from another worker"}, {"role": "assistant", "content": "ok"}
+    tutor = AITutor(client=_SlowClient(lambda: store.append("s1", *concurrent)), cache=None, sessions=store)
+
+    messages = [{"role": "system", "content": "prompt"}] + long[:-2] + [long[-2]]
+    tutor._remember("s1", messages, long[-1]["content"]).result(timeout=5)
+
+    stored = store.get("s1")
+    assert stored[0]["content"] == SUMMARY_PREFIX + "earlier questions about pendulums"
+    assert stored[-2:] == list(concurrent)
+    assert stored[-4:-2] == long[-2:]
+    assert tutor.compactions == 1
+
+
+def test_tutor_compaction_runs_in_the_background():
+    store = MemorySessionStore(max_messages=100, max_tokens=100_000)
+    long = _history(12)
+    store.save("s1", long[:-2])
+    release = threading.Event()
+    tutor = AITutor(client=_SlowClient(lambda: release.wait(5)), cache=None, sessions=store)
+
+    messages = [{"role": "system", "content": "prompt"}] + long[:-2] + [long[-2]]
+    pending = tutor._remember("s1", messages, long[-1]["content"])
+    # The exchange is stored while the summary call is still blocked
+    assert not pending.done()
+    assert store.get("s1")[-2:] == long[-2:]
+    # A compaction already under way is not queued twice
+    assert tutor._remember("s1", messages, "another answer") is None
+
+    release.set()
+    pending.result(timeout=5)
+    assert tutor.compactions == 1
+    assert store.get("s1")[0]["content"].startswith(SUMMARY_PREFIX)
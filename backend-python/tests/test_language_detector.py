@@ -0,0 +1,104 @@
+import os
+
+import numpy as np
+import pytest
+
+from ai import language_detector
+from ai.language_detector import (BUCKETS, DEFAULT_LANGUAGE, LocalLanguageDetector, corpus_files, detector_instance,
+                                  fingerprint, load_model, ngram_ids, normalize, train)
+
+SAMPLES = [
+    ("Muli shani mukwai", "bemba"),
+    ("Natotela pa kunsambilisha", "bemba"),
+    ("Bwanji, muli bwanji", "nyanja"),
+    ("Zikomo kwambiri chifukwa", "nyanja"),
+    ("Mwabuka buti", "tonga"),
+    ("akaambo kakugwasya", "tonga"),
+    ("What is the speed of light?", "english"),
+    ("Photosynthesis in maize leaves", "english"),
+]
+
+
+def test_ngram_ids_cover_every_window():
+    text = "Ab!"
+    assert normalize(text) == " ab "
+    ids = ngram_ids(text)
+    # 4 + 3 + 2 + 1 windows over " ab "
+    assert ids.size == 10
+    assert ids.min() >= 0 and ids.max() < BUCKETS
+    assert np.array_equal(ngram_ids("AB"), ids)
+    assert ngram_ids("").size == 3  # the two padding spaces: two 1-grams and a 2-gram
+
+
+@pytest.mark.parametrize("text, language", SAMPLES)
+def test_detect_sample_phrases(text, language):
+    assert detector_instance.detect(text) == language
+
+
+def test_detect_many_matches_detect():
+    texts = [text for text, _ in SAMPLES] + ["", None, "ok", "shani " * 100]
+    assert detector_instance.detect_many(texts) == [detector_instance.detect(t) for t in texts]
+    assert detector_instance.detect_many([]) == []
+
+
+@pytest.mark.parametrize("text", ["", None, "ok", "123 456", "The pendulum swings"])
+def test_english_is_the_default(text):
+    assert detector_instance.detect(text) == DEFAULT_LANGUAGE
+
+
+# Not in any corpus; none of them may pass for a local language
+@pytest.mark.parametrize("text", ["Mitochondria", "Chloroplast", "Cytoplasm", "Electrolysis", "Haemoglobin",
+                                  "Zambezi", "Lusaka Kafue Zambezi", "Zambezi river", "Mazabuka sugar",
+                                  "Chipata Chipata", "Mitochondria and chloroplasts"])
+def test_science_terms_and_place_names_stay_english(text):
+    assert detector_instance.detect(text) == DEFAULT_LANGUAGE
+
+
+def test_local_words_without_a_dictionary_word(monkeypatch):
+    # Two words that lean Tonga on their own carry the phrase...
+    assert detector_instance.detect("Ndiyanda kwiiya") == "tonga"
+    # ...one is not enough unless MIN_WORDS allows it
+    assert detector_instance.detect("Ndiyanda") == DEFAULT_LANGUAGE
+    monkeypatch.setattr(language_detector, 'MIN_WORDS', 1)
+    assert LocalLanguageDetector().detect("Ndiyanda") == "tonga"
+
+
+def test_short_texts_are_memoised():
+    detector = LocalLanguageDetector()
+    detector.detect("Mwabuka buti")
+    detector.detect("Mwabuka buti")
+    stats = detector.stats()
+    assert stats["memo_hits"] == 1 and stats["memo_misses"] == 1
+    detector.detect("x" * (language_detector.MEMO_MAX_CHARS + 1))
+    assert detector.stats()["memo_misses"] == 1
+
+
+def _write_corpora(directory, tonga):
+    for language, text in [("english", "how are you today\nwhat is a pendulum\n"),
+                           ("tonga", tonga)]:
+        with open(os.path.join(directory, f"{language}.txt"), "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+def test_stale_model_is_retrained(tmp_path):
+    corpora, path = str(tmp_path), str(tmp_path / "model.npz")
+    _write_corpora(corpora, "mwabuka buti\n")
+    first = load_model(path, corpora)
+    assert os.path.exists(path)
+    assert str(first["fingerprint"]) == fingerprint(corpus_files(corpora))
+    # Unchanged corpora load the saved table as is
+    assert np.array_equal(load_model(path, corpora)["log_probs"], first["log_probs"])
+
+    _write_corpora(corpora, "mwabuka buti\ntwalumba kapati\n")
+    second = load_model(path, corpora)
+    assert str(second["fingerprint"]) != str(first["fingerprint"])
+    assert np.array_equal(second["log_probs"], train(corpora)["log_probs"])
+    with np.load(path) as saved:
+        assert str(saved["fingerprint"]) == str(second["fingerprint"])
+
+
+def test_training_needs_an_english_corpus(tmp_path):
+    with open(tmp_path / "tonga.txt", "w") as f:
+        f.write("mwabuka buti\n")
+    with pytest.raises(RuntimeError):
+        train(str(tmp_path))
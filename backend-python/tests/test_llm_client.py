@@ -0,0 +1,170 @@
+import threading
+import time
+
+import openai
+import pytest
+
+from ai import llm_client as llm_module
+from ai.llm_client import LLMBusy, LLMClient, LLMJobs
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(llm_module.time, 'sleep', sleeps.append)
+    return sleeps
+
+
+# ---------------------------------------------------------------------------
+# LLMClient.slot
+# ---------------------------------------------------------------------------
+def test_slot_times_out_when_all_slots_are_busy():
+    client = LLMClient(api_key='test', max_concurrency=1, queue_timeout=0.05)
+    with client.slot():
+        with pytest.raises(LLMBusy):
+            with client.slot():
+                pass
+    assert client.stats()["rejected"] == 1
+    with client.slot():  # freed again
+        assert client.stats()["in_flight"] == 1
+    assert client.stats()["in_flight"] == 0
+
+
+def test_slot_rejects_without_waiting_when_queue_is_full():
+    client = LLMClient(api_key='test', max_concurrency=1, max_queue=1, queue_timeout=5)
+    release = threading.Event()
+
+    def hold():
+        with client.slot():
+            release.wait()
+
+    def wait():
+        with client.slot():
+            pass
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    assert _wait_for(lambda: client.stats()["in_flight"] == 1)
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    assert _wait_for(lambda: client.stats()["waiting"] == 1)
+
+    started = time.perf_counter()
+    with pytest.raises(LLMBusy):
+        with client.slot():
+            pass
+    assert time.perf_counter() - started < 1
+
+    release.set()
+    holder.join()
+    waiter.join()
+    assert client.stats()["waiting"] == 0
+
+
+# ---------------------------------------------------------------------------
+# Retries
+# ---------------------------------------------------------------------------
+def test_transient_errors_are_retried(no_backoff):
+    client = LLMClient(api_key='test', max_retries=2)
+    errors = [openai.APITimeoutError(request=None), openai.APIConnectionError(request=None)]
+
+    def call():
+        if errors:
+            raise errors.pop(0)
+        return "answer"
+
+    assert client._with_retries(call) == "answer"
+    assert len(no_backoff) == 2
+    stats = client.stats()
+    assert (stats["calls"], stats["failures"], stats["retries"], stats["timeouts"]) == (3, 2, 2, 1)
+
+
+def test_last_error_is_raised_once_retries_are_exhausted(no_backoff):
+    client = LLMClient(api_key='test', max_retries=1)
+
+    def call():
+        raise openai.APITimeoutError(request=None)
+
+    with pytest.raises(openai.APITimeoutError):
+        client._with_retries(call)
+    assert client.stats()["calls"] == 2
+    assert len(no_backoff) == 1
+
+
+def test_other_errors_are_not_retried(no_backoff):
+    client = LLMClient(api_key='test', max_retries=3)
+
+    def call():
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        client._with_retries(call)
+    assert client.stats()["calls"] == 1
+    assert no_backoff == []
+
+
+# ---------------------------------------------------------------------------
+# LLMJobs
+# ---------------------------------------------------------------------------
+def test_job_is_queued_until_a_worker_starts_it():
+    jobs = LLMJobs(workers=1, max_queue=5)
+    release = threading.Event()
+    first = jobs.submit(lambda: release.wait() and {"answer": 1})
+    second = jobs.submit(lambda: {"answer": 2})
+    assert first["state"] == "queued"
+    assert _wait_for(lambda: jobs.status(first["job_id"])["state"] == "running")
+    assert jobs.status(second["job_id"])["state"] == "queued"
+
+    release.set()
+    assert _wait_for(lambda: jobs.status(second["job_id"])["state"] == "succeeded")
+    assert jobs.status(first["job_id"])["result"] == {"answer": 1}
+    assert jobs.status(first["job_id"])["started_at"] is not None
+
+
+def test_failed_job_keeps_the_error():
+    jobs = LLMJobs(workers=1)
+
+    def fail():
+        raise RuntimeError("upstream down")
+
+    job = jobs.submit(fail)
+    assert _wait_for(lambda: jobs.status(job["job_id"])["state"] == "failed")
+    assert jobs.status(job["job_id"])["error"] == "upstream down"
+
+
+def test_submit_raises_busy_once_queue_is_full():
+    jobs = LLMJobs(workers=1, max_queue=2)
+    release = threading.Event()
+    running = jobs.submit(release.wait)
+    assert _wait_for(lambda: jobs.status(running["job_id"])["state"] == "running")
+    jobs.submit(release.wait)
+    jobs.submit(release.wait)
+    with pytest.raises(LLMBusy):
+        jobs.submit(release.wait)
+    assert jobs.stats()["queued"] == 2
+    release.set()
+
+
+def test_only_finished_jobs_are_evicted():
+    jobs = LLMJobs(workers=1, history=2, max_queue=10)
+    done = jobs.submit(lambda: "done")
+    assert _wait_for(lambda: jobs.status(done["job_id"])["state"] == "succeeded")
+
+    release = threading.Event()
+    pending = [jobs.submit(release.wait) for _ in range(3)]
+    # Over history, but the only finished job goes and the pending ones stay
+    assert jobs.status(done["job_id"]) is None
+    assert all(jobs.status(job["job_id"]) is not None for job in pending)
+
+    release.set()
+    assert _wait_for(lambda: jobs.stats()["kept"] == 2)
+    assert jobs.status(pending[0]["job_id"]) is None
@@ -0,0 +1,197 @@
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from ai import materialize as mat
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.rows = []
+
+    def execute(self, sql, params=()):
+        self.db.executed.append((" ".join(sql.split()), params))
+        if self.db.fail_reads and sql.lstrip().startswith("SELECT"):
+            raise RuntimeError("table missing")
+        for fragment, rows in self.db.results.items():
+            if fragment in sql:
+                self.rows = rows
+                return
+        self.rows = []
+
+    def executemany(self, sql, rows):
+        self.db.written.append((" ".join(sql.split()).split()[2], list(rows)))
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def close(self):
+        pass
+
+
+class FakeDB:
+    def __init__(self, results=None, fail_reads=False):
+        self.results = results or {}
+        self.fail_reads = fail_reads
+        self.executed, self.written = [], []
+        self.commits = 0
+        self.closed = False
+
+    def cursor(self, dictionary=False):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def close(self):
+        self.closed = True
+
+
+class FakeEngine:
+    def __init__(self, db=None, trained=True, version="v2"):
+        self.is_trained = trained
+        self.model_version = version
+        self.live_calls = 0
+
+    def load_models(self):
+        pass
+
+    def get_recommendations(self, user_id):
+        self.live_calls += 1
+        return [{"experiment_id": 7, "predicted_score": 0.9, "title": "Pendulum"}]
+
+    def predict_risk(self, user_id):
+        self.live_calls += 1
+        return {"user_id": user_id, "is_at_risk": True, "probability": 0.8}
+
+    def recommend_batch(self, user_ids, k):
+        return {u: [{"experiment_id": 1, "predicted_score": 0.5}] for u in user_ids}
+
+    def assess_risk(self, features):
+        return {u: {"is_at_risk": u % 2 == 0, "probability": 0.6} for u in features}
+
+
+def _stored_recommendation(version="v2", age_hours=1):
+    return [{"experiment_id": 3, "predicted_score": 0.7, "model_version": version,
+             "computed_at": datetime.now() - timedelta(hours=age_hours), "title": "Titration",
+             "subject": "chemistry"}]
+
+
+def _stored_risk(version="v2", age_hours=1):
+    return [{"is_at_risk": 0, "probability": 0.2, "actual_avg_score": None, "model_version": version,
+             "computed_at": datetime.now() - timedelta(hours=age_hours)}]
+
+
+# ---------------------------------------------------------------------------
+# Serving: precomputed, stale, failing reads
+# ---------------------------------------------------------------------------
+def test_fresh_rows_are_served_without_inference():
+    db, engine = FakeDB({"student_recommendations": _stored_recommendation()}), FakeEngine()
+    recs, source = mat.serve_recommendations(db, engine, 5)
+    assert source == "precomputed" and recs[0]["experiment_id"] == 3
+    assert engine.live_calls == 0 and db.written == []
+
+
+@pytest.mark.parametrize("rows", [[], _stored_recommendation(version="v1"),
+                                  _stored_recommendation(age_hours=mat.MAX_AGE_HOURS + 1)])
+def test_missing_or_stale_rows_fall_back_and_write_back(rows):
+    db, engine = FakeDB({"student_recommendations": rows}), FakeEngine()
+    recs, source = mat.serve_recommendations(db, engine, 5)
+    assert source == "live" and recs[0]["experiment_id"] == 7
+    assert db.written[0][0] == "student_recommendations" and db.commits == 1
+
+
+def test_untrained_engine_results_are_not_written_back():
+    db, engine = FakeDB(), FakeEngine(trained=False)
+    assert mat.serve_recommendations(db, engine, 5)[1] == "live"
+    assert mat.serve_risk(db, engine, 5)[1] == "live"
+    assert db.written == []
+
+
+def test_read_failures_serve_live_results():
+    db, engine = FakeDB(fail_reads=True), FakeEngine()
+    assert mat.serve_recommendations(db, engine, 5)[1] == "live"
+    assert mat.serve_risk(db, engine, 5)[1] == "live"
+    assert db.written == []
+
+
+def test_risk_precomputed_and_stale():
+    db, engine = FakeDB({"student_risk": _stored_risk()}), FakeEngine()
+    risk, source = mat.serve_risk(db, engine, 5)
+    assert source == "precomputed" and risk["is_at_risk"] is False
+    db = FakeDB({"student_risk": _stored_risk(version="v1")})
+    risk, source = mat.serve_risk(db, engine, 5)
+    assert source == "live" and risk["is_at_risk"] is True
+    assert db.written[0][0] == "student_risk"
+
+
+# ---------------------------------------------------------------------------
+# Batch run and the background runner
+# ---------------------------------------------------------------------------
+@pytest.fixture
+def fake_engine(monkeypatch):
+    monkeypatch.setattr(mat, "AdaptiveLearningEngine", FakeEngine)
+
+    class Features:
+        def __init__(self, db):
+            pass
+
+        def get_many(self, user_ids):
+            return {u: {} for u in user_ids}
+
+    monkeypatch.setattr(mat, "FeatureStore", Features)
+
+
+def test_materialize_scores_every_student_in_chunks(fake_engine):
+    db = FakeDB({"FROM users": [{"id": i} for i in range(1, 6)]})
+    stats = mat.materialize(db, chunk_size=2)
+    assert stats["students"] == 5 and stats["chunks"] == 3 and stats["at_risk"] == 2
+    assert db.commits == 3
+    written = [user for table, rows in db.written if table == "student_risk" for user, *_ in rows]
+    assert written == [1, 2, 3, 4, 5]
+
+
+def test_materialize_needs_trained_models(monkeypatch):
+    monkeypatch.setattr(mat, "AdaptiveLearningEngine", lambda db: FakeEngine(trained=False))
+    with pytest.raises(RuntimeError):
+        mat.materialize(FakeDB())
+
+
+def test_run_now_runs_once_in_the_background(fake_engine):
+    release = threading.Event()
+    dbs = []
+
+    def connect():
+        release.wait(5)
+        db = FakeDB({"FROM users": [{"id": 1}]})
+        dbs.append(db)
+        return db
+
+    runner = mat.NightlyMaterializer(connect)
+    assert runner.run_now()
+    assert runner.status()["running"]
+    assert not runner.run_now()  # single-run guard
+    assert runner.run() is None
+    release.set()
+    for _ in range(500):
+        if not runner.status()["running"]:
+            break
+        threading.Event().wait(0.01)
+    status = runner.status()
+    assert not status["running"] and status["last_run"]["students"] == 1
+    assert len(dbs) == 1 and dbs[0].closed
+
+
+def test_failed_run_is_reported_and_releases_the_guard(fake_engine):
+    def connect():
+        raise OSError("db down")
+
+    runner = mat.NightlyMaterializer(connect)
+    assert "db down" in runner.run()["error"]
+    assert not runner.status()["running"]
+    assert runner.run() is not None
@@ -0,0 +1,33 @@
+from ai.model_registry import BASELINE_VERSION, ModelRegistry
+
+
+def _publish(registry, tag):
+    return registry.publish({"kind": "recommender", "tag": tag}, {"kind": "risk", "tag": tag}, ["physics"],
+                            metadata={"tag": tag})
+
+
+def test_no_models_is_reported_once(tmp_path, capsys):
+    registry = ModelRegistry(root=str(tmp_path), check_interval=0)
+    for _ in range(5):
+        assert registry.get() is None
+    assert capsys.readouterr().out.count(f"could not load version {BASELINE_VERSION}") == 1
+
+
+def test_publishes_in_the_same_second_do_not_collide(tmp_path):
+    registry = ModelRegistry(root=str(tmp_path), check_interval=0)
+    versions = [_publish(registry, i).version for i in range(3)]
+    assert len(set(versions)) == 3
+    assert [v["tag"] for v in registry.versions()] == [2, 1, 0]  # newest first
+    assert registry.get().recommender["tag"] == 2
+
+
+def test_other_processes_pick_up_a_publish(tmp_path):
+    reader = ModelRegistry(root=str(tmp_path), check_interval=0)
+    writer = ModelRegistry(root=str(tmp_path), check_interval=0)
+    first = _publish(writer, "a").version
+    assert reader.get().version == first
+    _publish(writer, "b")
+    assert reader.get().recommender["tag"] == "b"
+    # Rollback
+    writer.activate(first)
+    assert reader.get().version == first
@@ -0,0 +1,72 @@
+import pytest
+
+from ai.offline_index import FUZZY_WEIGHT, OfflineIndex, edit_distance, stem, tokenize
+from ai.tutor import OFFLINE_MIN_COVERAGE, OFFLINE_MIN_SCORE, AITutor, offline_index
+
+DOCUMENTS = [
+    {"id": "pendulum", "keywords": "pendulum", "text": "The period depends on length and gravity.", "subject": "physics"},
+    {"id": "titration", "keywords": "titration", "text": "Acid meets base at the equivalence point.", "subject": "chemistry"},
+    {"id": "circuit", "keywords": "circuit", "text": "A bulb gives light when current flows.", "subject": "physics"},
+]
+
+
+@pytest.fixture(scope='module')
+def index():
+    return OfflineIndex(DOCUMENTS)
+
+
+def test_tokenize_stems_and_drops_stopwords():
+    assert tokenize("What are the pendulums swinging?") == ["pendulum", "swing"]
+    assert stem("boxes") == "box" and stem("glass") == "glass"
+
+
+def test_edit_distance_counts_transpositions():
+    assert edit_distance("pendulum", "pendulum", 2) == 0
+    assert edit_distance("pendlum", "pendulum", 2) == 1
+    assert edit_distance("titartion", "titration", 2) == 1
+    assert edit_distance("pendulum", "titration", 2) == 3
+
+
+def test_exact_match_ranks_first(index):
+    results = index.search("length of a pendulum")
+    assert results[0][0]["id"] == "pendulum"
+    assert [score for _, score in results] == sorted((score for _, score in results), reverse=True)
+
+
+def test_typos_are_corrected_with_a_weight(index):
+    assert index.expand("pendulm") == {"pendulum": FUZZY_WEIGHT}
+    assert index.expand("titartion") == {"titration": FUZZY_WEIGHT}
+    assert index.best("pendulm")["id"] == "pendulum"
+    # Short words are not corrected
+    assert index.expand("bulp") == {}
+
+
+def test_subject_boost(index):
+    plain = dict((d["id"], s) for d, s in index.search("light equivalence"))
+    boosted = dict((d["id"], s) for d, s in index.search("light equivalence", subject="physics"))
+    assert boosted["circuit"] > plain["circuit"]
+    assert boosted["titration"] == plain["titration"]
+
+
+def test_min_coverage_needs_most_query_words(index):
+    # "speed" is unknown, so the circuit document covers half the question
+    assert index.best("speed of light")["id"] == "circuit"
+    assert index.best("speed of light", min_coverage=0.6) is None
+    assert index.best("bulb light", min_coverage=0.6)["id"] == "circuit"
+
+
+@pytest.mark.parametrize("question, expected", [
+    ("what is the period of a pendulum", "physics:pendulum"),
+    ("pendulm length", "physics:pendulum"),
+    ("titraton", "chemistry:titration"),
+    ("explain osmosis", "biology:osmosis"),
+    ("newtons second law", "physics:force"),
+])
+def test_tutor_index_answers_topics(question, expected):
+    match = offline_index.best(question, min_score=OFFLINE_MIN_SCORE, min_coverage=OFFLINE_MIN_COVERAGE)
+    assert match["id"] == expected
+
+
+@pytest.mark.parametrize("question", ["what is the speed of light", "how do plants make food", "light"])
+def test_unrelated_questions_get_the_offline_hint(question):
+    assert AITutor(cache=None)._offline_response(question, 'general').startswith("I am currently in offline mode")
@@ -0,0 +1,52 @@
+import math
+from functools import partial
+
+import numpy as np
+import pytest
+
+from simulations.integrators import dopri45
+from simulations.pendulum_solver import (PENDULUM_CACHE_MAX_SAMPLES, cache_info, exact_period,
+                                         solve_pendulum, solve_pendulum_batch)
+from simulations.physics_engine import PhysicsEngine
+
+
+def test_dopri45_matches_exponential_decay():
+    t = np.linspace(0, 2, 11)
+    y = dopri45(lambda t, y: -y, np.array([1.0, 2.0]), t)
+    np.testing.assert_allclose(y, np.exp(-t)[:, None] * [1.0, 2.0], rtol=1e-5)
+
+
+def test_dopri45_step_limit_is_a_value_error():
+    with pytest.raises(ValueError):
+        dopri45(lambda t, y: -y, np.array([1.0]), np.linspace(0, 100, 5), max_steps=3)
+
+
+def test_exact_period_reduces_to_small_angle_formula():
+    assert exact_period(1.0, 1e-6) == pytest.approx(2 * math.pi * math.sqrt(1.0 / 9.81))
+    # Large swings take longer: ~18% at 90 degrees
+    assert exact_period(1.0, math.radians(90)) / exact_period(1.0, 1e-6) == pytest.approx(1.18034, rel=1e-4)
+
+
+def test_batch_conserves_energy_and_matches_period():
+    lengths, angles = np.array([0.5, 1.0, 2.0]), np.array([10.0, 45.0, 80.0])
+    t, theta, omega = solve_pendulum_batch(lengths, angles, duration=5, samples=2001)
+    energy = 0.5 * lengths[:, None] ** 2 * omega ** 2 - 9.81 * lengths[:, None] * np.cos(theta)
+    np.testing.assert_allclose(energy, np.broadcast_to(energy[:, :1], energy.shape), rtol=1e-4)
+    # First return to the starting angle (omega changes sign from + to -)
+    crossings = [t[np.nonzero((omega[i, :-1] > 0) & (omega[i, 1:] <= 0))[0][0]] for i in range(3)]
+    np.testing.assert_allclose(crossings, exact_period(lengths, np.radians(angles)), atol=5e-3)
+
+
+def test_long_trajectories_are_not_memoized():
+    before = cache_info()["size"]
+    solve_pendulum(1.0, 30, 0.0, 1.0, PENDULUM_CACHE_MAX_SAMPLES + 1)
+    assert cache_info()["size"] == before
+    t, theta, _ = solve_pendulum(1.0, 30, 0.0, 1.0, 100)
+    assert cache_info()["size"] == before + 1
+    assert not theta.flags.writeable
+
+
+def test_batch_step_limit_is_reported_as_error(monkeypatch):
+    monkeypatch.setattr('simulations.pendulum_solver.dopri45', partial(dopri45, max_steps=10))
+    result = PhysicsEngine().simulate_batch('pendulum', {"length": [0.5, 1.0], "duration": 100, "samples": 10})
+    assert "error" in result
@@ -0,0 +1,128 @@
+import threading
+import time
+
+import pytest
+
+from db.pool import ConnectionPool, PoolTimeout
+
+
+class FakeConnection:
+    def __init__(self, number):
+        self.number = number
+        self.closed = False
+        self.alive = True
+        self.rollbacks = 0
+
+    def ping(self, reconnect=False):
+        if not self.alive:
+            raise OSError("gone away")
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class Factory:
+    def __init__(self):
+        self.made = []
+
+    def __call__(self):
+        conn = FakeConnection(len(self.made))
+        self.made.append(conn)
+        return conn
+
+
+def test_connections_are_reused_and_rolled_back():
+    factory = Factory()
+    pool = ConnectionPool(factory, size=2, max_overflow=0)
+    conn = pool.acquire()
+    conn.close()
+    conn.close()  # second close is a no-op
+    again = pool.acquire()
+    assert again.number == 0 and len(factory.made) == 1
+    assert factory.made[0].rollbacks == 1
+    assert pool.stats()["checkins"] == 1
+
+
+def test_exhausted_pool_times_out():
+    pool = ConnectionPool(Factory(), size=1, max_overflow=1, timeout=0.05)
+    held = [pool.acquire(), pool.acquire()]
+    started = time.monotonic()
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+    assert time.monotonic() - started >= 0.05
+    stats = pool.stats()
+    assert stats["timeouts"] == 1 and stats["waits"] == 1 and stats["in_use"] == 2
+    for conn in held:
+        conn.close()
+
+
+def test_overflow_connections_close_on_return():
+    factory = Factory()
+    pool = ConnectionPool(factory, size=1, max_overflow=1)
+    first, second = pool.acquire(), pool.acquire()
+    first.close()
+    second.close()
+    assert factory.made[1].closed
+    assert pool.stats()["open"] == 1
+
+
+def test_stale_connections_are_recycled():
+    factory = Factory()
+    pool = ConnectionPool(factory, size=1, max_overflow=0, recycle=0.01)
+    pool.acquire().close()
+    time.sleep(0.02)
+    conn = pool.acquire()
+    assert conn.number == 1 and factory.made[0].closed
+    assert pool.stats()["recycled"] == 1 and pool.stats()["open"] == 1
+
+
+def test_dead_connections_fail_pre_ping():
+    factory = Factory()
+    pool = ConnectionPool(factory, size=1, max_overflow=0)
+    pool.acquire().close()
+    factory.made[0].alive = False
+    conn = pool.acquire()
+    assert conn.number == 1
+    assert pool.stats()["ping_failures"] == 1
+
+
+def test_discard_wakes_a_blocked_waiter():
+    factory = Factory()
+    pool = ConnectionPool(factory, size=1, max_overflow=0, timeout=5)
+    held = pool.acquire()
+    got = {}
+
+    def waiter():
+        started = time.monotonic()
+        got["conn"] = pool.acquire()
+        got["waited"] = time.monotonic() - started
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    time.sleep(0.05)
+    # A failed rollback discards the connection instead of returning it
+    factory.made[0].rollback = lambda: (_ for _ in ()).throw(OSError("broken"))
+    held.close()
+    thread.join(2)
+    assert not thread.is_alive()
+    assert got["conn"].number == 1
+    assert got["waited"] < 1
+
+
+def test_connect_errors_release_the_slot():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            raise OSError("refused")
+        return FakeConnection(len(calls))
+
+    pool = ConnectionPool(flaky, size=1, max_overflow=0, timeout=0.05)
+    with pytest.raises(OSError):
+        pool.acquire()
+    assert pool.acquire().number == 2
+    assert pool.stats()["connect_errors"] == 1
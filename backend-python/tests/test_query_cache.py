@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+
+from ai.query_cache import LRUCache, MicroBatcher, normalize_query
+
+
+def test_normalize_query():
+    assert normalize_query("  What is Ohm's law?? ") == "what is ohm's law"
+
+
+def test_lru_evicts_the_least_recently_used():
+    cache = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # a is now newer than b
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    stats = cache.stats()
+    assert stats["size"] == 2 and stats["hits"] == 3 and stats["misses"] == 1
+    assert stats["hit_rate"] == 0.75
+
+
+def test_lru_with_no_capacity_stores_nothing():
+    cache = LRUCache(max_size=0)
+    cache.put("a", 1)
+    assert len(cache) == 0 and cache.get("a") is None
+
+
+def _submit_together(batcher, items):
+    futures = [batcher.submit(item) for item in items]
+    return [f.result(5) for f in futures]
+
+
+def test_concurrent_requests_share_a_batch():
+    calls = []
+
+    def double(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(double, max_batch_size=8, max_wait_ms=50)
+    assert _submit_together(batcher, [1, 2, 3, 2]) == [2, 4, 6, 4]
+    # Duplicates are computed once and fanned out to every caller
+    assert calls == [[1, 2, 3]]
+    stats = batcher.stats()
+    assert stats["requests"] == 4 and stats["batches"] == 1
+
+
+def test_batches_are_capped_at_max_size():
+    calls = []
+
+    def echo(items):
+        calls.append(len(items))
+        return items
+
+    batcher = MicroBatcher(echo, max_batch_size=3, max_wait_ms=50)
+    assert _submit_together(batcher, list(range(7))) == list(range(7))
+    assert max(calls) == 3 and sum(calls) == 7
+
+
+def test_lone_request_is_flushed_after_the_wait():
+    batcher = MicroBatcher(lambda items: items, max_batch_size=100, max_wait_ms=20)
+    started = time.monotonic()
+    assert batcher("x", timeout=5) == "x"
+    assert time.monotonic() - started < 1
+
+
+def test_batch_failure_reaches_every_caller_and_the_batcher_survives():
+    def fail_on_boom(items):
+        if "boom" in items:
+            raise ValueError("encoder failed")
+        return items
+
+    batcher = MicroBatcher(fail_on_boom, max_batch_size=8, max_wait_ms=50)
+    futures = [batcher.submit(item) for item in ("ok", "boom", "boom")]
+    for future in futures:
+        with pytest.raises(ValueError, match="encoder failed"):
+            future.result(5)
+    assert batcher("after", timeout=5) == "after"
+
+
+def test_callers_on_many_threads():
+    batcher = MicroBatcher(lambda items: [i + 1 for i in items], max_batch_size=16, max_wait_ms=10)
+    results = {}
+
+    def call(i):
+        results[i] = batcher(i, timeout=5)
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(50)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == {i: i + 1 for i in range(50)}
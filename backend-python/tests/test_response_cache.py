@@ -0,0 +1,102 @@
+import numpy as np
+
+from ai.response_cache import ResponseCache, prewarm, scope_key
+
+
+class _Cursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def execute(self, query):
+        pass
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+class _DB:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def cursor(self, dictionary=False):
+        return _Cursor(self.rows)
+
+
+class _Generator:
+    """Stores what a real ECZContentGenerator would, except for failures."""
+
+    def __init__(self, cache, fail=()):
+        self.client = object()
+        self.cache = cache
+        self.fail = set(fail)
+        self.calls = 0
+
+    def generate(self, content_type, topic, grade):
+        self.calls += 1
+        if topic in self.fail:
+            return "AI Error: upstream unavailable"
+        self.cache.put('content', scope_key(content_type, grade), topic, f"{content_type} on {topic}")
+
+    def generate_quiz(self, subject, topic, count=3):
+        self.calls += 1
+        if topic not in self.fail:
+            self.cache.put('quiz', scope_key(subject, count), topic, [{"question": topic}])
+
+
+EXPERIMENTS = [{"id": 1, "title": "Simple Pendulum", "subject": "Physics", "grade_or_form": "Form 1"},
+               {"id": 2, "title": "Titration", "subject": "Chemistry", "grade_or_form": "Form 2"}]
+
+
+def test_exact_hits_and_expiry(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "c.sqlite3"))
+    cache.put('content', 'worksheet|form 1', "Ohm's Law", "text")
+    assert cache.get('content', 'worksheet|form 1', "  ohm's law ") == "text"
+    assert cache.get('content', 'worksheet|form 2', "Ohm's Law") is None
+    expired = ResponseCache(path=str(tmp_path / "c.sqlite3"), ttl_days=-1)
+    assert expired.get('content', 'worksheet|form 1', "Ohm's Law") is None
+    assert expired.purge_expired() == 1
+
+
+def test_near_duplicates_share_an_entry(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "c.sqlite3"), similarity=0.9)
+    vectors = {"ohm's law": [1.0, 0.0], "ohms law": [0.99, 0.05], "density": [0.0, 1.0]}
+    cache.embedder = lambda topic: np.array(vectors[topic])
+    cache.put('content', 'scope', "Ohm's law", "text")
+    assert cache.get('content', 'scope', "Ohms law") == "text"
+    assert cache.get('content', 'scope', "Density") is None
+    assert cache.stats()["near_hits"] == 1
+
+
+def test_prewarm_counts_only_stored_entries(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "c.sqlite3"))
+    generator = _Generator(cache, fail={"Titration"})
+    stats = prewarm(_DB(EXPERIMENTS), generator, content_types=['worksheet'])
+    assert (stats["generated"], stats["not_stored"], stats["skipped"]) == (2, 2, 0)
+    generator.fail.clear()
+    stats = prewarm(_DB(EXPERIMENTS), generator, content_types=['worksheet'])
+    assert (stats["generated"], stats["not_stored"], stats["skipped"]) == (2, 0, 2)
+
+
+def test_tutor_answers_match_exactly_only(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "c.sqlite3"), similarity=0.9)
+    embedded = []
+    cache.embedder = lambda topic: embedded.append(topic) or np.array([1.0, 0.0])
+    cache.put('tutor', 'physics|secondary', "What is current?", "answer")
+    assert cache.get('tutor', 'physics|secondary', "what is current") == "answer"
+    # Near-identical wording, different question
+    assert cache.get('tutor', 'physics|secondary', "What is voltage?") is None
+    assert embedded == []
+    assert cache.stats()["near_hits"] == 0
+
+
+def test_tutor_entries_are_capped(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "c.sqlite3"), tutor_max_entries=2)
+    for i in range(4):
+        cache.put('tutor', 'scope', f"question {i}", f"answer {i}")
+    cache.put('content', 'scope', "question 0", "content")
+    assert cache.stats()["entries"] == {"tutor": 2, "content": 1}
+    assert cache.get('tutor', 'scope', "question 0") is None
+    assert cache.get('tutor', 'scope', "question 3") == "answer 3"
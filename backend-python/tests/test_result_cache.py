@@ -0,0 +1,61 @@
+from simulations.result_cache import SimulationCache
+
+
+class _Engine:
+    def __init__(self):
+        self.calls = 0
+
+    def simulate(self, experiment, parameters):
+        self.calls += 1
+        if parameters.get('bad'):
+            return {"error": "bad parameters"}
+        return {"value": parameters.get('x', 0) * 2}
+
+
+def test_equivalent_parameters_share_a_key():
+    cache = SimulationCache()
+    assert cache.key('physics', 'pendulum', {"a": 1, "b": [2, 3]}) == \
+        cache.key('physics', 'pendulum', {"b": (2.0, 3), "a": 1.0})
+
+
+def test_version_is_part_of_the_key(tmp_path):
+    old = SimulationCache(disk_dir=str(tmp_path), version='v1')
+    old.put(old.key('physics', 'pendulum', {}), b'{"value":1}')
+    new = SimulationCache(disk_dir=str(tmp_path), version='v2')
+    assert new.get(new.key('physics', 'pendulum', {}), 'physics/pendulum') is None
+    again = SimulationCache(disk_dir=str(tmp_path), version='v1')
+    assert again.get(again.key('physics', 'pendulum', {}), 'physics/pendulum')[0] == b'{"value":1}'
+
+
+def test_warm_does_not_store_errors(tmp_path):
+    cache, engine = SimulationCache(disk_dir=str(tmp_path)), _Engine()
+    key = cache.warm('physics', engine, 'pendulum', {"bad": True})
+    assert cache.get(key, 'physics/pendulum') is None
+    assert list(tmp_path.iterdir()) == []
+    cache.warm('physics', engine, 'pendulum', {"x": 2})
+    cache.warm('physics', engine, 'pendulum', {"x": 2})
+    assert engine.calls == 2
+
+
+def test_lru_is_bounded_by_bytes():
+    cache = SimulationCache(max_bytes=10)
+    cache.put('a', b'12345')
+    cache.put('b', b'12345')
+    cache.put('c', b'12345')
+    assert cache.get('a', 'x') is None
+    assert cache.stats()["bytes"] == 10
+
+
+def test_only_accepted_experiments_get_counters():
+    cache = SimulationCache()
+    for junk in ('x' * 40, 'y' * 40):
+        assert cache.get(cache.key('physics', junk, {}), f'physics/{junk}') is None
+    assert cache.stats()["experiments"] == {}
+
+    key = cache.key('physics', 'pendulum', {})
+    assert cache.get(key, 'physics/pendulum') is None
+    cache.put(key, b'{"value":1}', 'physics/pendulum')
+    cache.get(key, 'physics/pendulum')
+    counters = cache.stats()["experiments"]
+    assert list(counters) == ['physics/pendulum']
+    assert counters['physics/pendulum']["hits"] == 1 and counters['physics/pendulum']["misses"] == 1
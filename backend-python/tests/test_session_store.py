@@ -0,0 +1,116 @@
+import multiprocessing
+import time
+
+import pytest
+
+from ai.session_store import MemorySessionStore, SQLiteSessionStore, truncate
+from ai.tokens import count_message_tokens
+
+
+def _pair(i, words=1):
+    return [{"role": "user", "content": f"question {i} " + "word " * words},
+            {"role": "assistant", "content": f"answer {i} " + "word " * words}]
+
+
+def _history(pairs, words=1):
+    return [m for i in range(pairs) for m in _pair(i, words)]
+
+
+# ---------------------------------------------------------------------------
+# truncate
+# ---------------------------------------------------------------------------
+def test_truncate_keeps_newest_whole_pairs():
+    history = _history(5)
+    kept = truncate(history, max_messages=5, max_tokens=10_000)
+    # 5 messages would split a pair, so only the last two pairs survive
+    assert kept == history[-4:]
+    assert kept[0]["role"] == "user"
+
+
+def test_truncate_respects_the_token_budget():
+    history = _history(6, words=50)
+    budget = count_message_tokens(history[-4:])
+    kept = truncate(history, max_messages=100, max_tokens=budget)
+    assert kept == history[-4:]
+
+
+def test_truncate_keeps_the_leading_summary():
+    summary = {"role": "system", "content": "Summary of the earlier conversation: pendulums"}
+    kept = truncate([summary] + _history(4), max_messages=2, max_tokens=10_000)
+    assert kept[0] == summary
+    assert kept[1:] == _pair(3)
+
+
+# ---------------------------------------------------------------------------
+# Stores
+# ---------------------------------------------------------------------------
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path):
+    def make(**kwargs):
+        if request.param == "memory":
+            return MemorySessionStore(**kwargs)
+        return SQLiteSessionStore(path=str(tmp_path / "sessions.sqlite3"), **kwargs)
+    return make
+
+
+def test_append_and_get(make_store):
+    store = make_store(max_messages=4)
+    for i in range(3):
+        store.append("s1", *_pair(i))
+    assert store.get("s1") == _history(3)[-4:]
+    assert store.get("other") == []
+    store.clear("s1")
+    assert store.get("s1") == []
+
+
+def test_ttl_expires_sessions(make_store):
+    store = make_store(ttl=0.05)
+    store.append("s1", *_pair(0))
+    assert store.get("s1")
+    time.sleep(0.1)
+    assert store.get("s1") == []
+
+
+def test_lru_eviction_by_session_count(make_store):
+    store = make_store(max_sessions=2)
+    store.append("a", *_pair(0))
+    time.sleep(0.01)
+    store.append("b", *_pair(0))
+    time.sleep(0.01)
+    store.get("a")  # a is now the most recently used
+    time.sleep(0.01)
+    store.append("c", *_pair(0))
+    assert store.get("b") == []
+    assert store.get("a") and store.get("c")
+
+
+def test_eviction_by_total_tokens(make_store):
+    per_session = count_message_tokens(_pair(0, words=20))
+    store = make_store(max_total_tokens=per_session * 2)
+    for name in "abc":
+        store.append(name, *_pair(0, words=20))
+        time.sleep(0.01)
+    assert store.get("a") == []
+    assert store.stats()["tokens"] <= per_session * 2
+
+
+def _append_many(path, worker, count):
+    store = SQLiteSessionStore(path=path, max_messages=10_000, max_tokens=10_000_000)
+    for i in range(count):
+        store.append("shared", {"role": "user", "content": f"{worker}-{i}"},
+                     {"role": "assistant", "content": "ok"})
+
+
+def test_sqlite_append_loses_no_updates_across_processes(tmp_path):
+    path = str(tmp_path / "sessions.sqlite3")
+    SQLiteSessionStore(path=path)  # create the schema once
+    ctx = multiprocessing.get_context('spawn')
+    workers = [ctx.Process(target=_append_many, args=(path, w, 25)) for w in range(4)]
+    for p in workers:
+        p.start()
+    for p in workers:
+        p.join(60)
+        assert p.exitcode == 0
+    history = SQLiteSessionStore(path=path, max_messages=10_000, max_tokens=10_000_000).get("shared")
+    assert len(history) == 4 * 25 * 2
+    assert {m["content"] for m in history if m["role"] == "user"} == {f"{w}-{i}" for w in range(4) for i in range(25)}
@@ -0,0 +1,111 @@
+import logging
+import sys
+import threading
+import time
+
+from ursa_lab.supervisor import SessionLimitReached, SimulationSupervisor
+
+import pytest
+
+
+@pytest.fixture
+def script(tmp_path):
+    path = tmp_path / "sim.py"
+    path.write_text("import sys, time\nprint('started', sys.argv[2])\ntime.sleep(float(sys.argv[3]))\n")
+    return str(path)
+
+
+@pytest.fixture
+def supervisor(tmp_path):
+    supervisor = SimulationSupervisor(log_dir=str(tmp_path / "logs"), max_sessions=2, reap_interval=0.05)
+    yield supervisor
+    supervisor.shutdown()
+
+
+def _wait_for(predicate, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def _reapers():
+    return [t for t in threading.enumerate() if t.name == "sim-reaper"]
+
+
+def test_session_runs_to_completion(supervisor, script):
+    session = supervisor.launch(script, 'pendulum', args=['0'], python_exe=sys.executable)
+    assert _wait_for(lambda: supervisor.status(session.pid)["state"] == "exited")
+    assert _wait_for(lambda: "started pendulum" in supervisor.status(session.pid)["log_tail"])
+
+
+def test_session_limit(supervisor, script):
+    for _ in range(2):
+        supervisor.launch(script, 'pendulum', args=['5'], python_exe=sys.executable)
+    with pytest.raises(SessionLimitReached):
+        supervisor.launch(script, 'pendulum', args=['5'], python_exe=sys.executable)
+    # Warm workers do not count towards the limit
+    supervisor.launch(script, 'idle', args=['5'], python_exe=sys.executable, warm=True)
+
+
+def test_concurrent_launches_start_one_reaper(supervisor, script):
+    supervisor.max_sessions = 20
+    others = set(_reapers())  # from earlier tests' supervisors, exiting
+    threads = [threading.Thread(target=supervisor.launch, args=(script, 'pendulum'),
+                                kwargs={"args": ['2'], "python_exe": sys.executable}) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(set(_reapers()) - others) == 1
+
+
+def test_warm_pool_starts_once(supervisor, tmp_path):
+    from ursa_lab.supervisor import WarmPool
+    worker = tmp_path / "worker.py"
+    worker.write_text("import time\nprint('WORKER_READY 1', flush=True)\ntime.sleep(5)\n")
+    pool = WarmPool(supervisor, str(worker), size=2, idle_timeout=0, python_exe=sys.executable)
+    assert pool.stats()["spawned"] == 0  # nothing runs until start()
+    threads = [threading.Thread(target=pool.start) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    pool.start()
+    assert _wait_for(lambda: pool.stats()["ready"] == 2)
+    assert pool.stats()["spawned"] == 2
+    pool.shutdown()
+
+
+def test_non_utf8_output_does_not_kill_the_pump(supervisor, tmp_path):
+    script = tmp_path / "bytes.py"
+    script.write_text("import sys, time\nsys.stdout.buffer.write(b'bad \\xff\\xfe byte\\n')\nsys.stdout.flush()\n"
+                      "time.sleep(0.2)\nprint('still alive', flush=True)\n")
+    session = supervisor.launch(str(script), 'pendulum', python_exe=sys.executable)
+    assert _wait_for(lambda: supervisor.status(session.pid)["state"] == "exited")
+    assert _wait_for(lambda: "still alive" in supervisor.status(session.pid)["log_tail"])
+    assert supervisor.status(session.pid)["log_tail"][0] == "bad \ufffd\ufffd byte"
+
+
+def test_each_session_logs_to_its_own_file_without_new_loggers(supervisor, script):
+    before = set(logging.Logger.manager.loggerDict)
+    first = supervisor.launch(script, 'pendulum', args=['0'], python_exe=sys.executable)
+    second = supervisor.launch(script, 'titration', args=['0'], python_exe=sys.executable)
+    for session in (first, second):
+        assert _wait_for(lambda: supervisor.status(session.pid)["state"] == "exited")
+    assert _wait_for(lambda: all(s.process.stdout.closed for s in (first, second)))
+    with open(first.log_path) as f:
+        assert "pendulum" in f.read()
+    with open(second.log_path) as f:
+        text = f.read()
+    assert "titration" in text and "pendulum" not in text
+    assert set(logging.Logger.manager.loggerDict) == before
+
+
+def test_sessions_skips_forgotten_pids(supervisor, script):
+    supervisor.history = 0
+    session = supervisor.launch(script, 'pendulum', args=['0'], python_exe=sys.executable)
+    assert _wait_for(lambda: supervisor.status(session.pid) is None)
+    assert supervisor.sessions() == []
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from simulations.chemistry_engine import ChemistryEngine
+
+
+@pytest.fixture
+def engine():
+    return ChemistryEngine()
+
+
+def _pH_at(result, volume):
+    return np.interp(volume, result["volumes"], result["pH_values"])
+
+
+def test_strong_acid_strong_base(engine):
+    result = engine.simulate_titration({})
+    assert result["equivalence_point"] == pytest.approx(25.0)
+    assert _pH_at(result, 0.0) == pytest.approx(1.0, abs=1e-3)
+    assert _pH_at(result, 25.0) == pytest.approx(7.0, abs=0.05)
+    assert np.all(np.diff(result["pH_values"]) >= -1e-9)
+
+
+def test_weak_acid_half_equivalence_is_pka(engine):
+    result = engine.simulate_titration({"ka": 1.8e-5, "samples": 2000})
+    assert _pH_at(result, 12.5) == pytest.approx(-np.log10(1.8e-5), abs=0.02)
+    assert _pH_at(result, 25.0) > 8
+
+
+def test_polyprotic_equivalence_points(engine):
+    result = engine.simulate_titration({"ka": [7.5e-3, 6.2e-8, 4.8e-13]})
+    assert result["equivalence_points"] == pytest.approx([25.0, 50.0, 75.0])
+
+
+def test_base_analyte_starts_basic(engine):
+    result = engine.simulate_titration({"analyte": "base"})
+    assert _pH_at(result, 0.0) == pytest.approx(13.0, abs=1e-3)
+
+
+@pytest.mark.parametrize("params", [
+    {"protons": 0},
+    {"protons": 100},
+    {"ka": []},
+    {"ka": [-1e-5]},
+    {"max_volume": 0},
+    {"acid_concentration": 0},
+])
+def test_invalid_parameters_are_errors(engine, params):
+    assert "error" in engine.simulate_titration(params)
@@ -0,0 +1,24 @@
+from ai.tokens import MESSAGE_OVERHEAD, REPLY_PRIMING, TIKTOKEN_AVAILABLE, count_message_tokens, count_tokens
+
+
+def test_empty_text_is_free():
+    assert count_tokens("") == 0
+    assert count_message_tokens([]) == REPLY_PRIMING
+
+
+def test_counts_grow_with_text():
+    short = count_tokens("What is a pendulum?")
+    assert 3 <= short <= 8
+    assert count_tokens("What is a pendulum? " * 10) > 9 * short
+
+
+def test_message_framing():
+    messages = [{"role": "user", "content": "Hello"}, {"role": "assistant", "content": None}]
+    assert count_message_tokens(messages) == count_tokens("Hello") + 2 * MESSAGE_OVERHEAD + REPLY_PRIMING
+
+
+def test_fallback_splits_long_words():
+    if TIKTOKEN_AVAILABLE:
+        return
+    assert count_tokens("ukumfwikisha") == 3  # 12 characters, ~4 per token
+    assert count_tokens("a, b.") == 4
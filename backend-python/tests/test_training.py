@@ -0,0 +1,73 @@
+import os
+import sqlite3
+import stat
+import sys
+import time
+
+import numpy as np
+import pytest
+
+from ai.model_registry import ModelRegistry
+from ai.training import TrainingJobs, train_incremental
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(':memory:')
+    conn.execute("CREATE TABLE experiments (id INTEGER PRIMARY KEY, subject TEXT)")
+    conn.execute("CREATE TABLE progress (id INTEGER PRIMARY KEY, experiment_id INTEGER, score REAL, "
+                 "completed_steps INTEGER, time_spent INTEGER)")
+    conn.executemany("INSERT INTO experiments VALUES (?, ?)", [(1, 'physics'), (2, 'chemistry'), (3, 'biology')])
+    rng = np.random.default_rng(0)
+    rows = []
+    for i in range(1, 401):
+        steps = int(rng.integers(0, 10))
+        rows.append((i, int(rng.integers(1, 4)), float(min(100, steps * 10 + rng.normal(0, 5))), steps,
+                     int(rng.integers(60, 900))))
+    conn.executemany("INSERT INTO progress VALUES (?, ?, ?, ?, ?)", rows)
+    yield conn
+    conn.close()
+
+
+def test_train_incremental_publishes_a_version(conn, tmp_path):
+    registry = ModelRegistry(root=str(tmp_path), check_interval=0)
+    updates = []
+    metadata = train_incremental(conn, chunk_size=64, progress=updates.append, registry=registry)
+    assert metadata["rows"] == 400
+    assert metadata["holdout_rows"] == 80  # every 5th id
+    assert metadata["metrics"]["in_sample"] is False
+    assert metadata["metrics"]["recommender_r2"] > 0.5
+    assert updates[-1]["stage"] == "validating"
+    assert registry.get().version == metadata["version"]
+
+
+def test_train_incremental_needs_data(tmp_path):
+    empty = sqlite3.connect(':memory:')
+    empty.execute("CREATE TABLE experiments (id INTEGER PRIMARY KEY, subject TEXT)")
+    empty.execute("CREATE TABLE progress (id INTEGER PRIMARY KEY, experiment_id INTEGER, score REAL, "
+                  "completed_steps INTEGER, time_spent INTEGER)")
+    with pytest.raises(ValueError):
+        train_incremental(empty, registry=ModelRegistry(root=str(tmp_path)))
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="uses an executable script as the interpreter")
+def test_jobs_follow_child_events(tmp_path):
+    # Stands in for `python -m ai.training --events`
+    fake = tmp_path / "fake_python"
+    fake.write_text(f"#!{sys.executable}\n"
+                    "print('TRAINING_EVENT {\"kind\": \"progress\", \"data\": {\"stage\": \"training\"}}')\n"
+                    "print('plain log line', flush=True)\n"
+                    "import time; time.sleep(0.5)\n"
+                    "print('TRAINING_EVENT {\"kind\": \"failed\", \"data\": \"no database\"}')\n")
+    fake.chmod(fake.stat().st_mode | stat.S_IEXEC)
+    jobs = TrainingJobs(python_exe=str(fake))
+    job = jobs.start(100)
+    assert jobs.start(100) is None  # one job at a time
+    deadline = time.time() + 10
+    while jobs.status(job["job_id"])["state"] == "running" and time.time() < deadline:
+        time.sleep(0.05)
+    status = jobs.status(job["job_id"])
+    assert status["state"] == "failed"
+    assert status["error"] == "no database"
+    assert status["progress"] == {"stage": "training"}
+    assert jobs.active() is None
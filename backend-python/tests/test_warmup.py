@@ -0,0 +1,75 @@
+import time
+
+from ai.warmup import WarmupManager
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_components_load_in_order():
+    loaded = []
+    warmup = WarmupManager(enabled=True, retry_delay=0)
+    warmup.register("model", lambda: loaded.append("model"))
+    warmup.register("index", lambda: loaded.append("index"))
+    warmup.start()
+    assert warmup.wait(5)
+    assert loaded == ["model", "index"]
+    status = warmup.status()
+    assert status["ready"] and not status["degraded"]
+    assert status["components"]["model"]["attempts"] == 1
+
+
+def test_failed_components_are_retried_with_backoff():
+    attempts = {"model": 0}
+    loaded = []
+
+    def flaky_model():
+        attempts["model"] += 1
+        if attempts["model"] < 3:
+            raise OSError("download interrupted")
+        loaded.append("model")
+
+    def index():
+        if "model" not in loaded:
+            raise RuntimeError("semantic model is not loaded")
+        loaded.append("index")
+
+    warmup = WarmupManager(enabled=True, retry_delay=0.02, retry_max_delay=0.05)
+    warmup.register("model", flaky_model)
+    warmup.register("index", index)
+    warmup.start()
+    assert warmup.wait(5)
+    # The first pass is over: ready, but degraded until the retries succeed
+    assert warmup.status()["degraded"]
+    assert _wait_for(lambda: warmup.is_ready("index"))
+    status = warmup.status()
+    assert not status["degraded"]
+    assert status["components"]["model"]["attempts"] == 3
+    assert status["components"]["index"]["error"] is None
+    assert loaded == ["model", "index"]
+
+
+def test_retries_stop_on_request():
+    warmup = WarmupManager(enabled=True, retry_delay=0.05)
+    warmup.register("model", lambda: 1 / 0)
+    warmup.start()
+    assert warmup.wait(5)
+    assert warmup.status()["components"]["model"]["retry_at"] is not None
+    warmup.stop()
+    attempts = warmup.status()["components"]["model"]["attempts"]
+    time.sleep(0.2)
+    assert warmup.status()["components"]["model"]["attempts"] <= attempts + 1
+
+
+def test_disabled_warmup_marks_components_lazy():
+    warmup = WarmupManager(enabled=False)
+    warmup.register("model", lambda: 1 / 0)
+    warmup.start()
+    assert warmup.is_ready()
+    assert warmup.status()["components"]["model"]["state"] == "lazy"
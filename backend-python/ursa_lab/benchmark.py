@@ -0,0 +1,96 @@
+"""
+Frame-time regression check for the 3D experiments.
+
+Steps every experiment headlessly (see headless.py) and compares the
+per-experiment update timings against benchmark_budget.json. Exits with
+status 1 if any experiment fails or exceeds its budget.
+
+    python benchmark.py                   # check against the budget
+    python benchmark.py --update-budget   # re-baseline from this machine
+"""
+import os
+import sys
+import json
+import argparse
+
+from headless import run_headless, print_report, DEFAULT_STEPS, DEFAULT_DT
+
+BUDGET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_budget.json')
+METRICS = ('mean_ms', 'p95_ms', 'p99_ms')
+# Floor for measured budgets: sub-10us timings are dominated by timer and
+# scheduler noise and would make the gate flaky on other machines
+MIN_BUDGET_MS = 0.05
+
+
+def load_budget(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def check_budget(results, budget, tolerance=0.0):
+    """Return a list of human-readable budget violations."""
+    violations = []
+    default = budget.get('default', {})
+    for r in results:
+        name = r['experiment']
+        if 'error' in r:
+            violations.append(f"{name}: failed ({r['error']})")
+            continue
+        limits = {**default, **budget.get('experiments', {}).get(name, {})}
+        for metric in METRICS:
+            limit = limits.get(metric)
+            if limit is not None and r[metric] > limit * (1 + tolerance):
+                violations.append(f"{name}: {metric} {r[metric]:.4f} > budget {limit:.4f}")
+    return violations
+
+
+def make_budget(results, headroom, steps, dt):
+    """Budget = measured timings x headroom, per experiment."""
+    return {
+        "steps": steps,
+        "dt": dt,
+        "headroom": headroom,
+        "default": {"mean_ms": 1.0, "p95_ms": 2.0, "p99_ms": 5.0},
+        "experiments": {
+            r['experiment']: {m: round(max(r[m] * headroom, MIN_BUDGET_MS), 4) for m in METRICS}
+            for r in results if 'error' not in r
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sayansi Yathu 3D frame-time benchmark')
+    parser.add_argument('--budget', type=str, default=BUDGET_PATH, help='Budget JSON file')
+    parser.add_argument('--type', type=str, action='append', help='Only benchmark this experiment (repeatable)')
+    parser.add_argument('--steps', type=int, default=None, help='Updates per experiment (default: from budget)')
+    parser.add_argument('--fixed-dt', type=float, default=None, help='Fixed timestep (default: from budget)')
+    parser.add_argument('--tolerance', type=float, default=0.0, help='Extra fractional slack on every budget')
+    parser.add_argument('--update-budget', action='store_true', help='Write a new budget from this run')
+    parser.add_argument('--headroom', type=float, default=3.0, help='Multiplier applied when writing a budget')
+    args = parser.parse_args()
+
+    budget = load_budget(args.budget) if os.path.exists(args.budget) else {}
+    steps = args.steps or budget.get('steps', DEFAULT_STEPS)
+    dt = args.fixed_dt or budget.get('dt', DEFAULT_DT)
+
+    results = run_headless(args.type, steps, dt)
+    print_report(results)
+
+    if args.update_budget:
+        with open(args.budget, 'w') as f:
+            json.dump(make_budget(results, args.headroom, steps, dt), f, indent=2)
+        print(f"Budget written to {args.budget}")
+        return 0
+
+    violations = check_budget(results, budget, args.tolerance)
+    if violations:
+        print("\nFrame-time budget exceeded:")
+        for v in violations:
+            print(f"  {v}")
+        return 1
+    print("\nAll experiments within budget.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
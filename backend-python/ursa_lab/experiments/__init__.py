@@ -0,0 +1,6 @@
+"""3D experiment classes for ursa_lab, loaded lazily through the registry.
+
+ursa_lab scripts put their own directory on sys.path and import this
+package as `experiments`.
+"""
+from .registry import EXPERIMENTS, available_experiments, create_experiment, get_experiment_class
@@ -0,0 +1,11 @@
+from ursina import *
+
+from .base import Experiment
+
+
+class ApparatusIdExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Array of apparatus on the table
+        self.entities['beaker'] = scene_manager.load_asset('beaker', position=(-3, 0, 0))
+        self.entities['flask'] = scene_manager.load_asset('flask', position=(-1, 0, 0))
+        self.entities['test_tube'] = scene_manager.load_asset('test_tube', position=(1, 0, 0))
@@ -0,0 +1,17 @@
+from ursina import *
+
+from .base import Experiment
+
+
+class AtmosphereExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Atmospheric layers
+        self.entities['earth_surface'] = Entity(parent=scene_manager, model='sphere', scale=10, position=(0, -6, 0), color=color.green)
+        self.entities['balloon'] = Entity(parent=scene_manager, model='sphere', scale=0.5, position=(0, 0, 0), color=color.white)
+        self.altitude = 0
+
+    def update(self, dt):
+        # Balloon rises
+        if self.altitude < 10:
+            self.altitude += dt * 0.5
+            self.entities['balloon'].y = self.altitude
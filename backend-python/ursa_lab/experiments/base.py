@@ -0,0 +1,17 @@
+class Experiment:
+    """One 3D experiment: builds its entities once, then advances per frame.
+
+    Per-experiment state lives on the instance, so experiments no longer
+    share (or clobber) attributes on SimulationLogic.
+    """
+
+    def __init__(self):
+        self.entities = {}
+        self.time = 0
+
+    def setup(self, scene_manager):
+        raise NotImplementedError
+
+    def update(self, dt):
+        # Static scenes (apparatus, safety, ...) have nothing to animate
+        pass
@@ -0,0 +1,23 @@
+import numpy as np
+from ursina import *
+
+from .base import Experiment
+
+
+class CellExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Cell Membrane
+        self.entities['membrane'] = Entity(parent=scene_manager, model='sphere', scale=5, position=(0, 4.5, 0), color=color.azure.with_alpha(0.2))
+
+        # Nucleus
+        self.entities['nucleus'] = Entity(parent=self.entities['membrane'], model='sphere', scale=0.4, position=(0, 0, 0), color=color.magenta)
+
+        # Mitochondria
+        for i in range(3):
+            self.entities[f'mitochondrion_{i}'] = Entity(parent=self.entities['membrane'], model='sphere', scale=0.15, position=(np.random.uniform(-0.4, 0.4), np.random.uniform(-0.4, 0.4), np.random.uniform(-0.4, 0.4)), color=color.orange)
+
+    def update(self, dt):
+        # Subtle animation of organelles
+        for i in range(3):
+            self.entities[f'mitochondrion_{i}'].rotation_y += dt * 20
+            self.entities[f'mitochondrion_{i}'].position += Vec3(np.sin(self.time + i) * 0.001, 0, np.cos(self.time + i) * 0.001)
@@ -0,0 +1,29 @@
+from ursina import *
+
+from .base import Experiment
+
+
+class ChemistryMixExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Beaker
+        self.entities['beaker'] = scene_manager.load_asset('beaker', position=(0, 0, 0))
+        self.entities['beaker'].color = color.white.with_alpha(0.5)
+
+        # Fluid inside
+        self.entities['fluid'] = Entity(parent=self.entities['beaker'], model='cube', scale=(0.8, 0.1, 0.8), position=(0, 0.1, 0), color=color.cyan)
+
+        self.reaction_progress = 0
+
+    def update(self, dt):
+        # Simple color change simulation
+        self.reaction_progress += dt * 0.5
+        if self.reaction_progress > 1: self.reaction_progress = 1
+
+        # Interpolate color from Cyan to Purple
+        start_col = Vec3(0, 1, 1) # Cyan
+        end_col = Vec3(0.5, 0, 0.5) # Purple
+        current = start_col + (end_col - start_col) * self.reaction_progress
+
+        self.entities['fluid'].color = color.rgb(current.x, current.y, current.z)
+        self.entities['fluid'].scale_y = 0.1 + self.reaction_progress * 1.5 # Expand
+        self.entities['fluid'].y = self.entities['fluid'].scale_y / 2
@@ -0,0 +1,21 @@
+from ursina import *
+
+from .base import Experiment
+
+
+class CircuitExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Battery
+        self.entities['battery'] = Entity(parent=scene_manager, model='cube', scale=(0.5, 1, 0.2), position=(-2, 2.5, 0), color=color.red)
+
+        # Resistor
+        self.entities['resistor'] = Entity(parent=scene_manager, model='cylinder', scale=(0.2, 0.5, 0.2), position=(2, 2.5, 0), color=color.orange)
+
+        # Wires (simplified as thin cubes)
+        self.entities['wire1'] = Entity(parent=scene_manager, model='cube', scale=(2, 0.05, 0.05), position=(0, 3, 0), color=color.black)
+        self.entities['wire2'] = Entity(parent=scene_manager, model='cube', scale=(2, 0.05, 0.05), position=(0, 2, 0), color=color.black)
+
+        # Circuit state
+        self.voltage = 5.0  # Volts
+        self.resistance = 10.0  # Ohms
+        self.current = self.voltage / self.resistance  # Amperes (Ohm's Law)
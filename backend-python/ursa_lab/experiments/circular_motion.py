@@ -0,0 +1,17 @@
+import numpy as np
+from ursina import *
+
+from .base import Experiment
+
+
+class CircularMotionExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Whirling bung
+        self.entities['bung'] = Entity(parent=scene_manager, model='sphere', scale=0.3, position=(2, 5, 0), color=color.red)
+        self.angle_rot = 0
+        self.radius = 2.0
+
+    def update(self, dt):
+        self.angle_rot += dt * 5
+        self.entities['bung'].x = np.cos(self.angle_rot) * self.radius
+        self.entities['bung'].z = np.sin(self.angle_rot) * self.radius
@@ -0,0 +1,17 @@
+from ursina import *
+
+from .base import Experiment
+
+
+class Co2TestExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Test tube with limewater
+        self.entities['test_tube'] = scene_manager.load_asset('test_tube', position=(0, 0, 0))
+        self.entities['limewater'] = Entity(parent=self.entities['test_tube'], model='cube', scale=(0.4, 3, 0.4), position=(0, 1.5, 0), color=color.white.with_alpha(0.1))
+        self.co2_progress = 0
+
+    def update(self, dt):
+        self.co2_progress += dt * 0.1
+        if self.co2_progress < 1:
+            # Limewater turns milky (White with increasing opacity)
+            self.entities['limewater'].color = color.white.with_alpha(0.1 + self.co2_progress * 0.8)
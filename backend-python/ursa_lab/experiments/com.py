@@ -0,0 +1,17 @@
+import numpy as np
+from ursina import *
+
+from .base import Experiment
+
+
+class ComExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Center of Mass cutout
+        self.entities['cutout'] = Entity(parent=scene_manager, model='cube', scale=(2, 2, 0.1), position=(0, 4, 0), color=color.orange)
+        self.entities['pivot_pin'] = Entity(parent=scene_manager, model='cylinder', scale=(0.05, 0.2, 0.05), position=(0, 4.8, 0), color=color.black)
+        self.com_point = Vec3(0, 0, 0)
+
+    def update(self, dt):
+        # Rock back and forth until settled
+        angle = np.sin(self.time * 2) * 5 * max(0, 1 - self.time/5)
+        self.entities['cutout'].rotation_z = angle
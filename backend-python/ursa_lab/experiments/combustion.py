@@ -0,0 +1,24 @@
+from ursina import *
+
+from .base import Experiment
+
+
+class CombustionExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Candle on table
+        self.entities['candle'] = Entity(parent=scene_manager, model='cylinder', scale=(0.5, 2, 0.5), position=(0, 3, 0), color=color.white)
+        self.entities['flame'] = Entity(parent=self.entities['candle'], model='sphere', scale=0.3, position=(0, 0.6, 0), color=color.orange)
+        # Glass jar (hidden initially)
+        self.entities['jar'] = Entity(parent=scene_manager, model='cylinder', scale=(2, 4, 2), position=(0, 10, 0), color=color.white.with_alpha(0.2))
+        self.jar_lowered = False
+
+    def update(self, dt):
+        if self.time > 5 and not self.jar_lowered:
+            self.entities['jar'].y = 4.5
+            self.jar_lowered = True
+
+        if self.jar_lowered:
+            # Extinguish flame
+            self.entities['flame'].scale *= (1 - dt * 0.5)
+            if self.entities['flame'].scale_x < 0.01:
+                self.entities['flame'].enabled = False
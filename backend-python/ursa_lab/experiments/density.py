@@ -0,0 +1,10 @@
+from .base import Experiment
+from .mass import MassExperiment
+from .volume import VolumeExperiment
+
+
+class DensityExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Scale and cylinder
+        MassExperiment.setup(self, scene_manager)
+        VolumeExperiment.setup(self, scene_manager)
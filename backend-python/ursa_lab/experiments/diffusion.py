@@ -0,0 +1,23 @@
+from ursina import *
+
+from .base import Experiment
+
+
+class DiffusionExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Beaker of water
+        self.entities['beaker'] = scene_manager.load_asset('beaker', position=(0, 0, 0))
+        self.entities['water'] = Entity(parent=self.entities['beaker'], model='cube', scale=(0.9, 0.8, 0.9), position=(0, 0.4, 0), color=color.azure.with_alpha(0.3))
+
+        # Crystal
+        self.entities['crystal'] = Entity(parent=self.entities['beaker'], model='sphere', scale=0.1, position=(0, 0.1, 0), color=color.purple)
+        self.diffusion_progress = 0
+
+    def update(self, dt):
+        self.diffusion_progress += dt * 0.1
+        if self.diffusion_progress < 1:
+            # Color water
+            col = color.azure.with_alpha(0.3).lerp(color.purple.with_alpha(0.5), self.diffusion_progress)
+            self.entities['water'].color = col
+            # Shrink crystal
+            self.entities['crystal'].scale = max(0, 0.1 * (1 - self.diffusion_progress))
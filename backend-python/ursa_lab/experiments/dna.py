@@ -0,0 +1,32 @@
+import numpy as np
+from ursina import *
+
+from .base import Experiment
+
+
+class DnaExperiment(Experiment):
+    def setup(self, scene_manager):
+        # DNA Double Helix center
+        helix_center = Entity(parent=scene_manager, position=(0, 4.5, 0))
+        self.entities['helix_center'] = helix_center
+
+        self.dna_segments = []
+        for i in range(20):
+            y = i * 0.4 - 4
+            angle = i * 0.5
+
+            # Strand 1
+            s1 = Entity(parent=helix_center, model='sphere', scale=0.2, position=(np.cos(angle), y, np.sin(angle)), color=color.blue)
+            # Strand 2
+            s2 = Entity(parent=helix_center, model='sphere', scale=0.2, position=(np.cos(angle + np.pi), y, np.sin(angle + np.pi)), color=color.red)
+            # Link
+            link = Entity(parent=helix_center, model='cube', scale=(2, 0.05, 0.05), position=(0, y, 0), color=color.white)
+            link.rotation_y = -np.degrees(angle)
+
+            self.dna_segments.extend([s1, s2, link])
+
+        self.dna_rotation_speed = 30
+
+    def update(self, dt):
+        # Rotate helix
+        self.entities['helix_center'].rotation_y += dt * self.dna_rotation_speed
@@ -0,0 +1,18 @@
+import numpy as np
+from ursina import *
+
+from .base import Experiment
+
+
+class EarthStructureExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Nested spheres for cross-section
+        self.entities['crust'] = Entity(parent=scene_manager, model='sphere', scale=5, position=(0, 5, 0), color=color.brown.with_alpha(0.5))
+        self.entities['mantle'] = Entity(parent=self.entities['crust'], model='sphere', scale=0.8, color=color.orange)
+        self.entities['outer_core'] = Entity(parent=self.entities['mantle'], model='sphere', scale=0.6, color=color.red)
+        self.entities['inner_core'] = Entity(parent=self.entities['outer_core'], model='sphere', scale=0.3, color=color.yellow)
+
+    def update(self, dt):
+        # Pulse layers
+        s = 1 + np.sin(self.time) * 0.05
+        self.entities['inner_core'].scale = 0.3 * s
@@ -0,0 +1,11 @@
+from ursina import *
+
+from .base import Experiment
+
+
+class EquilibriumExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Stable, Unstable, Neutral
+        self.entities['stable_cone'] = Entity(parent=scene_manager, model='cone', scale=(1, 1.5, 1), position=(-2, 2, 0), color=color.green)
+        self.entities['unstable_cone'] = Entity(parent=scene_manager, model='cone', scale=(1, 1.5, 1), position=(0, 2, 0), rotation_x=180, color=color.red)
+        self.entities['neutral_sphere'] = Entity(parent=scene_manager, model='sphere', scale=1, position=(2, 2, 0), color=color.blue)
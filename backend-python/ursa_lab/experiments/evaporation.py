@@ -0,0 +1,21 @@
+from ursina import *
+
+from .base import Experiment
+
+
+class EvaporationExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Evaporating dish on tripod
+        self.entities['dish'] = Entity(parent=scene_manager, model='sphere', scale=(2, 0.5, 2), position=(0, 2.5, 0), color=color.white)
+        self.entities['tripod'] = Entity(parent=scene_manager, model='cube', scale=(2, 2, 2), position=(0, 1, 0), color=color.gray)
+
+        # Salt solution
+        self.entities['solution'] = Entity(parent=self.entities['dish'], model='cube', scale=(0.8, 0.1, 0.8), position=(0, 0.05, 0), color=color.azure.with_alpha(0.5))
+        self.evap_progress = 0
+
+    def update(self, dt):
+        self.evap_progress += dt * 0.1
+        if self.evap_progress < 1:
+            # Shrink solution
+            self.entities['solution'].scale_y = 0.1 * (1 - self.evap_progress)
+            self.entities['solution'].y = 0.05 * (1 - self.evap_progress)
@@ -0,0 +1,19 @@
+from ursina import *
+
+from .base import Experiment
+
+
+class FiltrationExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Beaker below
+        self.entities['beaker_bottom'] = scene_manager.load_asset('beaker', position=(0, 0, 0))
+        # Funnel above
+        self.entities['funnel'] = Entity(parent=scene_manager, model='cone', scale=(1.5, 1.5, 1.5), position=(0, 3.5, 0), color=color.white.with_alpha(0.5))
+        self.entities['funnel'].rotation_x = 180
+
+        # Filter Paper
+        self.entities['filter'] = Entity(parent=self.entities['funnel'], model='cone', scale=(0.95, 0.95, 0.95), position=(0, 0, 0), color=color.white)
+
+    def update(self, dt):
+        # Drop water from funnel to beaker
+        pass # Visual logic
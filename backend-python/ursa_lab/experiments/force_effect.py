@@ -0,0 +1,17 @@
+import numpy as np
+from ursina import *
+
+from .base import Experiment
+
+
+class ForceEffectExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Foam block
+        self.entities['foam'] = Entity(parent=scene_manager, model='cube', scale=(2, 2, 2), position=(0, 3, 0), color=color.white)
+        self.force_applied = 0
+
+    def update(self, dt):
+        # Squash foam
+        self.force_applied = np.sin(self.time) * 1.5
+        val = max(0.5, 2 - self.force_applied)
+        self.entities['foam'].scale_y = val
@@ -0,0 +1,22 @@
+from ursina import *
+
+from .base import Experiment
+
+
+class FreeFallExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Tower and ball
+        self.entities['tower'] = Entity(parent=scene_manager, model='cube', scale=(0.2, 10, 0.2), position=(-2, 5, 0), color=color.gray)
+        self.entities['ball'] = Entity(parent=scene_manager, model='sphere', scale=0.3, position=(-2, 10, 0), color=color.white)
+        self.falling = False
+        self.fall_time = 0
+
+    def update(self, dt):
+        if self.falling:
+            self.fall_time += dt
+            # s = 0.5 g t^2
+            dist = 0.5 * self.gravity * self.fall_time**2
+            self.entities['ball'].y = 10 - dist
+            if self.entities['ball'].y < 2:
+                self.entities['ball'].y = 2
+                self.falling = False
@@ -0,0 +1,18 @@
+from ursina import *
+
+from .base import Experiment
+
+
+class FrictionExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Surface and block
+        self.entities['surface'] = Entity(parent=scene_manager, model='cube', scale=(10, 0.1, 1), position=(0, 2, 0), color=color.gray)
+        self.entities['block'] = Entity(parent=scene_manager, model='cube', scale=(0.5, 0.5, 0.5), position=(-4.5, 2.3, 0), color=color.brown)
+        self.mu = 0.5 # friction coefficient
+
+    def update(self, dt):
+        # Constant speed pull
+        if self.entities['block'].x < 4.5:
+            self.entities['block'].x += dt * 2
+        else:
+            self.entities['block'].x = -4.5
@@ -0,0 +1,12 @@
+from .weight import WeightExperiment
+
+
+class HookesLawExperiment(WeightExperiment):
+    def setup(self, scene_manager):
+        # Spring on stand
+        super().setup(scene_manager)
+        self.k = 10.0 # spring constant
+
+    def update(self, dt):
+        # The spring stays at rest until a load is hung
+        pass
@@ -0,0 +1,17 @@
+from ursina import *
+
+from .base import Experiment
+
+
+class IndicatorsExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Beaker of cabbage indicator
+        self.entities['beaker'] = scene_manager.load_asset('beaker', position=(0, 0, 0))
+        self.entities['indicator'] = Entity(parent=self.entities['beaker'], model='cube', scale=(0.8, 0.5, 0.8), position=(0, 0.25, 0), color=color.purple)
+        self.reaction_progress = 0
+
+    def update(self, dt):
+        self.reaction_progress += dt * 0.2
+        if self.reaction_progress < 1:
+            # Change cabbage color based on "simulated" acid addition
+            self.entities['indicator'].color = color.purple.lerp(color.pink, self.reaction_progress)
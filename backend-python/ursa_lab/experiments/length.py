@@ -0,0 +1,17 @@
+import numpy as np
+from ursina import *
+
+from .base import Experiment
+
+
+class LengthExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Meter rule and calipers
+        self.entities['rule'] = Entity(parent=scene_manager, model='cube', scale=(10, 0.1, 0.5), position=(0, 2, 1), color=color.yellow)
+        self.entities['caliper_main'] = Entity(parent=scene_manager, model='cube', scale=(5, 0.5, 0.1), position=(0, 2.2, 0), color=color.gray)
+        self.entities['caliper_jaw'] = Entity(parent=self.entities['caliper_main'], model='cube', scale=(0.1, 1, 1), position=(-2.5, 0, 0), color=color.light_gray)
+        self.measurement_val = 0
+
+    def update(self, dt):
+        # Animate caliper jaw
+        self.entities['caliper_jaw'].x = -2.5 + (np.sin(self.time) + 1) * 2.5
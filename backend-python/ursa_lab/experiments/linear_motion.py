@@ -0,0 +1,20 @@
+from ursina import *
+
+from .base import Experiment
+
+
+class LinearMotionExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Track and cart
+        self.entities['track'] = Entity(parent=scene_manager, model='cube', scale=(10, 0.1, 1), position=(0, 2, 0), color=color.gray)
+        self.entities['cart'] = Entity(parent=scene_manager, model='cube', scale=(0.5, 0.3, 0.5), position=(-4.5, 2.2, 0), color=color.red)
+        self.velocity = 0
+        self.acceleration = 1.0 # m/s^2
+
+    def update(self, dt):
+        if self.entities['cart'].x < 4.5:
+            self.velocity += self.acceleration * dt
+            self.entities['cart'].x += self.velocity * dt
+        else:
+            self.entities['cart'].x = -4.5 # Reset
+            self.velocity = 0
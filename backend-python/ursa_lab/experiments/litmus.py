@@ -0,0 +1,27 @@
+from ursina import *
+
+from .base import Experiment
+
+
+class LitmusExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Two beakers with solutions
+        self.entities['beaker_acid'] = scene_manager.load_asset('beaker', position=(-1, 0, 0))
+        self.entities['beaker_base'] = scene_manager.load_asset('beaker', position=(1, 0, 0))
+        # Solutions
+        self.entities['acid'] = Entity(parent=self.entities['beaker_acid'], model='cube', scale=(0.8, 0.5, 0.8), position=(0, 0.25, 0), color=color.white.with_alpha(0.3))
+        self.entities['base'] = Entity(parent=self.entities['beaker_base'], model='cube', scale=(0.8, 0.5, 0.8), position=(0, 0.25, 0), color=color.white.with_alpha(0.3))
+        # Litmus papers
+        self.entities['litmus_blue'] = Entity(parent=scene_manager, model='cube', scale=(0.2, 1, 0.01), position=(-0.5, 4, 0), color=color.blue)
+        self.entities['litmus_red'] = Entity(parent=scene_manager, model='cube', scale=(0.2, 1, 0.01), position=(0.5, 4, 0), color=color.red)
+
+    def update(self, dt):
+        # Dip litmus red into base, dip litmus blue into acid
+        if self.time > 3:
+            # Dip litmus
+            self.entities['litmus_blue'].y = 2.5
+            self.entities['litmus_red'].y = 2.5
+        if self.time > 6:
+            # Change colors
+            self.entities['litmus_blue'].color = color.red
+            self.entities['litmus_red'].color = color.blue
@@ -0,0 +1,19 @@
+from ursina import *
+
+from .base import Experiment
+
+
+class MassExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Electronic balance
+        self.entities['balance'] = Entity(parent=scene_manager, model='cube', scale=(2, 0.5, 2), position=(0, 2.25, 0), color=color.white)
+        self.entities['plate'] = Entity(parent=self.entities['balance'], model='cylinder', scale=(1.8, 0.1, 1.8), position=(0, 0.3, 0), color=color.light_gray)
+        self.entities['object'] = Entity(parent=scene_manager, model='sphere', scale=0.5, position=(0, 3, 0), color=color.orange)
+        self.mass_val = 500 # grams
+
+    def update(self, dt):
+        # Drop object onto plate
+        if self.entities['object'].y > 2.7:
+            self.entities['object'].y -= dt * 5
+        else:
+            self.entities['object'].y = 2.7 # Settled
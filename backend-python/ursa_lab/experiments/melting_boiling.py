@@ -0,0 +1,27 @@
+import numpy as np
+from ursina import *
+
+from .base import Experiment
+
+
+class MeltingBoilingExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Beaker on Tripod
+        self.entities['beaker'] = scene_manager.load_asset('beaker', position=(0, 0, 0))
+        self.entities['tripod'] = Entity(parent=scene_manager, model='cube', scale=(2, 2, 2), position=(0, 1, 0), color=color.gray)
+        self.entities['burner'] = Entity(parent=scene_manager, model='cylinder', scale=(0.5, 1, 0.5), position=(0, 0.5, 0), color=color.blue)
+
+        # Ice/Water
+        self.entities['content'] = Entity(parent=self.entities['beaker'], model='cube', scale=(0.8, 0.4, 0.8), position=(0, 0.2, 0), color=color.white)
+        self.temp = 0
+        self.state = 'solid'
+
+    def update(self, dt):
+        self.temp += dt * 5
+        if self.state == 'solid' and self.temp > 50:
+            self.state = 'liquid'
+            self.entities['content'].color = color.azure.with_alpha(0.3)
+            self.entities['content'].scale_y = 0.3
+        elif self.state == 'liquid' and self.temp > 100:
+            # Boiling (Bubbles)
+            self.entities['content'].y += np.sin(self.time * 20) * 0.01
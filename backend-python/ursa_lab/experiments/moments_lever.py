@@ -0,0 +1,14 @@
+from ursina import *
+
+from .base import Experiment
+
+
+class MomentsLeverExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Spanner and bolt
+        self.entities['bolt'] = Entity(parent=scene_manager, model='cylinder', scale=(0.5, 0.2, 0.5), position=(0, 3, 0), rotation_x=90, color=color.gray)
+        self.entities['spanner'] = Entity(parent=self.entities['bolt'], model='cube', scale=(0.2, 4, 0.1), position=(0, 2, 0), color=color.light_gray)
+
+    def update(self, dt):
+        # Rotate spanner
+        self.entities['bolt'].rotation_z += dt * 30
@@ -0,0 +1,58 @@
+import os
+import sys
+import numpy as np
+from ursina import *
+
+# Share the nonlinear pendulum integrator with the REST physics engine
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from simulations.pendulum_solver import step_pendulum
+
+from .base import Experiment
+
+
+class PendulumExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Create Pivot - make it more visible
+        pivot = Entity(parent=scene_manager, model='sphere', scale=0.3, position=(0, 6, 0), color=color.dark_gray)
+
+        # Rod and Bob - make them larger and more colorful
+        self.entities['bob'] = Entity(parent=scene_manager, model='sphere', scale=0.8, color=color.red)
+        self.entities['rod'] = Entity(parent=scene_manager, model='cube', scale=(0.1, 1, 0.1), color=color.black)
+
+        # Add a visual support structure
+        support = Entity(parent=scene_manager, model='cube', scale=(4, 0.2, 0.2), position=(0, 6, 0), color=color.brown)
+
+        # Initial Physics State
+        self.length = 3.0
+        self.angle = np.pi / 4 # 45 degrees
+        self.angular_velocity = 0
+        self.gravity = 9.81
+        self.damping = 0.06 # 1/s, roughly the old 0.999-per-frame decay at 60 FPS
+        self.pivot_pos = Vec3(0, 6, 0)
+
+        self.update_pendulum_visuals()
+
+    def update(self, dt):
+        # Full nonlinear equation with damping: alpha = -(g/L) sin(theta) - b*omega
+        self.angle, self.angular_velocity = step_pendulum(
+            self.angle, self.angular_velocity, dt, self.length,
+            damping=self.damping, g=self.gravity
+        )
+
+        self.update_pendulum_visuals()
+
+    def update_pendulum_visuals(self):
+        # Polar to Cartesian
+        x = self.length * np.sin(self.angle)
+        y = -self.length * np.cos(self.angle)
+
+        bob_pos = self.pivot_pos + Vec3(x, y, 0)
+        self.entities['bob'].position = bob_pos
+
+        # Update Rod
+        rod_vec = bob_pos - self.pivot_pos
+        rod_len = rod_vec.length()
+        self.entities['rod'].scale_y = rod_len
+        self.entities['rod'].position = self.pivot_pos + rod_vec / 2
+        self.entities['rod'].look_at(bob_pos)
+        self.entities['rod'].rotation_x += 90 # Adjust for cylinder default orientation if needed
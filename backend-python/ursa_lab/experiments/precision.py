@@ -0,0 +1,10 @@
+from ursina import *
+
+from .base import Experiment
+
+
+class PrecisionExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Targets and marks
+        self.entities['target'] = Entity(parent=scene_manager, model='cylinder', scale=(3, 0.1, 3), position=(0, 5, 0), rotation_x=90, color=color.white)
+        self.shots = []
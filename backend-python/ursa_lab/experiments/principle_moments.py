@@ -0,0 +1,15 @@
+import numpy as np
+from ursina import *
+
+from .base import Experiment
+
+
+class PrincipleMomentsExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Balanced rule
+        self.entities['fulcrum'] = Entity(parent=scene_manager, model='cone', scale=(0.5, 1, 0.5), position=(0, 2.5, 0), color=color.gray)
+        self.entities['rule'] = Entity(parent=scene_manager, model='cube', scale=(10, 0.1, 0.5), position=(0, 3.05, 0), color=color.yellow)
+
+    def update(self, dt):
+        # Oscillate slightly
+        self.entities['rule'].rotation_z = np.sin(self.time) * 2
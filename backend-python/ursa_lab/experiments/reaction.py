@@ -0,0 +1,36 @@
+from ursina import *
+
+from .base import Experiment
+
+
+class ReactionExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Two Beakers
+        self.entities['beaker1'] = scene_manager.load_asset('beaker', position=(-1, 0, 0))
+        self.entities['beaker2'] = scene_manager.load_asset('beaker', position=(1, 0, 0))
+
+        # Reactants
+        self.entities['reactant1'] = Entity(parent=self.entities['beaker1'], model='cube', scale=(0.8, 0.5, 0.8), position=(0, 0.3, 0), color=color.blue)
+        self.entities['reactant2'] = Entity(parent=self.entities['beaker2'], model='cube', scale=(0.8, 0.5, 0.8), position=(0, 0.3, 0), color=color.yellow)
+
+        self.reaction_time = 0
+        self.mixed = False
+
+    def update(self, dt):
+        # Simulation of mixing and reacting
+        if not self.mixed:
+            # Slowly move beaker 1 towards beaker 2
+            self.entities['beaker1'].x += dt * 0.5
+            if self.entities['beaker1'].x >= 0:
+                self.entities['beaker1'].x = 0
+                self.mixed = True
+        else:
+            self.reaction_time += dt
+            # Change color from Blue to Green
+            progress = min(1, self.reaction_time / 3)
+            start_col = Vec3(0, 0, 1) # Blue
+            end_col = Vec3(0, 1, 0) # Green
+            current = start_col + (end_col - start_col) * progress
+            self.entities['reactant1'].color = color.rgb(current.x, current.y, current.z)
+            # Hide reactant 2 (poured in)
+            self.entities['reactant2'].enabled = False
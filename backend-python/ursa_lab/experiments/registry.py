@@ -0,0 +1,71 @@
+import importlib
+
+# experiment type -> "module:Class" inside this package. Modules are only
+# imported the first time their experiment is requested, so launching one
+# experiment does not import (or parse) the other forty.
+EXPERIMENTS = {
+    "pendulum": "pendulum:PendulumExperiment",
+    "chemistry_mix": "chemistry_mix:ChemistryMixExperiment",
+    "circuit": "circuit:CircuitExperiment",
+    "titration": "titration:TitrationExperiment",
+    "reaction": "reaction:ReactionExperiment",
+    "cell": "cell:CellExperiment",
+    "dna": "dna:DnaExperiment",
+    "melting_boiling": "melting_boiling:MeltingBoilingExperiment",
+    "diffusion": "diffusion:DiffusionExperiment",
+    "filtration": "filtration:FiltrationExperiment",
+    "evaporation": "evaporation:EvaporationExperiment",
+    "combustion": "combustion:CombustionExperiment",
+    "co2_test": "co2_test:Co2TestExperiment",
+    "solvent": "solvent:SolventExperiment",
+    "water_filtration": "water_filtration:WaterFiltrationExperiment",
+    "litmus": "litmus:LitmusExperiment",
+    "indicators": "indicators:IndicatorsExperiment",
+    "apparatus_id": "apparatus_id:ApparatusIdExperiment",
+    "safety": "safety:SafetyExperiment",
+    "workflow": "workflow:WorkflowExperiment",
+    "length": "length:LengthExperiment",
+    "mass": "mass:MassExperiment",
+    "volume": "volume:VolumeExperiment",
+    "time_meas": "time_meas:TimeMeasExperiment",
+    "weight": "weight:WeightExperiment",
+    "density": "density:DensityExperiment",
+    "precision": "precision:PrecisionExperiment",
+    "com": "com:ComExperiment",
+    "equilibrium": "equilibrium:EquilibriumExperiment",
+    "linear_motion": "linear_motion:LinearMotionExperiment",
+    "free_fall": "free_fall:FreeFallExperiment",
+    "force_effect": "force_effect:ForceEffectExperiment",
+    "friction": "friction:FrictionExperiment",
+    "hookes_law": "hookes_law:HookesLawExperiment",
+    "circular_motion": "circular_motion:CircularMotionExperiment",
+    "moments_lever": "moments_lever:MomentsLeverExperiment",
+    "principle_moments": "principle_moments:PrincipleMomentsExperiment",
+    "solar_system": "solar_system:SolarSystemExperiment",
+    "earth_structure": "earth_structure:EarthStructureExperiment",
+    "atmosphere": "atmosphere:AtmosphereExperiment",
+}
+
+_classes = {}
+
+
+def get_experiment_class(experiment_type):
+    cls = _classes.get(experiment_type)
+    if cls is None:
+        target = EXPERIMENTS.get(experiment_type)
+        if target is None:
+            return None
+        module_name, class_name = target.split(':')
+        module = importlib.import_module(f'.{module_name}', __package__)
+        cls = _classes[experiment_type] = getattr(module, class_name)
+    return cls
+
+
+def create_experiment(experiment_type):
+    """Instantiate the experiment registered under experiment_type, or None."""
+    cls = get_experiment_class(experiment_type)
+    return cls() if cls is not None else None
+
+
+def available_experiments():
+    return list(EXPERIMENTS)
@@ -0,0 +1,12 @@
+from ursina import *
+
+from .base import Experiment
+
+
+class SafetyExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Fire extinguisher, goggles, bin
+        self.entities['extinguisher'] = Entity(parent=scene_manager, model='cylinder', scale=(0.3, 0.8, 0.3), position=(-2, 2.5, 0), color=color.red)
+        self.entities['goggles'] = Entity(parent=scene_manager, model='cube', scale=(0.5, 0.3, 0.2), position=(0, 2.3, 0), color=color.azure)
+        self.entities['bin'] = Entity(parent=scene_manager, model='cube', scale=(1, 1, 1), position=(2, 0.5, 0), color=color.dark_gray)
+        self.safety_score = 100
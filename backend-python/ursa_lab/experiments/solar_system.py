@@ -0,0 +1,20 @@
+from ursina import *
+
+from .base import Experiment
+
+
+class SolarSystemExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Sun, Earth, Moon
+        self.entities['sun'] = Entity(parent=scene_manager, model='sphere', scale=2, position=(0, 5, 0), color=color.yellow)
+        self.entities['sun_light'] = PointLight(parent=self.entities['sun'], position=(0,0,0), color=color.white)
+
+        self.entities['earth_pivot'] = Entity(parent=scene_manager, position=(0, 5, 0))
+        self.entities['earth'] = Entity(parent=self.entities['earth_pivot'], model='sphere', scale=0.8, position=(5, 0, 0), color=color.blue)
+
+        self.entities['moon_pivot'] = Entity(parent=self.entities['earth'], position=(0, 0, 0))
+        self.entities['moon'] = Entity(parent=self.entities['moon_pivot'], model='sphere', scale=0.2, position=(1.5, 0, 0), color=color.gray)
+
+    def update(self, dt):
+        self.entities['earth_pivot'].rotation_y += dt * 10
+        self.entities['moon_pivot'].rotation_y += dt * 50
@@ -0,0 +1,25 @@
+import numpy as np
+from ursina import *
+
+from .base import Experiment
+
+
+class SolventExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Beaker of water
+        self.entities['beaker'] = scene_manager.load_asset('beaker', position=(0, 0, 0))
+        self.entities['water'] = Entity(parent=self.entities['beaker'], model='cube', scale=(0.9, 0.8, 0.9), position=(0, 0.4, 0), color=color.azure.with_alpha(0.3))
+        # Salt/Sugar particles
+        self.particles = []
+        for i in range(10):
+            p = Entity(parent=self.entities['water'], model='cube', scale=0.05, position=(np.random.uniform(-0.4, 0.4), 0.4, np.random.uniform(-0.4, 0.4)), color=color.white)
+            self.particles.append(p)
+        self.dissolve_progress = 0
+
+    def update(self, dt):
+        self.dissolve_progress += dt * 0.2
+        for i, p in enumerate(self.particles):
+            if self.dissolve_progress > (i / 10):
+                p.enabled = False
+        if self.dissolve_progress > 1:
+            self.entities['water'].color = color.white.with_alpha(0.5)
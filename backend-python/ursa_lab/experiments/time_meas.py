@@ -0,0 +1,17 @@
+from ursina import *
+
+from .base import Experiment
+
+
+class TimeMeasExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Digital and analog clock
+        self.entities['clock_face'] = Entity(parent=scene_manager, model='cylinder', scale=(2, 0.1, 2), position=(0, 4, 0), rotation_x=90, color=color.white)
+        self.entities['hand'] = Entity(parent=self.entities['clock_face'], model='cube', scale=(0.05, 0.8, 0.05), position=(0, 0.1, 0), color=color.red)
+        self.counting = False
+        self.elapsed = 0
+
+    def update(self, dt):
+        if self.counting:
+            self.elapsed += dt
+            self.entities['hand'].rotation_z = -self.elapsed * 6 # 360 deg per minute
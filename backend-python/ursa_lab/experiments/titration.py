@@ -0,0 +1,32 @@
+from ursina import *
+
+from .base import Experiment
+
+
+class TitrationExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Beaker (Conical Flask)
+        self.entities['beaker'] = scene_manager.load_asset('flask', position=(0, 0, 0))
+        self.entities['beaker'].color = color.white.with_alpha(0.3)
+
+        # Burette (Stand + Tube)
+        self.entities['burette_stand'] = Entity(parent=scene_manager, model='cube', scale=(0.1, 8, 0.1), position=(-1, 4, 0), color=color.gray)
+        self.entities['burette'] = Entity(parent=scene_manager, model='cylinder', scale=(0.1, 4, 0.1), position=(0, 5, 0), color=color.white.with_alpha(0.5))
+
+        # Fluid in Flask (Initially Base + Indicator)
+        self.entities['fluid'] = Entity(parent=self.entities['beaker'], model='cube', scale=(2, 0.5, 2), position=(0, 0.25, 0), color=color.magenta)
+
+        self.titration_progress = 0
+
+    def update(self, dt):
+        # Simulation of adding acid to base
+        self.titration_progress += dt * 0.2
+        if self.titration_progress > 1: self.titration_progress = 1
+
+        # Fluid color changes from Magenta (Base+Phenolphthalein) to Clear (Neutral/Acid)
+        current_alpha = 1.0 - self.titration_progress
+        self.entities['fluid'].color = color.magenta.with_alpha(max(0.1, current_alpha))
+
+        # Level rises slightly
+        self.entities['fluid'].scale_y = 0.5 + self.titration_progress * 0.5
+        self.entities['fluid'].y = 0.25 + (self.entities['fluid'].scale_y - 0.5) / 2
@@ -0,0 +1,22 @@
+from ursina import *
+
+from .base import Experiment
+
+
+class VolumeExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Cylinder and overflow can
+        self.entities['cylinder'] = Entity(parent=scene_manager, model='cylinder', scale=(1, 5, 1), position=(-2, 4.5, 0), color=color.azure.with_alpha(0.3))
+        self.entities['water'] = Entity(parent=self.entities['cylinder'], model='cube', scale=(0.9, 0.4, 0.9), position=(0, -0.1, 0), color=color.blue.with_alpha(0.5))
+        self.entities['stone'] = Entity(parent=scene_manager, model='sphere', scale=0.3, position=(-2, 8, 0), color=color.gray, collider='sphere')
+        self.volume_val = 0
+
+    def update(self, dt):
+        # Stone falling into water
+        if self.entities['stone'].y > 4.5:
+            self.entities['stone'].y -= dt * 2
+        else:
+            # Water rises
+            if self.entities['water'].scale_y < 0.6:
+                self.entities['water'].scale_y += dt * 0.1
+                self.entities['water'].y += dt * 0.05
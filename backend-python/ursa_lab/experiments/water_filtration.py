@@ -0,0 +1,16 @@
+from ursina import *
+
+from .base import Experiment
+
+
+class WaterFiltrationExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Large container
+        self.entities['container'] = Entity(parent=scene_manager, model='cylinder', scale=(2, 6, 2), position=(0, 5, 0), color=color.white.with_alpha(0.3))
+        # Layers (Charcoal, Gravel, Sand)
+        self.entities['charcoal'] = Entity(parent=self.entities['container'], model='cube', scale=(0.9, 0.1, 0.9), position=(0, -0.3, 0), color=color.black)
+        self.entities['gravel'] = Entity(parent=self.entities['container'], model='cube', scale=(0.9, 0.1, 0.9), position=(0, -0.1, 0), color=color.gray)
+        self.entities['sand'] = Entity(parent=self.entities['container'], model='cube', scale=(0.9, 0.1, 0.9), position=(0, 0.1, 0), color=color.yellow)
+        # Dirty water
+        self.entities['dirty_water'] = Entity(parent=self.entities['container'], model='cube', scale=(0.9, 0.2, 0.9), position=(0, 0.3, 0), color=color.brown)
+        self.filter_progress = 0
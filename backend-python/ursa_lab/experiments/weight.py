@@ -0,0 +1,19 @@
+from ursina import *
+
+from .base import Experiment
+
+
+class WeightExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Spring balance
+        self.entities['stand'] = Entity(parent=scene_manager, model='cube', scale=(0.1, 8, 0.1), position=(-2, 4, 0), color=color.gray)
+        self.entities['arm'] = Entity(parent=self.entities['stand'], model='cube', scale=(2, 0.1, 0.1), position=(1, 4, 0), color=color.gray)
+        self.entities['spring'] = Entity(parent=self.entities['arm'], model='cylinder', scale=(0.2, 2, 0.2), position=(1, -1, 0), color=color.orange)
+        self.entities['hook'] = Entity(parent=self.entities['spring'], model='sphere', scale=0.1, position=(0, -0.6, 0), color=color.black)
+        self.gravity = 9.81
+
+    def update(self, dt):
+        # Oscillate spring under gravity
+        extension = (self.gravity / 10.0) * 0.5
+        self.entities['spring'].scale_y = 2 + extension
+        self.entities['spring'].y = -1 - (extension / 2)
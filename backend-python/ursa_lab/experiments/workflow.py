@@ -0,0 +1,10 @@
+from ursina import *
+
+from .base import Experiment
+
+
+class WorkflowExperiment(Experiment):
+    def setup(self, scene_manager):
+        # Notebook and steps
+        self.entities['notebook'] = Entity(parent=scene_manager, model='cube', scale=(1.5, 0.1, 2), position=(0, 2, 0), color=color.white)
+        self.workflow_step = 0
@@ -0,0 +1,93 @@
+"""
+Headless, deterministic stepping of the 3D experiments.
+
+Runs SimulationLogic.update() with a fixed dt and no window so simulation
+cost can be measured (and regression-tested) on machines without a
+display. Rendering is not exercised; only experiment setup and per-frame
+update logic are timed.
+"""
+import json
+import time as time_module  # ursina exports its own `time`
+
+import numpy as np
+from ursina import *
+
+from lab_scene import LabScene
+from simulation import SimulationLogic
+from experiments.registry import available_experiments
+
+DEFAULT_STEPS = 600
+DEFAULT_DT = 1 / 60
+
+
+def _scene_entity_count():
+    return sum(1 for e in scene.entities if e is not None and not getattr(e, 'eternal', False))
+
+
+def run_experiment(experiment_type, steps=DEFAULT_STEPS, dt=DEFAULT_DT, seed=0):
+    """Set up one experiment in a fresh scene and time `steps` updates."""
+    scene.clear()
+    np.random.seed(seed)
+
+    lab = LabScene()
+    sim = SimulationLogic(experiment_type)
+    started = time_module.perf_counter()
+    sim.setup_experiment(lab)
+    setup_ms = (time_module.perf_counter() - started) * 1000
+    sim.running = True
+
+    timings = np.empty(steps)
+    for i in range(steps):
+        started = time_module.perf_counter()
+        sim.update(dt)
+        timings[i] = time_module.perf_counter() - started
+    timings *= 1000
+
+    return {
+        "experiment": experiment_type,
+        "steps": steps,
+        "dt": dt,
+        "setup_ms": round(setup_ms, 3),
+        "mean_ms": round(float(timings.mean()), 4) if steps else 0.0,
+        "p95_ms": round(float(np.percentile(timings, 95)), 4) if steps else 0.0,
+        "p99_ms": round(float(np.percentile(timings, 99)), 4) if steps else 0.0,
+        "max_ms": round(float(timings.max()), 4) if steps else 0.0,
+        "experiment_entities": len(sim.entities),
+        "scene_entities": _scene_entity_count(),
+        "simulated_seconds": round(sim.time, 4),
+    }
+
+
+def run_headless(experiment_types=None, steps=DEFAULT_STEPS, dt=DEFAULT_DT, seed=0):
+    """Step every requested experiment (all registered ones by default).
+
+    Creates a windowless Ursina app on first use; returns one result dict
+    per experiment.
+    """
+    if application.base is None:
+        Ursina(window_type='none')
+
+    results = []
+    for experiment_type in experiment_types or available_experiments():
+        try:
+            results.append(run_experiment(experiment_type, steps, dt, seed))
+        except Exception as e:
+            print(f"Headless run failed for {experiment_type}: {e}")
+            results.append({"experiment": experiment_type, "error": str(e)})
+    scene.clear()
+    return results
+
+
+def print_report(results):
+    print(f"{'experiment':<20}{'mean ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'setup ms':>10}{'entities':>10}{'scene':>8}")
+    for r in results:
+        if 'error' in r:
+            print(f"{r['experiment']:<20}  ERROR: {r['error']}")
+            continue
+        print(f"{r['experiment']:<20}{r['mean_ms']:>10.4f}{r['p95_ms']:>10.4f}{r['p99_ms']:>10.4f}"
+              f"{r['setup_ms']:>10.2f}{r['experiment_entities']:>10}{r['scene_entities']:>8}")
+
+
+def write_report(results, path):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
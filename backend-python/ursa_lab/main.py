@@ -1,14 +1,34 @@
 from ursina import *
 import sys
 import argparse
+import time as time_module  # ursina exports its own `time` (with dt)
 from lab_scene import LabScene
 from simulation import SimulationLogic
+from experiments.registry import available_experiments
 
 def main():
     parser = argparse.ArgumentParser(description='Sayansi Yathu 3D Simulation Engine')
-    parser.add_argument('--type', type=str, default='pendulum', help='Experiment type (pendulum, chemistry_mix)')
+    parser.add_argument('--type', type=str, default=None, help='Experiment type (pendulum, chemistry_mix, ...)')
+    parser.add_argument('--headless', action='store_true', help='Step experiments without a window and report update timings')
+    parser.add_argument('--steps', type=int, default=600, help='Headless: number of updates per experiment')
+    parser.add_argument('--fixed-dt', type=float, default=1 / 60, help='Headless: fixed timestep in seconds')
+    parser.add_argument('--seed', type=int, default=0, help='Headless: random seed applied before each setup')
+    parser.add_argument('--output', type=str, default=None, help='Headless: write results as JSON to this path')
     args = parser.parse_args()
 
+    if args.headless:
+        from headless import run_headless, print_report, write_report
+        # Without --type every registered experiment is stepped
+        results = run_headless([args.type] if args.type else None, args.steps, args.fixed_dt, args.seed)
+        print_report(results)
+        if args.output:
+            write_report(results, args.output)
+        sys.exit(1 if any('error' in r for r in results) else 0)
+
+    args.type = args.type or 'pendulum'
+    if args.type not in available_experiments():
+        print(f"Unknown experiment type: {args.type}")
+        sys.exit(2)
     app = Ursina(title=f"Sayansi Yathu - {args.type.capitalize()}", vsync=True, fullscreen=False)
 
     # Force window to be visible and focused
@@ -21,8 +41,7 @@ def main():
     window.focus()
     
     # Add a delay to ensure window is ready
-    import time
-    time.sleep(0.5)
+    time_module.sleep(0.5)
     
     # Setup Scene
     lab = LabScene()
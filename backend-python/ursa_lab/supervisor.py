@@ -0,0 +1,398 @@
+import logging
+import os
+import secrets
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from logging.handlers import RotatingFileHandler
+from multiprocessing.connection import Client
+from typing import Callable, Dict, List, Optional
+
+# ---------------------------------------------------------------------------
+# Process supervisor for Ursina 3D simulation windows.
+#
+# Launches return as soon as the child is spawned. A pump thread per session
+# drains the child's merged stdout/stderr into a rotating log file (so the
+# pipe can never fill up and stall the child), and a reaper thread collects
+# exit codes of finished children.
+# ---------------------------------------------------------------------------
+
+DEFAULT_LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               'logs', 'simulations')
+
+# One logger for every child; each session's file handler filters on its pid
+_child_log = logging.getLogger("sayansi.simulation")
+_child_log.propagate = False
+_child_log.setLevel(logging.INFO)
+
+
+class SessionLimitReached(Exception):
+    """Raised when max_sessions simulations are already running."""
+
+
+class SimulationSession:
+    def __init__(self, process: subprocess.Popen, sim_type: str, script_path: str, log_path: str):
+        self.process = process
+        self.pid = process.pid
+        self.sim_type = sim_type
+        self.script_path = script_path
+        self.log_path = log_path
+        self.started_at = time.time()
+        self.ended_at: Optional[float] = None
+        self.returncode: Optional[int] = None
+        self.stopped = False
+        self.warm = False  # idle pool worker, not yet serving a student
+        self.tail = deque(maxlen=20)
+
+    @property
+    def state(self) -> str:
+        if self.returncode is None:
+            return "running"
+        if self.stopped:
+            return "stopped"
+        return "exited" if self.returncode == 0 else "failed"
+
+    def to_dict(self) -> Dict:
+        end = self.ended_at or time.time()
+        return {
+            "pid": self.pid,
+            "type": self.sim_type,
+            "state": self.state,
+            "warm": self.warm,
+            "returncode": self.returncode,
+            "started_at": self.started_at,
+            "uptime": round(end - self.started_at, 2),
+            "log_path": self.log_path,
+            "log_tail": list(self.tail),
+        }
+
+
+class SimulationSupervisor:
+    def __init__(self, log_dir: str = DEFAULT_LOG_DIR, max_sessions: int = 4,
+                 log_max_bytes: int = 1024 * 1024, log_backups: int = 3,
+                 reap_interval: float = 1.0, history: int = 50):
+        self.log_dir = log_dir
+        self.max_sessions = max_sessions
+        self.log_max_bytes = log_max_bytes
+        self.log_backups = log_backups
+        self.reap_interval = reap_interval
+        self.history = history
+
+        self._sessions: "OrderedDict[int, SimulationSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._reaper: Optional[threading.Thread] = None
+        self._shutdown = threading.Event()
+        os.makedirs(self.log_dir, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def launch(self, script_path: str, sim_type: str, args: List[str] = None,
+               python_exe: str = None, env: Dict = None, warm: bool = False,
+               on_line: Callable = None) -> SimulationSession:
+        """Spawn `python script_path --type sim_type [args]` without waiting.
+
+        warm sessions (idle pool workers) do not count towards max_sessions.
+        on_line(session, line) is called for every line the child prints.
+        """
+        env = dict(os.environ if env is None else env)
+        env.setdefault('PYTHONUNBUFFERED', '1')  # stream prints into the log promptly
+        with self._lock:
+            if not warm and self._active_count() >= self.max_sessions:
+                raise SessionLimitReached(
+                    f"{self.max_sessions} simulations already running; stop one first"
+                )
+            process = subprocess.Popen(
+                [python_exe or sys.executable, script_path, '--type', sim_type] + (args or []),
+                env=env,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                stdin=subprocess.DEVNULL,
+                text=True,
+                encoding='utf-8',
+                errors='replace',  # a stray non-UTF-8 byte must not kill the pump
+                bufsize=1,
+            )
+            session = SimulationSession(process, sim_type, script_path,
+                                        os.path.join(self.log_dir, f"sim-{process.pid}.log"))
+            session.warm = warm
+            self._sessions[session.pid] = session
+
+        threading.Thread(target=self._pump, args=(session, on_line), daemon=True,
+                         name=f"sim-log-{session.pid}").start()
+        self._ensure_reaper()
+        return session
+
+    def status(self, pid: int) -> Optional[Dict]:
+        with self._lock:
+            session = self._sessions.get(pid)
+        if session is None:
+            return None
+        self._poll(session)
+        return session.to_dict()
+
+    def stop(self, pid: int, timeout: float = 5.0) -> Optional[Dict]:
+        """Terminate a session (SIGTERM, then SIGKILL after timeout)."""
+        with self._lock:
+            session = self._sessions.get(pid)
+        if session is None:
+            return None
+        if session.returncode is None:
+            session.stopped = True
+            session.process.terminate()
+            try:
+                session.process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                session.process.kill()
+                session.process.wait()
+            self._poll(session)
+        return session.to_dict()
+
+    def sessions(self) -> List[Dict]:
+        with self._lock:
+            pids = list(self._sessions)
+        # The reaper may forget a session between the snapshot and status()
+        return [status for status in map(self.status, pids) if status is not None]
+
+    def active_count(self) -> int:
+        with self._lock:
+            return self._active_count()
+
+    def shutdown(self):
+        self._shutdown.set()
+        with self._lock:
+            pids = list(self._sessions)
+        for pid in pids:
+            self.stop(pid, timeout=2.0)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _pump(self, session: SimulationSession, on_line: Callable = None):
+        """Copy child output into a rotating log until the pipe closes."""
+        pid = session.pid
+        handler = RotatingFileHandler(session.log_path, maxBytes=self.log_max_bytes,
+                                      backupCount=self.log_backups)
+        handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        handler.addFilter(lambda record: getattr(record, 'sim_pid', None) == pid)
+        _child_log.addHandler(handler)
+        try:
+            for line in session.process.stdout:
+                line = line.rstrip('\n')
+                session.tail.append(line)
+                _child_log.info(line, extra={'sim_pid': pid})
+                if on_line is not None:
+                    on_line(session, line)
+        finally:
+            _child_log.removeHandler(handler)
+            handler.close()
+            session.process.stdout.close()
+
+    def _active_count(self) -> int:
+        # Callers hold self._lock
+        sessions = list(self._sessions.values())
+        for session in sessions:
+            self._poll(session)
+        return sum(1 for s in sessions if s.returncode is None and not s.warm)
+
+    def _poll(self, session: SimulationSession):
+        if session.returncode is None:
+            code = session.process.poll()
+            if code is not None:
+                session.returncode = code
+                session.ended_at = time.time()
+
+    def _ensure_reaper(self):
+        # Under the lock so concurrent launches start one reaper, and so the
+        # reaper cannot decide to exit between this check and a new session
+        with self._lock:
+            if self._reaper is None or not self._reaper.is_alive():
+                self._reaper = threading.Thread(target=self._reap_loop, daemon=True,
+                                                name="sim-reaper")
+                self._reaper.start()
+
+    def _reap_loop(self):
+        while not self._shutdown.wait(self.reap_interval):
+            with self._lock:
+                for session in list(self._sessions.values()):
+                    self._poll(session)
+                # Forget the oldest finished sessions beyond the history limit
+                finished = [pid for pid, s in self._sessions.items() if s.returncode is not None]
+                for pid in finished[:max(0, len(finished) - self.history)]:
+                    del self._sessions[pid]
+                if not any(s.returncode is None for s in self._sessions.values()):
+                    self._reaper = None
+                    return
+
+
+class WarmPool:
+    """Pool of pre-started ursa_lab/worker.py processes.
+
+    Each worker has already imported Ursina and built the LabScene; it is
+    handed an experiment over a local authenticated socket and then becomes
+    an ordinary supervised session. The pool is topped back up to `size`
+    after every launch. Workers left idle longer than `idle_timeout`
+    seconds are retired (0 disables this), shrinking the pool during quiet
+    periods until the next launch refills it.
+    """
+
+    READY_PREFIX = "WORKER_READY"
+
+    def __init__(self, supervisor: SimulationSupervisor, worker_script: str, size: int = 2,
+                 idle_timeout: float = 1800, python_exe: str = None, env: Dict = None):
+        self.supervisor = supervisor
+        self.worker_script = worker_script
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.python_exe = python_exe
+        self.env = dict(os.environ if env is None else env)
+        self._authkey = secrets.token_bytes(16)
+        self.env['SAYANSI_WORKER_AUTHKEY'] = self._authkey.hex()
+
+        self._lock = threading.Lock()
+        self._top_up_lock = threading.Lock()  # one top-up at a time, so none over-spawn
+        self._started = False
+        self._starting: Dict[int, SimulationSession] = {}
+        self._ready: "OrderedDict[int, tuple]" = OrderedDict()  # pid -> (session, port, ready_at)
+        self._stats = {"warm_launches": 0, "cold_fallbacks": 0, "retired": 0, "spawned": 0}
+        self._janitor: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def start(self):
+        """Spawn the workers and the idle janitor. Idempotent; the server
+        calls it on the first launch request rather than at import, so
+        reloader parents, CLI imports and unused workers spawn nothing."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        self.top_up()
+        if self.idle_timeout and (self._janitor is None or not self._janitor.is_alive()):
+            self._janitor = threading.Thread(target=self._janitor_loop, daemon=True,
+                                             name="sim-warm-pool")
+            self._janitor.start()
+
+    def top_up(self):
+        """Spawn workers until ready + starting == size."""
+        with self._top_up_lock:
+            with self._lock:
+                self._forget_dead()
+                missing = self.size - len(self._ready) - len(self._starting)
+            for _ in range(max(0, missing)):
+                session = self.supervisor.launch(self.worker_script, 'idle', python_exe=self.python_exe,
+                                                 env=self.env, warm=True, on_line=self._on_line)
+                with self._lock:
+                    self._starting[session.pid] = session
+                    self._stats["spawned"] += 1
+
+    def acquire(self, sim_type: str) -> Optional[SimulationSession]:
+        """Hand sim_type to an idle worker. Returns None when no worker is
+        ready (callers fall back to a cold launch). Raises SessionLimitReached
+        like a cold launch would."""
+        if self.supervisor.active_count() >= self.supervisor.max_sessions:
+            raise SessionLimitReached(
+                f"{self.supervisor.max_sessions} simulations already running; stop one first"
+            )
+
+        session = None
+        while session is None:
+            with self._lock:
+                self._forget_dead()
+                if not self._ready:
+                    self._stats["cold_fallbacks"] += 1
+                    break
+                _, (candidate, port, _) = self._ready.popitem(last=False)
+            try:
+                with Client(('127.0.0.1', port), authkey=self._authkey) as conn:
+                    conn.send({"type": sim_type})
+                    if conn.poll(5) and conn.recv().get("ok"):
+                        session = candidate
+            except (OSError, EOFError) as e:
+                print(f"Warm worker {candidate.pid} unreachable: {e}")
+            if session is None:
+                self.supervisor.stop(candidate.pid, timeout=2.0)
+
+        if session is not None:
+            session.warm = False
+            session.sim_type = sim_type
+            session.started_at = time.time()
+            with self._lock:
+                self._stats["warm_launches"] += 1
+        threading.Thread(target=self.top_up, daemon=True).start()
+        return session
+
+    def stats(self) -> Dict:
+        with self._lock:
+            self._forget_dead()
+            return dict(self._stats, size=self.size, idle_timeout=self.idle_timeout, started=self._started,
+                        ready=len(self._ready), starting=len(self._starting))
+
+    def shutdown(self):
+        with self._lock:
+            pids = list(self._ready) + list(self._starting)
+            self._ready.clear()
+            self._starting.clear()
+        for pid in pids:
+            self.supervisor.stop(pid, timeout=2.0)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _on_line(self, session: SimulationSession, line: str):
+        if not line.startswith(self.READY_PREFIX):
+            return
+        port = int(line.split()[1])
+        with self._lock:
+            if self._starting.pop(session.pid, None) is not None:
+                self._ready[session.pid] = (session, port, time.monotonic())
+
+    def _forget_dead(self):
+        """Drop workers that exited on their own (caller holds self._lock)."""
+        for pool in (self._starting, self._ready):
+            for pid in list(pool):
+                entry = pool[pid]
+                session = entry if isinstance(entry, SimulationSession) else entry[0]
+                if session.process.poll() is not None:
+                    del pool[pid]
+
+    def _janitor_loop(self):
+        interval = max(1.0, min(60.0, self.idle_timeout / 4))
+        while True:
+            time.sleep(interval)
+            now = time.monotonic()
+            with self._lock:
+                expired = [pid for pid, (_, _, ready_at) in self._ready.items()
+                           if now - ready_at > self.idle_timeout]
+                for pid in expired:
+                    del self._ready[pid]
+                    self._stats["retired"] += 1
+            for pid in expired:
+                self.supervisor.stop(pid, timeout=2.0)
+
+
+def supervisor_from_env() -> SimulationSupervisor:
+    """Build a supervisor from SIM_MAX_SESSIONS / SIM_LOG_* env vars."""
+    return SimulationSupervisor(
+        log_dir=os.getenv('SIM_LOG_DIR', DEFAULT_LOG_DIR),
+        max_sessions=int(os.getenv('SIM_MAX_SESSIONS', 4)),
+        log_max_bytes=int(os.getenv('SIM_LOG_MAX_BYTES', 1024 * 1024)),
+        log_backups=int(os.getenv('SIM_LOG_BACKUPS', 3)),
+    )
+
+
+def warm_pool_from_env(supervisor: SimulationSupervisor, python_exe: str = None,
+                       env: Dict = None) -> WarmPool:
+    """Build the warm pool from SIM_WARM_POOL_SIZE / SIM_WARM_POOL_IDLE_TIMEOUT."""
+    worker_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'worker.py')
+    return WarmPool(
+        supervisor,
+        worker_script,
+        size=int(os.getenv('SIM_WARM_POOL_SIZE', 2)),
+        idle_timeout=float(os.getenv('SIM_WARM_POOL_IDLE_TIMEOUT', 1800)),
+        python_exe=python_exe,
+        env=env,
+    )
@@ -0,0 +1,128 @@
+"""
+Pre-initialized Ursina worker for the warm simulation pool.
+
+The worker pays the cold-start cost up front (interpreter, `from ursina
+import *`, LabScene room/lighting/table) headless, with no window at all,
+then waits on a local control socket. When the Flask server assigns it an
+experiment it opens its on-screen window and only has to build that
+experiment's entities.
+
+Protocol (multiprocessing.connection, authkey from SAYANSI_WORKER_AUTHKEY):
+    worker stdout:  WORKER_READY <port>
+    server -> worker: {"type": "<experiment>"}
+    worker -> server: {"ok": true, "pid": <pid>}
+"""
+import os
+import sys
+import argparse
+import queue
+import threading
+import time as time_module  # ursina exports its own `time` (with dt)
+from multiprocessing.connection import Listener
+
+from ursina import *
+from panda3d.core import WindowProperties
+from lab_scene import LabScene
+from simulation import SimulationLogic
+
+READY_PREFIX = "WORKER_READY"
+
+
+WINDOW_SIZE = (1024, 768)
+WINDOW_POSITION = (200, 200)
+
+
+def _open_window(app, title):
+    """Give a worker that started with window_type='none' its on-screen
+    window and point the Ursina camera at it."""
+    props = WindowProperties()
+    props.setTitle(title)
+    props.setSize(*WINDOW_SIZE)
+    props.setOrigin(*WINDOW_POSITION)
+    props.setForeground(True)
+    app.openMainWindow(type='onscreen', props=props)
+    camera.set_up()
+
+
+def _serve_control(listener, assignments):
+    """Accept a single assignment from the pool, then stop listening."""
+    with listener.accept() as conn:
+        message = conn.recv()
+        assignments.put(message)
+        conn.send({"ok": True, "pid": os.getpid()})
+    listener.close()
+
+
+class WorkerController(Entity):
+    """Ursina calls update() every frame; idle until an assignment arrives."""
+
+    def __init__(self, app, lab, assignments):
+        super().__init__()
+        self.app = app
+        self.lab = lab
+        self.assignments = assignments
+        self.sim = None
+        self.first_frame_pending = False
+        self.assigned_at = None
+
+    def update(self):
+        if self.sim is None:
+            try:
+                message = self.assignments.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                self.start_experiment(message.get('type', 'pendulum'))
+            except ValueError as e:
+                # Exit non-zero so the supervisor reports the session as failed
+                print(f"ERROR {e}", flush=True)
+                os._exit(1)
+            return
+
+        if self.first_frame_pending:
+            self.first_frame_pending = False
+            print(f"FIRST_FRAME {self.sim.experiment_type} "
+                  f"{(time_module.perf_counter() - self.assigned_at) * 1000:.1f}ms")
+
+        self.sim.update(time.dt)
+        if held_keys['escape']:
+            application.quit()
+
+    def start_experiment(self, sim_type):
+        self.assigned_at = time_module.perf_counter()
+        self.sim = SimulationLogic(sim_type)
+        self.sim.setup_experiment(self.lab)
+        _open_window(self.app, f"Sayansi Yathu - {sim_type.capitalize()}")
+        self.sim.running = True
+        self.first_frame_pending = True
+        print(f"ASSIGNED {sim_type}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sayansi Yathu warm simulation worker')
+    parser.add_argument('--type', type=str, default='idle', help='Ignored; set on assignment')
+    parser.parse_args()
+
+    authkey = bytes.fromhex(os.environ['SAYANSI_WORKER_AUTHKEY'])
+    listener = Listener(('127.0.0.1', 0), authkey=authkey)
+
+    # No window until an experiment is assigned: idle workers never show up
+    # on screen and need no display
+    app = Ursina(title="Sayansi Yathu", vsync=True, fullscreen=False, window_type='none')
+
+    lab = LabScene()
+    camera.position = (0, 5, -15)
+    camera.look_at((0, 3, 0))
+    camera.fov = 60
+    EditorCamera()
+
+    assignments = queue.Queue()
+    WorkerController(app, lab, assignments)
+    threading.Thread(target=_serve_control, args=(listener, assignments), daemon=True).start()
+
+    print(f"{READY_PREFIX} {listener.address[1]}", flush=True)
+    app.run()
+
+
+if __name__ == "__main__":
+    main()
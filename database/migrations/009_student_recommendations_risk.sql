@@ -0,0 +1,27 @@
+-- Migration 009: Precomputed adaptive recommendations and risk scores
+USE sayansi_yathu;
+
+-- Top-k experiment recommendations per student, rewritten by the batch job
+CREATE TABLE IF NOT EXISTS student_recommendations (
+    user_id INT NOT NULL,
+    rank_position TINYINT UNSIGNED NOT NULL,
+    experiment_id INT NOT NULL,
+    predicted_score DECIMAL(5,2) NOT NULL,
+    model_version VARCHAR(64) NOT NULL,
+    computed_at DATETIME NOT NULL,
+    PRIMARY KEY (user_id, rank_position),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (experiment_id) REFERENCES experiments(id) ON DELETE CASCADE
+);
+
+-- Latest risk assessment per student
+CREATE TABLE IF NOT EXISTS student_risk (
+    user_id INT PRIMARY KEY,
+    is_at_risk TINYINT(1) NOT NULL DEFAULT 0,
+    probability DECIMAL(4,3) NOT NULL DEFAULT 0,
+    actual_avg_score DECIMAL(5,2) NULL,
+    model_version VARCHAR(64) NOT NULL,
+    computed_at DATETIME NOT NULL,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    INDEX idx_student_risk_flag (is_at_risk, computed_at)
+);
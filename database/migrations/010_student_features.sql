@@ -0,0 +1,34 @@
+-- Migration 010: Per-student feature store for the adaptive models
+USE sayansi_yathu;
+
+-- One precomputed aggregate row per student. Progress writes (from PHP or
+-- Python) only flag the row dirty via the triggers below; the next read
+-- recomputes it from that student's progress rows.
+CREATE TABLE IF NOT EXISTS student_features (
+    user_id INT PRIMARY KEY,
+    attempts INT NOT NULL DEFAULT 0,
+    score_mean DECIMAL(5,2) NULL,
+    score_mean_recent DECIMAL(5,2) NULL,
+    steps_median DECIMAL(6,2) NULL,
+    time_p50 DECIMAL(10,2) NULL,
+    subject_stats JSON NULL,
+    last_activity_at DATETIME NULL,
+    dirty TINYINT(1) NOT NULL DEFAULT 1,
+    computed_at DATETIME NULL,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    INDEX idx_student_features_dirty (dirty)
+);
+
+DROP TRIGGER IF EXISTS trg_progress_features_insert;
+CREATE TRIGGER trg_progress_features_insert AFTER INSERT ON progress FOR EACH ROW
+    INSERT INTO student_features (user_id, dirty) VALUES (NEW.user_id, 1)
+    ON DUPLICATE KEY UPDATE dirty = 1;
+
+DROP TRIGGER IF EXISTS trg_progress_features_update;
+CREATE TRIGGER trg_progress_features_update AFTER UPDATE ON progress FOR EACH ROW
+    INSERT INTO student_features (user_id, dirty) VALUES (NEW.user_id, 1)
+    ON DUPLICATE KEY UPDATE dirty = 1;
+
+DROP TRIGGER IF EXISTS trg_progress_features_delete;
+CREATE TRIGGER trg_progress_features_delete AFTER DELETE ON progress FOR EACH ROW
+    UPDATE student_features SET dirty = 1 WHERE user_id = OLD.user_id;